@@ -0,0 +1,251 @@
+# -*- coding: utf-8-unix; mode: python -*-
+"""Benchmarks for htmldocument.
+
+Usage:
+    python benchmark.py [name ...]
+
+Without names, all benchmarks are run. The exit status is 1 if a
+benchmark with a budget exceeds it.
+"""
+
+import html
+import os
+import subprocess
+import sys
+import threading
+import time
+import timeit
+
+import htmldocument
+
+# Budget of median import time of htmldocument in microseconds, including
+# the modules it imports, checked by the startup benchmark.
+STARTUP_BUDGET_US = 2000
+
+def _report(label, seconds, number):
+    print('  {0:<28} {1:10.3f} us/loop'.format(
+        label, seconds / number * 1000000))
+
+def bench_escape(number=2000):
+    """Compare escape and escape_many with html.escape."""
+    columns = {
+        'identifiers': ['item-{0}'.format(i) for i in range(1000)],
+        'numbers': [str(i * 37) for i in range(1000)],
+        'labels (10% dirty)': [
+            'Tom & Jerry' if i % 10 == 0 else 'Plain label {0}'.format(i)
+            for i in range(1000)],
+        'markup (all dirty)': ['<b>"{0}"</b> & co'.format(i)
+                               for i in range(1000)],
+    }
+    for name, values in columns.items():
+        print('{0}: 1000 values'.format(name))
+        _report('html.escape', timeit.timeit(
+            lambda: [html.escape(v) for v in values], number=number), number)
+        _report('escape', timeit.timeit(
+            lambda: [htmldocument.escape(v) for v in values],
+            number=number), number)
+        _report('escape_many', timeit.timeit(
+            lambda: htmldocument.escape_many(values), number=number), number)
+
+def bench_attrs(number=500):
+    """Compare dict and Attrs attributes rendering table cells."""
+    ht = htmldocument.HTML()
+    values = [str(i) for i in range(1000)]
+    attrs = {'class': 'cell num', 'role': 'gridcell'}
+    frozen = htmldocument.Attrs(attrs)
+    _report('dict', timeit.timeit(
+        lambda: [ht.span(v, attrs) for v in values], number=number), number)
+    _report('Attrs', timeit.timeit(
+        lambda: [ht.span(v, frozen) for v in values], number=number), number)
+
+def bench_elements(number=500):
+    """Time element methods of the element registry."""
+    ht = htmldocument.HTML()
+    values = [str(i) for i in range(1000)]
+    _report('registry method', timeit.timeit(
+        lambda: [ht.td(v) for v in values], number=number), number)
+    _report('_create_element', timeit.timeit(
+        lambda: [ht._create_element('td', v) for v in values],
+        number=number), number)
+
+def bench_construct(number=100000):
+    """Compare HTML() with derive() per request."""
+    kwargs = dict(encode='utf-8', lang='en', sitetitle='Site',
+                  cssfiles=['/css/main.css', '/css/print.css'],
+                  jsfiles=['/js/main.js'])
+    site = htmldocument.HTML(**kwargs)
+    _report('HTML(...)', timeit.timeit(
+        lambda: htmldocument.HTML(pagetitle='Page', **kwargs),
+        number=number), number)
+    _report('derive(pagetitle=...)', timeit.timeit(
+        lambda: site.derive(pagetitle='Page'), number=number), number)
+
+def _render_page(ht, rows):
+    cell = htmldocument.Attrs(class_='cell num')
+    result = [ht.fragment('nav', lambda: ht.nav(ht.ul(ht.li(
+        [ht.a(label, href='/' + label) for label in ('home', 'news', 'help')]
+    ))))]
+    result.append(ht.start_table())
+    for i in rows:
+        result.append(ht.tr(ht.td(i, cell) + ht.td(ht.em('row ' + i))))
+    result.append(ht.end_table())
+    result.append(ht.start_form())
+    result.append(ht.select_list('choice', rows[:20], default=rows[0]))
+    result.append(ht.end_form())
+    return ''.join(result)
+
+def bench_threads(pages=200, counts=(1, 2, 4, 8, 16, 32)):
+    """Render pages from threads sharing one HTML and report scaling."""
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('  GIL {0}'.format('enabled' if gil else 'disabled'))
+    ht = htmldocument.HTML(fragments=htmldocument.FragmentCache())
+    rows = [str(i) for i in range(50)]
+    environ = {'SCRIPT_NAME': '/app'}
+
+    def work():
+        for i in range(pages):
+            with ht.request(environ, pagetitle='Page'):
+                _render_page(ht, rows)
+
+    base = None
+    for count in counts:
+        threads = [threading.Thread(target=work) for i in range(count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        throughput = count * pages / (time.perf_counter() - start)
+        if base is None:
+            base = throughput
+        print('  {0:>2} threads {1:12.0f} pages/s {2:6.2f}x'.format(
+            count, throughput, throughput / base))
+
+def _gzip_page(ht, rows, out):
+    # Page of static fragments and a dynamic table written to a writer.
+    countries = ['Country {0}'.format(i) for i in range(250)]
+    out.write_fragment('nav', lambda: ht.nav(ht.ul(ht.li(
+        [ht.a('Section {0}'.format(i), href='/s/{0}'.format(i))
+         for i in range(40)]))))
+    out.write(ht.start_table().encode())
+    for i in rows:
+        out.write(ht.tr(ht.td(i) + ht.td(ht.em('row ' + i))).encode())
+    out.write(ht.end_table().encode())
+    out.write_fragment('countries', lambda: ht.popup_menu(
+        'country', countries, countries[0]))
+    out.write_fragment('footer', lambda: ht.footer(ht.p(
+        'Copyright and contact information. ' * 30)))
+
+class _Sink:
+    # Body writer of a whole page compressed at once, for comparison.
+    def __init__(self, ht):
+        self.ht = ht
+        self.parts = []
+    def write(self, data):
+        self.parts.append(data)
+    def write_fragment(self, key, render, *args):
+        self.parts.append(self.ht.fragment(key, render, *args).encode())
+
+def bench_gzip(number=300):
+    """Compare gzip of whole pages with spliced gzip members of fragments."""
+    import gzip
+    import io
+    import zlib
+    ht = htmldocument.HTML(compression=htmldocument.Compression(),
+                           fragments=htmldocument.FragmentCache())
+    rows = [str(i) for i in range(20)]
+    environ = {'HTTP_ACCEPT_ENCODING': 'gzip'}
+
+    def whole():
+        sink = _Sink(ht)
+        _gzip_page(ht, rows, sink)
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        return compressor.compress(b''.join(sink.parts)) + compressor.flush()
+
+    def spliced():
+        out = io.BytesIO()
+        with ht.request(environ):
+            with ht.body_writer(out) as writer:
+                _gzip_page(ht, rows, writer)
+        return out.getvalue().partition(b'\n\n')[2]
+
+    assert gzip.decompress(whole()) == gzip.decompress(spliced())
+    for label, render in (('whole page', whole), ('spliced members', spliced)):
+        seconds = timeit.timeit(render, number=number)
+        print('  {0:<28} {1:10.3f} us/loop {2:7d} bytes'.format(
+            label, seconds / number * 1000000, len(render())))
+
+def _small_page(ht, i):
+    with ht.request({}, pagetitle='Item {0}'.format(i)):
+        return ''.join([
+            ht.html_header(),
+            _render_page(ht, [str(i), str(i * 7), str(i * 13)]),
+            ht.footer(ht.p('Copyright Example Inc. All rights reserved.')),
+            ht.html_close()]).encode()
+
+def bench_dictionary(pages=50):
+    """Compare gzip with compression against a trained dictionary."""
+    import gzip
+    ht = htmldocument.HTML(sitetitle='Example Site',
+                           cssfiles=['/css/main.css', '/css/print.css'],
+                           jsfiles=['/js/app.js'],
+                           fragments=htmldocument.FragmentCache())
+    dictionary = htmldocument.train_dictionary(
+        [_small_page(ht, i) for i in range(pages)])
+    page = _small_page(ht, pages + 1)
+    sizes = [('identity', len(page)), ('gzip', len(gzip.compress(page))),
+             ('zlib with dictionary', len(dictionary.compress(page)))]
+    print('  dictionary of {0} pages: {1} bytes'.format(
+        pages, len(dictionary.data)))
+    for label, size in sizes:
+        print('  {0:<28} {1:10d} bytes {2:6.1f}x'.format(
+            label, size, len(page) / size))
+
+def _import_time(module):
+    """Return cumulative import time of module in a new interpreter."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise RuntimeError('no import time of {0}'.format(module))
+
+def bench_startup(runs=21):
+    """Measure import time of htmldocument against STARTUP_BUDGET_US."""
+    _import_time('htmldocument')    # write the bytecode cache
+    times = sorted(_import_time('htmldocument') for i in range(runs))
+    median = times[len(times) // 2]
+    print('  {0:<28} {1:10d} us (min {2}, max {3})'.format(
+        'import htmldocument', median, times[0], times[-1]))
+    print('  {0:<28} {1:10d} us'.format('budget', STARTUP_BUDGET_US))
+    if median > STARTUP_BUDGET_US:
+        print('  over budget')
+        return False
+    return True
+
+BENCHMARKS = {
+    'escape': bench_escape,
+    'attrs': bench_attrs,
+    'elements': bench_elements,
+    'construct': bench_construct,
+    'threads': bench_threads,
+    'gzip': bench_gzip,
+    'dictionary': bench_dictionary,
+    'startup': bench_startup,
+}
+
+def main(names):
+    status = 0
+    for name in names or BENCHMARKS:
+        print('== {0} =='.format(name))
+        if BENCHMARKS[name]() is False:
+            status = 1
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,2991 @@
+# -*- coding: utf-8-unix; mode: python -*-
+"""Module to assist to make HTML for Python 3.
+
+This module provides class that assist to make HTML.
+
+Author: 2011, 2017 IMAI Toshiyuki
+
+Copyright (c) 2011, 2017 IMAI Toshiyuki
+
+This software is released under the MIT License.
+http://opensource.org/licenses/mit-license.php
+
+Class:
+    HTML -- Assist to make HTML.
+    Attrs -- Frozen set of attributes of an element.
+    FragmentCache -- Cache of rendered fragments that threads share.
+    Asset -- Stylesheet, script or resource hint of a document.
+    Fingerprints -- Content hashed URLs of local asset files.
+    Bundler -- Combined files of the local cssfiles and jsfiles.
+    CriticalCSS -- Critical stylesheets inlined in the head element.
+    Compression -- Streaming compression of response bodies.
+    CompressionDictionary -- Shared dictionary of compression made from
+                             pages of the site.
+    MultipartParser -- Streaming parser of multipart/form-data request
+                       bodies.
+    FormPart -- Part of a multipart/form-data request body.
+    Section -- Independent section of a document to render.
+    SectionPool -- Process pool that renders sections in parallel.
+    FastCGIServer -- FastCGI responder running render functions of CGI
+                     scripts in long lived processes.
+
+Functions:
+    escape(s, [quote]) -- Escape special characters of HTML.
+    escape_many(values, [quote]) -- Escape special characters of each value.
+    register_element(name, [content], [booleans]) -- Register an element, so
+                                    that class HTML has methods for it.
+    train_dictionary(samples, [size], [match], [id]) -- Make shared
+                                    dictionary of compression of pages.
+
+Fingerprints, Bundler, CriticalCSS, Compression, CompressionDictionary,
+train_dictionary, MultipartParser, FormPart, Section, SectionPool and
+FastCGIServer are defined in submodules, which are imported on first use
+of these names.
+"""
+__author__ = 'IMAI Toshiyuki'
+__version__ = '1.0'
+
+import contextvars
+import os
+import sys
+
+# number of stripes of the locked tables shared by threads
+_STRIPES = 16
+
+# lock for creating module level tables on first use, made on first use
+# itself, since importing threading costs more than importing this module
+_module_locks = {}
+
+def _module_lock():
+    """Return the lock for creating module level tables on first use."""
+    try:
+        return _module_locks['tables']
+    except KeyError:
+        import threading
+        # setdefault() is atomic, so racing threads get the same lock
+        return _module_locks.setdefault('tables', threading.Lock())
+
+def escape(s, quote=True):
+    """Escape special characters of HTML.
+
+    Return s itself when it contains no special characters, so that clean
+    values such as identifiers and numbers are not copied.
+
+    Keyword arguments:
+        s -- string
+        quote -- if it is True then also escape '"' and "'" (default True)
+    """
+    if '&' in s:
+        s = s.replace('&', '&amp;')
+    if '<' in s:
+        s = s.replace('<', '&lt;')
+    if '>' in s:
+        s = s.replace('>', '&gt;')
+    if quote:
+        if '"' in s:
+            s = s.replace('"', '&quot;')
+        if '\'' in s:
+            s = s.replace('\'', '&#x27;')
+    return s
+
+def escape_many(values, quote=True):
+    """Escape special characters of each value.
+
+    Values are checked and escaped as one joined string, so a column of
+    clean values costs a single scan.
+
+    Keyword arguments:
+        values -- list or tuple object that contains strings or ints
+        quote -- if it is True then also escape '"' and "'" (default True)
+    """
+    values = [value if isinstance(value, str) else str(value)
+              for value in values]
+    joined = '\x00'.join(values)
+    escaped = escape(joined, quote)
+    if escaped is joined:
+        return values
+    result = escaped.split('\x00')
+    if len(result) != len(values):
+        # some value contains the separator itself
+        return [escape(value, quote) for value in values]
+    return result
+
+class Attrs:
+
+    """Frozen set of attributes of an element.
+
+    Attrs can be passed as attrs to every element and form method. It is
+    serialized once, on first use, and the serialized string is reused by
+    every element that gets it. Attrs are interned: creating a set equal
+    to a living one returns that one.
+
+    Useage:
+        cell = htmldocument.Attrs(class_='cell num')
+        for value in values:
+            print(ht.span(value, cell))
+    """
+
+    __slots__ = ('_items', '_names', '_string', '_minified', '__weakref__')
+
+    # stripes of (items: Attrs, lock), created on first use
+    _interned = None
+
+    def __new__(cls, attrs=None, **kwattrs):
+
+        """Constructor of class Attrs.
+
+        Keyword arguments:
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+
+        merged = dict(_attr_items(attrs))
+        merged.update(_keyword_attrs(kwattrs))
+        items = tuple((name, value) for name, value in merged.items()
+                      if value is not None)
+        key = _attrs_key(items)
+        stripes = Attrs._interned
+        if stripes is None:
+            stripes = _interned_attrs_stripes()
+        interned, lock = stripes[hash(key) % len(stripes)]
+        with lock:
+            self = interned.get(key)
+            if self is None:
+                self = object.__new__(cls)
+                self._items = items
+                self._names = frozenset(merged)
+                self._string = None
+                self._minified = None
+                interned[key] = self
+        return self
+
+    def __reduce__(self):
+        # Unpickled and copied sets are interned too.
+        return (Attrs, (self._items,))
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __eq__(self, other):
+        if isinstance(other, Attrs):
+            return _attrs_key(self._items) == _attrs_key(other._items)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(_attrs_key(self._items))
+
+    def __repr__(self):
+        return 'Attrs({0!r})'.format(self._items)
+
+    def __str__(self):
+        if self._string is None:
+            attrstr = ''
+            for attrname, attrvalue in self._items:
+                if isinstance(attrvalue, int):
+                    attrvalue = _int_attr_value(attrname, attrvalue)
+                    if attrvalue is None:
+                        continue
+                attrstr += ' {0}="{1}"'.format(
+                    escape(attrname), escape(attrvalue))
+            self._string = attrstr
+        return self._string
+
+    def _minified_str(self):
+        # str(self) for minified output, cached the same way.
+        if self._minified is None:
+            attrstr = ''
+            for attrname, attrvalue in self._items:
+                if isinstance(attrvalue, int):
+                    attrvalue = _int_attr_value(attrname, attrvalue)
+                    if attrvalue is None:
+                        continue
+                attrstr += _minified_attr(attrname, attrvalue)
+            self._minified = attrstr
+        return self._minified
+
+    def _kept_by(self, extra):
+        # True if no attribute of extra overrides an attribute of self.
+        for name, value in extra:
+            if value is not None and name in self._names:
+                return False
+        return True
+
+def _attrs_key(items):
+    """Return key of interned Attrs of items.
+
+    The type of each value is part of it, since True == 1 and False == 0
+    but they are serialized differently.
+    """
+    return tuple((name, type(value), value) for name, value in items)
+
+class Asset:
+
+    """Stylesheet, script or resource hint of a document.
+
+    Asset objects in attribute assets of HTML are put in the head element
+    by html_header(), scripts with body set before the body end tag by
+    html_close(), and the ones with header set also in the Link header
+    field of resp_headers().
+    """
+
+    __slots__ = ('href', 'rel', 'load', 'as_', 'fetchpriority',
+                 'crossorigin', 'body', 'header')
+
+    def __init__(self, href, rel='script', load=None, as_=None,
+                 fetchpriority=None, crossorigin=None, body=False,
+                 header=False):
+
+        """Constructor of class Asset.
+
+        Keyword arguments:
+            href -- URL of the resource
+            rel -- 'stylesheet', 'script', 'module', 'preload',
+                   'modulepreload', 'preconnect', 'dns-prefetch' or
+                   'compression-dictionary' (default 'script')
+            load -- 'defer' or 'async' for scripts (default None, means
+                    the script blocks parsing)
+            as_ -- as attribute of preload (default None, means it is
+                   guessed from the extension of href)
+            fetchpriority -- 'high', 'low' or 'auto' (default None)
+            crossorigin -- crossorigin attribute (default None, means
+                           'anonymous' for fonts and none for the others)
+            body -- if it is True then put the script before the body end
+                    tag (default False)
+            header -- if it is True then also put it in the Link header
+                      field (default False)
+        """
+
+        if rel not in _ASSET_RELS:
+            raise ValueError('unknown rel %r' % rel)
+        if load not in (None, 'defer', 'async'):
+            raise ValueError('unknown load %r' % load)
+        self.href = href
+        self.rel = rel
+        self.load = load
+        if as_ is None and rel == 'preload':
+            as_ = _PRELOAD_AS.get(href.rpartition('.')[2].lower(), 'fetch')
+        self.as_ = as_
+        self.fetchpriority = fetchpriority
+        if crossorigin is None and as_ == 'font':
+            crossorigin = 'anonymous'
+        self.crossorigin = crossorigin
+        self.body = body
+        self.header = header
+
+    def __repr__(self):
+        return 'Asset({0!r}, {1!r})'.format(self.href, self.rel)
+
+    def tag(self, minify=False):
+        """Return link or script element of the asset.
+
+        Keyword arguments:
+            minify -- if it is True then return it minified (default False)
+        """
+        if self.rel in ('script', 'module'):
+            attrs = [('src', self.href)]
+            if self.rel == 'module':
+                attrs.insert(0, ('type', 'module'))
+            elif not minify:
+                attrs.insert(0, ('type', 'text/javascript'))
+            if self.load is not None:
+                attrs.append((self.load, self.load))
+        else:
+            attrs = [('rel', self.rel)]
+            if self.rel == 'stylesheet' and not minify:
+                attrs.append(('type', 'text/css'))
+            attrs.append(('href', self.href))
+            if self.as_ is not None:
+                attrs.append(('as', self.as_))
+        if self.fetchpriority is not None:
+            attrs.append(('fetchpriority', self.fetchpriority))
+        if self.crossorigin is not None:
+            attrs.append(('crossorigin', self.crossorigin))
+        if minify:
+            attrstr = ''.join(_minified_attr(name, value)
+                              for name, value in attrs)
+        else:
+            attrstr = ''.join(' {0}="{1}"'.format(name, escape(value))
+                              for name, value in attrs)
+        if self.rel in ('script', 'module'):
+            return '<script{0}></script>'.format(attrstr)
+        if minify:
+            return '<link{0}>'.format(attrstr)
+        return '<link{0} />'.format(attrstr)
+
+    def link(self):
+        """Return value of the asset for the Link header field.
+
+        Stylesheets and scripts are preloaded, and modules are
+        modulepreloaded.
+        """
+        rel, as_ = self.rel, self.as_
+        if rel == 'stylesheet':
+            rel, as_ = 'preload', 'style'
+        elif rel == 'script':
+            rel, as_ = 'preload', 'script'
+        elif rel == 'module':
+            rel = 'modulepreload'
+        value = '<{0}>; rel={1}'.format(self.href, rel)
+        if as_ is not None:
+            value += '; as={0}'.format(as_)
+        if self.fetchpriority is not None:
+            value += '; fetchpriority={0}'.format(self.fetchpriority)
+        if self.crossorigin is not None:
+            value += '; crossorigin={0}'.format(self.crossorigin)
+        return value
+
+# values of rel of Asset, hints first in the order they are put in the head
+_ASSET_RELS = ('preconnect', 'dns-prefetch', 'preload', 'modulepreload',
+               'compression-dictionary', 'stylesheet', 'script', 'module')
+
+# extension: as attribute of preload
+_PRELOAD_AS = {
+    'css': 'style', 'js': 'script', 'mjs': 'script',
+    'woff': 'font', 'woff2': 'font', 'ttf': 'font', 'otf': 'font',
+    'png': 'image', 'jpg': 'image', 'jpeg': 'image', 'gif': 'image',
+    'webp': 'image', 'avif': 'image', 'svg': 'image',
+}
+
+class _Site:
+
+    """Site configuration shared by HTML objects.
+
+    It is never modified after creation; replace() returns a changed copy.
+    Lists of cssfiles and jsfiles are kept as tuples.
+    """
+
+    _fields = ('encode', 'lang', 'sitetitle', 'titledelimiter',
+               'cssfiles', 'jsfiles', 'jstext', 'fragments', 'assets',
+               'fingerprints', 'bundler', 'critical', 'minify',
+               'compression')
+
+    # assets and parts of the document made on first use
+    _caches = ('_head', '_close', '_link', '_hints')
+
+    __slots__ = _fields + _caches
+
+    def __init__(self, encode, lang, sitetitle, titledelimiter, cssfiles,
+                 jsfiles, jstext, fragments, assets, fingerprints, bundler,
+                 critical, minify, compression):
+        self.encode = encode
+        self.lang = lang
+        self.sitetitle = sitetitle
+        self.titledelimiter = titledelimiter
+        self.cssfiles = _frozen_files(cssfiles)
+        self.jsfiles = _frozen_files(jsfiles)
+        self.jstext = jstext
+        self.fragments = fragments
+        self.assets = tuple(assets or ())
+        self.fingerprints = fingerprints
+        self.bundler = bundler
+        self.critical = critical
+        self.minify = minify
+        self.compression = compression
+        self._head = self._close = self._link = self._hints = None
+
+    def replace(self, **changes):
+        """Return a copy of the configuration with changes applied."""
+        site = object.__new__(_Site)
+        for name in _Site._fields:
+            setattr(site, name, changes.get(name, getattr(self, name)))
+        site.cssfiles = _frozen_files(site.cssfiles)
+        site.jsfiles = _frozen_files(site.jsfiles)
+        site.assets = tuple(site.assets or ())
+        site._head = site._close = site._link = site._hints = None
+        return site
+
+    def head(self):
+        """Return the head before and after the page title.
+
+        It is a tuple of the part up to the page title and the part after
+        it up to the body start tag, as strings and then as bytes encoded
+        in encode. It is made on first use and kept, and remade when the
+        URLs of files() change.
+        """
+        if self._head is not None and not self.checks():
+            return self._head[1]
+        cssfiles, jsfiles, style = files = self.files()
+        if self._head is not None and self._head[0] == files:
+            return self._head[1]
+
+        minify = bool(self.minify)
+        tags = _HEAD_TAGS[minify]
+        newline = '' if minify else '\n'
+
+        lines = ['<!DOCTYPE html>']
+        lines.append('<html lang="{0}">'.format(self.lang))
+        lines.append('<head>')
+        lines.append('<title>')
+        before = newline.join(lines)
+
+        lines = [' {0} {1}</title>'.format(
+            escape(self.titledelimiter), escape(self.sitetitle))]
+
+        assets = sorted((asset for asset in self.assets if not asset.body),
+                        key=lambda asset: _ASSET_RELS.index(asset.rel))
+        for asset in assets:
+            if asset.rel in ('stylesheet', 'script', 'module'):
+                break
+            lines.append(asset.tag(minify))
+
+        if self.critical is not None:
+            if style:
+                lines.append('<style>{0}</style>'.format(
+                    style.replace('</', '<\\/')))
+            for cssfile in cssfiles:
+                lines.append(tags['preload'].format(cssfile))
+            if cssfiles:
+                lines.append('<noscript>{0}</noscript>'.format(''.join(
+                    tags['css'].format(cssfile) for cssfile in cssfiles)))
+        else:
+            for cssfile in cssfiles:
+                lines.append(tags['css'].format(cssfile))
+
+        for asset in assets:
+            if asset.rel == 'stylesheet':
+                lines.append(asset.tag(minify))
+
+        for jsfile in jsfiles:
+            lines.append(tags['js'].format(jsfile))
+
+        for asset in assets:
+            if asset.rel in ('script', 'module'):
+                lines.append(asset.tag(minify))
+
+        if isinstance(self.jstext, str):
+            lines.append(tags['jstext'].format(self.jstext))
+
+        lines.append('</head>')
+        if not minify:
+            lines.append('')
+        lines.append('<body>')
+        after = newline.join(lines) + newline
+
+        encode = _encoding(self.encode)
+        head = (before, after,
+                before.encode(encode, 'xmlcharrefreplace'),
+                after.encode(encode, 'xmlcharrefreplace'))
+        self._head = (files, head)
+        return head
+
+    def checks(self):
+        """Return True if files() has to be checked for changes."""
+        return (self.fingerprints is not None or self.bundler is not None or
+                self.critical is not None)
+
+    def files(self):
+        """Return URLs of cssfiles, URLs of jsfiles and inlined css.
+
+        With critical the inlined stylesheets are left out of cssfiles and
+        the other critical ones not in cssfiles are put before them, with
+        bundler runs of local files are replaced by their bundles, and with
+        fingerprints the others are the content hashed URLs.
+        """
+        url = None
+        if self.fingerprints is not None:
+            url = self.fingerprints.url
+        style, inlined, rest = '', (), ()
+        if self.critical is not None:
+            style, inlined, rest = self.critical.inline()
+        result = []
+        for ext, files in (('css', self.cssfiles), ('js', self.jsfiles)):
+            if isinstance(files, str):
+                files = (files,)
+            elif not isinstance(files, tuple):
+                files = ()
+            if ext == 'css' and (inlined or rest):
+                files = (tuple(path for path in rest if path not in files) +
+                         tuple(path for path in files if path not in inlined))
+            if self.bundler is not None:
+                files = self.bundler.urls(files, ext, url)
+            elif url is not None:
+                files = tuple(url(path) for path in files)
+            result.append(files)
+        result.append(style)
+        return tuple(result)
+
+    def close(self):
+        """Return scripts put before the body end tag and the end tags.
+
+        It is a string made on first use and kept.
+        """
+        if self._close is None:
+            minify = bool(self.minify)
+            lines = [asset.tag(minify) for asset in self.assets if asset.body]
+            lines.append('</body>')
+            lines.append('</html>')
+            newline = '' if minify else '\n'
+            self._close = newline.join(lines) + newline
+        return self._close
+
+    def link(self):
+        """Return value of the Link header field, or '' if it has none."""
+        if self._link is None:
+            self._link = ', '.join(asset.link() for asset in self.assets
+                                   if asset.header)
+        return self._link
+
+    def hints(self):
+        """Return Link values of 103 Early Hints for the assets.
+
+        They are preloads of cssfiles, jsfiles and assets, hints first, as
+        a tuple made on first use and kept, and remade when the URLs of
+        files() change.
+        """
+        if self._hints is not None and not self.checks():
+            return self._hints[1]
+        files = self.files()
+        if self._hints is not None and self._hints[0] == files:
+            return self._hints[1]
+        assets = []
+        for rel, urls in zip(('stylesheet', 'script'), files):
+            assets.extend(Asset(url, rel) for url in urls)
+        assets.extend(self.assets)
+        assets.sort(key=lambda asset: _ASSET_RELS.index(asset.rel))
+        hints = tuple(asset.link() for asset in assets)
+        self._hints = (files, hints)
+        return hints
+
+# templates of the elements of the head, for minify False and True
+_HEAD_TAGS = {
+    False: {
+        'css': '<link rel="stylesheet" type="text/css" href="{0}" />',
+        'preload': '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'" />',
+        'js': '<script type="text/javascript" src="{0}"></script>',
+        'jstext': '<script type="text/javascript">{0}</script>',
+    },
+    True: {
+        'css': '<link rel="stylesheet" href="{0}">',
+        'preload': '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">',
+        'js': '<script src="{0}"></script>',
+        'jstext': '<script>{0}</script>',
+    },
+}
+
+def _frozen_files(files):
+    if isinstance(files, list):
+        return tuple(files)
+    return files
+
+def _site_attribute(name, doc):
+    """Return property for attribute name of the site configuration.
+
+    Setting it replaces the site configuration of the HTML object only, so
+    the objects that share the configuration are not affected.
+    """
+    def get(self):
+        return getattr(self._site, name)
+    def set(self, value):
+        self._site = self._site.replace(**{name: value})
+    return property(get, set, doc=doc)
+
+def _site_files_attribute(name, doc):
+    """Return property for cssfiles or jsfiles of the site configuration.
+
+    It works like _site_attribute(), but a list of files is got as a
+    _FileList, so that changing it in place, e.g. by append(), changes
+    the attribute.
+    """
+    def get(self):
+        files = getattr(self._site, name)
+        if isinstance(files, tuple):
+            return _FileList(self, name, files)
+        return files
+    def set(self, value):
+        self._site = self._site.replace(**{name: value})
+    return property(get, set, doc=doc)
+
+class _FileList(list):
+
+    """List of cssfiles or jsfiles of an HTML object.
+
+    The site configuration keeps them as a tuple; a change of this list is
+    set back to the attribute of the object.
+    """
+
+    __slots__ = ('_html', '_name')
+
+    def __init__(self, html, name, files):
+        list.__init__(self, files)
+        self._html = html
+        self._name = name
+
+def _file_list_method(name):
+    method = getattr(list, name)
+    def changer(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        setattr(self._html, self._name, list(self))
+        return result
+    changer.__name__ = name
+    changer.__doc__ = method.__doc__
+    return changer
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear',
+              'sort', 'reverse', '__setitem__', '__delitem__', '__iadd__',
+              '__imul__'):
+    setattr(_FileList, _name, _file_list_method(_name))
+del _name
+
+class _Request:
+
+    """State of a request being handled by an HTML object."""
+
+    __slots__ = ('html', 'outer', 'pagetitle', 'cookie', 'nocache',
+                 'script_name', 'accept_encoding', 'available_dictionary')
+
+    def __init__(self, html, outer, pagetitle, cookie, nocache, script_name,
+                 accept_encoding, available_dictionary):
+        self.html = html
+        self.outer = outer
+        self.pagetitle = pagetitle
+        self.cookie = cookie
+        self.nocache = nocache
+        self.script_name = script_name
+        self.accept_encoding = accept_encoding
+        self.available_dictionary = available_dictionary
+
+# innermost _Request of the current thread or task
+_request = contextvars.ContextVar('htmldocument_request', default=None)
+
+def _current_request(html):
+    """Return _Request of html in the current context, or None."""
+    request = _request.get()
+    while request is not None and request.html is not html:
+        request = request.outer
+    return request
+
+def _request_attribute(name, doc):
+    """Return property for attribute name that is scoped to a request.
+
+    Inside HTML.request() it is read from and written to the state of the
+    request in the current thread or task, outside to the HTML object.
+    """
+    slot = '_' + name
+    def get(self):
+        request = _current_request(self)
+        if request is None:
+            return getattr(self, slot)
+        return getattr(request, name)
+    def set(self, value):
+        request = _current_request(self)
+        if request is None:
+            setattr(self, slot, value)
+        else:
+            setattr(request, name, value)
+    return property(get, set, doc=doc)
+
+class _RequestScope:
+
+    """Context manager returned by HTML.request()."""
+
+    __slots__ = ('_request', '_token')
+
+    def __init__(self, request):
+        self._request = request
+        self._token = None
+
+    def __enter__(self):
+        self._request.outer = _request.get()
+        self._token = _request.set(self._request)
+        return self._request.html
+
+    def __exit__(self, *exc_info):
+        _request.reset(self._token)
+        self._token = None
+
+def _interned_attrs_stripes():
+    """Create the intern table of Attrs once and return it."""
+    with _module_lock():
+        if Attrs._interned is None:
+            import threading
+            import weakref
+            Attrs._interned = tuple(
+                (weakref.WeakValueDictionary(), threading.Lock())
+                for i in range(_STRIPES))
+    return Attrs._interned
+
+class FragmentCache:
+
+    """Cache of rendered fragments that threads share.
+
+    Fragments are strings such as navigation bars or option lists that
+    are the same on many pages. The cache is split into stripes, each a
+    dict with its own lock, chosen by the hash of the key. Reading a
+    cached fragment takes no lock. A missing fragment is rendered once,
+    by the first thread that needs it, while the others that need it wait
+    for it; no lock is held while it is rendered, so fragments can
+    contain other fragments. This keeps the cache scalable on
+    free-threaded builds of CPython, where threads really run at once.
+
+    A fragment can also be kept as a gzip member, compressed once, which
+    the writers of HTML splice into gzip bodies as it is.
+
+    Useage:
+        fragments = htmldocument.FragmentCache()
+        ht = htmldocument.HTML(fragments=fragments)
+        print(ht.fragment('nav', render_nav, ht))
+    """
+
+    __slots__ = ('_stripes', 'level')
+
+    def __init__(self, stripes=16, level=6):
+
+        """Constructor of class FragmentCache.
+
+        Keyword arguments:
+            stripes -- number of stripes; more stripes let more threads
+                       add fragments at once (default 16)
+            level -- compression level of the gzip members (default 6)
+        """
+
+        import threading
+        # stripes of (fragments, lock, gzip members, fragments being
+        # rendered as key: (threading.Event, thread id))
+        self._stripes = tuple(({}, threading.Lock(), {}, {})
+                              for i in range(max(1, stripes)))
+        self.level = level
+
+    def __reduce__(self):
+        # A copy in another process, e.g. a worker of SectionPool, is an
+        # empty cache of its own.
+        return (FragmentCache, (len(self._stripes), self.level))
+
+    def get(self, key, render, *args):
+        """Return fragment of key, rendering it by render(*args) if missing.
+
+        Keyword arguments:
+            key -- hashable key of the fragment
+            render -- callable that returns the fragment
+            args -- arguments of render
+        """
+        table, lock, members, pending = self._stripes[
+            hash(key) % len(self._stripes)]
+        try:
+            return table[key]
+        except KeyError:
+            pass
+        import threading
+        while True:
+            with lock:
+                try:
+                    return table[key]
+                except KeyError:
+                    pass
+                rendering = pending.get(key)
+                if rendering is None:
+                    rendering = pending[key] = (threading.Event(),
+                                                threading.get_ident())
+                    break
+            if rendering[1] == threading.get_ident():
+                raise RuntimeError('fragment %r contains itself' % (key,))
+            # Another thread renders it; if that fails, try again here.
+            rendering[0].wait()
+        try:
+            fragment = render(*args)
+        except BaseException:
+            with lock:
+                if pending.get(key) is rendering:
+                    del pending[key]
+            rendering[0].set()
+            raise
+        with lock:
+            # It is not kept if it was discarded meanwhile.
+            if pending.get(key) is rendering:
+                del pending[key]
+                table[key] = fragment
+        rendering[0].set()
+        return fragment
+
+    def member(self, key, render, args=(), encoding='utf-8'):
+        """Return gzip member of fragment of key encoded in encoding.
+
+        The member is compressed on first use and kept with the fragment.
+
+        Keyword arguments:
+            key -- hashable key of the fragment
+            render -- callable that returns the fragment
+            args -- arguments of render (default ())
+            encoding -- encoding of the fragment (default 'utf-8')
+        """
+        table, lock, members, pending = self._stripes[
+            hash(key) % len(self._stripes)]
+        try:
+            return members[key, encoding]
+        except KeyError:
+            pass
+        import zlib
+        fragment = self.get(key, render, *args)
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        member = (compressor.compress(
+                      fragment.encode(encoding, 'xmlcharrefreplace')) +
+                  compressor.flush())
+        with lock:
+            # It is not kept if the fragment was discarded meanwhile.
+            if table.get(key) is not fragment:
+                return member
+            return members.setdefault((key, encoding), member)
+
+    def discard(self, key):
+        """Remove fragment of key if it is cached."""
+        table, lock, members, pending = self._stripes[
+            hash(key) % len(self._stripes)]
+        with lock:
+            table.pop(key, None)
+            pending.pop(key, None)
+            for member in [member for member in members if member[0] == key]:
+                del members[member]
+
+    def clear(self):
+        """Remove all fragments."""
+        for table, lock, members, pending in self._stripes:
+            with lock:
+                table.clear()
+                members.clear()
+                pending.clear()
+
+    def __contains__(self, key):
+        return key in self._stripes[hash(key) % len(self._stripes)][0]
+
+    def __len__(self):
+        return sum(len(stripe[0]) for stripe in self._stripes)
+
+class HTML:
+
+    """Assist to make HTML.
+
+    Attributes:
+        encode -- encoding
+        lang -- lang attribute of html element
+        sitetitle -- site title
+        pagetitle -- default page title
+        titledelimiter -- delimiter of site title and page title
+        cssfiles -- list object that contains path strings to css files
+        jsfiles -- list object that contains path string to JavaScript files
+        jstext -- text of JavaScript code
+        cookie -- http cookie
+        nocache -- if it is True then do not make user agents create cache
+        fragments -- FragmentCache object shared by the site or None
+        assets -- tuple object that contains Asset objects
+        fingerprints -- Fingerprints object for cssfiles and jsfiles or None
+        bundler -- Bundler object for cssfiles and jsfiles or None
+        critical -- CriticalCSS object to inline in the head or None
+        minify -- if it is True then output is minified
+        compression -- Compression object of the response bodies or None
+
+    Methodes:
+        set_encode(encode) -- Set attribute encode.
+        set_lang(lang) -- Set attribute lang.
+        set_site_title(sitetitle) -- Set attribute sitetitle.
+        set_page_title(pagetitle) -- Set attribute pagetitle.
+        set_titledelimiter(titledelimiter) -- Set attribute titledelimiter.
+        set_cookie(cookie) -- Set attribute cookie.
+        set_nocache(nocache) -- Set attribute nocache.
+        request([environ], [**state]) -- Scope pagetitle, cookie, nocache and
+                                         script name to a request.
+        derive([**overrides]) -- Create HTML object sharing the site
+                                 configuration.
+        fragment(key, render, [*args]) -- Return cached fragment of key.
+        resp_headers([content_encoding]) -- Return HTTP response header
+                                            fields as pairs.
+        resp_header([content_encoding]) -- Return HTTP Response Header.
+        html_header() -- Return html start tag, head element and body start
+                         tag.
+        html_close() -- Return end tags of body element and html element.
+        head_bytes() -- Return html_header() encoded.
+        print_resp_header() -- Print HTTP Response Header.
+        print_html_header() -- Print xhtml DTD, html start tag, head element
+                               and body start tag.
+        print_html_close() -- Print end tags of body element and html element.
+        early_hints() -- Return Link header values of 103 Early Hints.
+        early_hints_response() -- Return 103 Early Hints response as bytes.
+        wsgi_early_hints(environ) -- Send 103 Early Hints with WSGI server.
+        asgi_early_hints(scope, send) -- Send 103 Early Hints with ASGI
+                                         server.
+        flush_head([out]) -- Write head_bytes() and flush it for CGI.
+        wsgi_start(start_response, [status], [headers]) -- Start WSGI
+                                         response and send head_bytes().
+        asgi_start(send, [status], [headers]) -- Start ASGI response and send
+                                                 head_bytes().
+        include_file(path, [out], [encoding]) -- Write file without
+                                                 decoding it.
+        wsgi_file(environ, path, [block_size]) -- Return WSGI body of file.
+        text_chunks(elemname, source, [attrs], [encoding], [chunk_size])
+            -- Yield pre, textarea, code or samp element of huge text as
+               escaped chunks.
+        include_text(elemname, source, [out], [attrs], [encoding],
+                     [chunk_size]) -- Write element by text_chunks().
+        body_writer([out]) -- Return writer of a CGI response, compressed as
+                              negotiated.
+        wsgi_writer(start_response, [status], [headers], [environ])
+            -- Return writer of a WSGI response.
+        asgi_writer(send, [status], [headers], [scope]) -- Return writer of
+                                                           an ASGI response.
+        print_sections(sections, [pool], [out]) -- Print sections in order,
+                                                   maybe in parallel.
+        stream(sections, [header], [close]) -- Yield document as chunks,
+                                               slow sections out of order.
+        print_stream(sections, [header], [close], [out]) -- Print document
+                                                            with stream().
+        h1(content, [attrs]) -- Create h1 element.
+        h2(content, [attrs]) -- Create h2 element.
+        h3(content, [attrs]) -- Create h3 element.
+        h4(content, [attrs]) -- Create h4 element.
+        h5(content, [attrs]) -- Create h5 element.
+        h6(content, [attrs]) -- Create h6 element.
+        p(content, [attrs]) -- Create p element.
+        start_p([attrs]) -- Create start tag of p element.
+        end_p() -- Create end tag of p element.
+        div(content, [attrs]) -- Create div element.
+        start_div([attrs]) -- Create start tag of div element.
+        end_div() -- Create end tag of div element.
+        blockquote(content, [cite], [attrs]) -- Create blockquote element.
+        start_blockquote([cite], [attrs]) -- Create start tag of blockquote
+                                             element.
+        end_blockquote() -- Create end tag of blockquote element.
+        pre(content, [attrs]) -- Create pre element.
+        start_pre([attrs]) -- Create start tag of pre element.
+        end_pre() -- Create end tag of pre element.
+        address(content, [attrs]) -- Create address element.
+        Del(content, [attrs]) -- Create del element.
+        ins(content, [attrs]) -- Create ins element.
+        a(content, [attrs]) -- Create a element.
+        em(content, [attrs]) -- Create em element.
+        strong(content, [attrs]) -- Create strong element.
+        abbr(content, [attrs]) -- Create abbr element.
+        acronym(content, [attrs]) -- Create acronym element.
+        bdo(content, [attrs]) -- Create bdo element.
+        cite(content, [attrs]) -- Create cite element.
+        code(content, [attrs]) -- Create code element.
+        dfn(content, [attrs]) -- Create dfn element.
+        kbd(content, [attrs]) -- Create kbd element.
+        q(content, [attrs]) -- Create q element.
+        samp(content, [attrs]) -- Create samp element.
+        span(content, [attrs]) -- Create span element.
+        sub(content, [attrs]) -- Create sub element.
+        sup(content, [attrs]) -- Create sup element.
+        var(content, [attrs]) -- Create var element.
+        ruby(content, title, [attrs]) -- Create ruby element.
+        ol(content, [attrs]) -- Create ol element.
+        start_ol([attrs]) -- Create start tag of ol element.
+        end_ol() -- Create end tag of ol element.
+        ul(content, [attrs]) -- Create ul element.
+        start_ul([attrs]) -- Create start tag of ul element.
+        end_ul() -- Create end tag of ul element.
+        li(content, [attrs]) -- Create li element.
+        dl(content, [attrs]) -- Create dl element.
+        start_dl([attrs]) -- Create start tag of dl element.
+        end_dl() -- Create end tag of p element.
+        dt(content, [attrs]) -- Create dt element.
+        dd(content, [attrs]) -- Create dd element.
+        br([attrs]) -- Create br element.
+        hr([attrs]) -- Create hr element.
+        start_form([method], [action], [enctype], [attrs]) -- Create start tag
+                                                              of form element.
+        start_multipart_form([method], [action], [enctype], [attrs]) -- Create
+                                       start tag of form element for multipart.
+        read_form([environ], [parser]) -- Return parts of multipart/form-data
+                                          request body.
+        asgi_read_form(scope, receive, [parser]) -- Return parts of
+                                   multipart/form-data request body of ASGI.
+        end_form() -- Create end tag of form element.
+        textfield([name], [value], [size], [maxlength], [attrs]) -- Create
+                                          input element as form item text field.
+        textarea([name], [value], [rows], [columns], [attrs]) -- Create textarea
+                                                                 element.
+        password_field([name], [value], [size], [maxlength], [attrs]) -- Create
+                                      input element as form item password field.
+        filefield([name], [value], [size], [maxlength], [attrs]) -- Create input
+                                                element as form item file field.
+        popup_menu([name], [values], [default], [labels], [attributes], [attrs])
+            -- Create select element as form item popup menu.
+        scrolling_list([name], [values], [default], [size], [multiple],
+                       [labels], [attributes], [attrs]) -- Create select element
+                                                    as form item scrolling list.
+        select_list([name], [values], [default], [labels], [attributes], [size],
+                    [multiple], [attrs]) -- Create select element.
+        checkbox_group([name], [values], [default], [delimiter], [labels],
+                       [attributes], [attrs]) -- Create input elements as form
+                                                 item check box group.
+        checkbox([name], [checked], [value], [label], [attrs]) -- Create input
+                                           element as form item check box group.
+        radio_group([name], [values], [default], [delimiter], [labels],
+                    [attributes], [attrs]) -- Create input elements as form item
+                                              radio button group.
+        button_group([type], [name], [values], [default], [delimiter], [labels],
+                     [attributes], [attrs]) -- Create input elements.
+        submit([name], [value], [attrs]) -- Create input element as form item
+                                            submit button.
+        reset([name], [value], [attrs]) -- Create input element as form item
+                                           reset button.
+        button([name], [value], [attrs]) -- Create input element as form item
+                                            button.
+        hidden([name], [value], [attrs]) -- Create input element as form item
+                                            hidden.
+        input(type, [attrs]) -- Create input element.
+        <element>(content, [attrs]) -- Create element of the element
+                                       registry, e.g. section, table, td.
+        <element>([attrs]) -- Create void element of the element registry,
+                              e.g. img, meta, wbr.
+        start_<element>([attrs]) -- Create start tag of element.
+        end_<element>() -- Create end tag of element.
+
+    Element attributes:
+        attrs of the element and form methods is a dict object, a tuple of
+        (name, value) pairs or an Attrs object, and it is never modified, so
+        one object can be shared by many calls. Attrs objects are
+        serialized only once. Attributes can also be given as keyword
+        arguments; a trailing '_' of a name is dropped and other '_' become
+        '-' (class_='note', data_id=1).
+
+    Useage:
+        import htmldocument
+
+        ht = htmldocument.HTML(
+            encode='utf-8',
+            lang='ja',
+            sitetitle='Site Name',
+            cssfiles=['./css/main.css'],
+            jsfiles=['./js/main.js'])
+        html.print_resp_header()
+        html.print_html_header()
+        print(ht.h1('Header Level 1'))
+        print(ht.p('Text body.'))
+        html.print_html_close()
+
+        # per request, sharing the site configuration of ht
+        page = ht.derive(pagetitle='Page Title', cookie=cookie)
+
+        # per request, sharing ht itself between threads or tasks
+        with ht.request(environ, pagetitle='Page Title'):
+            ht.print_resp_header()
+            ...
+    """
+
+    __slots__ = ('_site', '_pagetitle', '_cookie', '_nocache')
+
+    pagetitle = _request_attribute('pagetitle', 'default page title')
+    cookie = _request_attribute('cookie', 'http cookie')
+    nocache = _request_attribute(
+        'nocache', 'if it is True then do not make user agents create cache')
+
+    encode = _site_attribute('encode', 'encoding')
+    lang = _site_attribute('lang', 'lang attribute of html element')
+    sitetitle = _site_attribute('sitetitle', 'site title')
+    titledelimiter = _site_attribute(
+        'titledelimiter', 'delimiter of site title and page title')
+    cssfiles = _site_files_attribute(
+        'cssfiles', 'list object that contains path strings to css files')
+    jsfiles = _site_files_attribute(
+        'jsfiles', 'list object that contains path strings to JavaScript files')
+    jstext = _site_attribute('jstext', 'text of JavaScript code')
+    fragments = _site_attribute(
+        'fragments', 'FragmentCache object shared by the site or None')
+    assets = _site_attribute(
+        'assets', 'tuple object that contains Asset objects')
+    fingerprints = _site_attribute(
+        'fingerprints', 'Fingerprints object for cssfiles and jsfiles or None')
+    bundler = _site_attribute(
+        'bundler', 'Bundler object for cssfiles and jsfiles or None')
+    critical = _site_attribute(
+        'critical', 'CriticalCSS object to inline in the head or None')
+    minify = _site_attribute(
+        'minify', 'if it is True then output is minified')
+    compression = _site_attribute(
+        'compression', 'Compression object of the response bodies or None')
+
+    def __init__(self, encode='utf-8', lang='en', sitetitle='Untitled Site',
+                 pagetitle='Untitled', titledelimiter=' :: ',
+                 cssfiles=None, jsfiles=None, jstext=None, cookie=None,
+                 nocache=False, fragments=None, assets=None,
+                 fingerprints=None, bundler=None, critical=None,
+                 minify=False, compression=None):
+
+        """Constructor of class HTML.
+
+        Keyword arguments:
+            encode -- encoding (default 'utf-8')
+            lang -- lang attribute of html element (default 'en')
+            sitetitle -- site title (default 'Untitled Site')
+            pagetitle -- default page title (default 'Untitled')
+            titledelimiter -- delimiter of site title and page title
+                              (default ' :: ')
+            cssfiles -- list object that contains path strings to css files
+                        (default None)
+            jsfiles -- list object that contains path string to JavaScript files
+                       (default None)
+            jstext -- text of JavaScript code (default None)
+            cookie -- http cookie (default None)
+            nocache -- if it is True then do not make user agents create cache
+                       (default False)
+            fragments -- FragmentCache object for fragment() (default None,
+                         means fragments are not cached)
+            assets -- list object that contains Asset objects, such as
+                      deferred scripts and resource hints (default None)
+            fingerprints -- Fingerprints object to make URLs of cssfiles and
+                            jsfiles content hashed (default None)
+            bundler -- Bundler object to combine local cssfiles and jsfiles
+                       into one file each (default None)
+            critical -- CriticalCSS object to inline critical stylesheets
+                        and load cssfiles without blocking (default None)
+            minify -- if it is True then elements and printers make
+                      minified output (default False)
+            compression -- Compression object to compress the bodies of
+                           the writers (default None)
+        """
+
+        self._site = _Site(encode, lang, sitetitle, titledelimiter,
+                           cssfiles, jsfiles, jstext, fragments, assets,
+                           fingerprints, bundler, critical, minify,
+                           compression)
+        self._pagetitle = pagetitle
+        self._cookie = cookie
+        self._nocache = nocache
+
+    def derive(self, **overrides):
+        """Create HTML object sharing the site configuration.
+
+        The new object shares encode, lang, sitetitle, titledelimiter,
+        cssfiles, jsfiles, jstext and assets with this one, which are copied
+        only if they are overridden, and starts with its pagetitle, cookie
+        and nocache. Use it to make an object per request from one object
+        made at start up.
+
+        Keyword arguments:
+            overrides -- attributes to differ from this object, e.g.
+                         pagetitle='Page Title'
+        """
+        # Outside of request() the slots are read directly, since each
+        # read of the properties looks up the current request.
+        request = _current_request(self)
+        if request is None:
+            state = (self._pagetitle, self._cookie, self._nocache)
+        else:
+            state = (request.pagetitle, request.cookie, request.nocache)
+        html = object.__new__(type(self))
+        html._pagetitle = overrides.pop('pagetitle', state[0])
+        html._cookie = overrides.pop('cookie', state[1])
+        html._nocache = overrides.pop('nocache', state[2])
+        if overrides:
+            for name in overrides:
+                if name not in _Site._fields:
+                    raise TypeError(
+                        'derive() got an unexpected keyword argument %r'
+                        % name)
+            html._site = self._site.replace(**overrides)
+        else:
+            html._site = self._site
+        return html
+
+    def request(self, environ=None, **state):
+        """Scope pagetitle, cookie, nocache and script name to a request.
+
+        Return a context manager. Inside its with statement, pagetitle,
+        cookie and nocache of this object, and the set_* methods of them,
+        belong to the request being handled in the current thread or
+        asyncio task, so one HTML object can serve many requests at once.
+        SCRIPT_NAME, the default action of forms, HTTP_ACCEPT_ENCODING and
+        HTTP_AVAILABLE_DICTIONARY are looked up in environ once. Site
+        attributes such as encode and cssfiles stay shared.
+
+        Keyword arguments:
+            environ -- dict object of CGI or WSGI environment variables
+                       (default None, means os.environ)
+            state -- initial pagetitle, cookie and nocache of the request;
+                     the ones not given are taken from this object
+        """
+        for name in state:
+            if name not in ('pagetitle', 'cookie', 'nocache'):
+                raise TypeError(
+                    'request() got an unexpected keyword argument %r' % name)
+        if environ is None:
+            environ = os.environ
+        return _RequestScope(_Request(
+            self, None,
+            state.get('pagetitle', self.pagetitle),
+            state.get('cookie', self.cookie),
+            state.get('nocache', self.nocache),
+            environ.get('SCRIPT_NAME', ''),
+            environ.get('HTTP_ACCEPT_ENCODING', ''),
+            environ.get('HTTP_AVAILABLE_DICTIONARY', '')))
+
+    def fragment(self, key, render, *args):
+        """Return cached fragment of key, rendering it if missing.
+
+        The fragment is rendered by render(*args) and kept in the
+        FragmentCache object of attribute fragments; without it the
+        fragment is rendered every time.
+
+        Keyword arguments:
+            key -- hashable key of the fragment
+            render -- callable that returns the fragment
+            args -- arguments of render
+        """
+        fragments = self._site.fragments
+        if fragments is None:
+            return render(*args)
+        return fragments.get(key, render, *args)
+
+    @property
+    def script_name(self):
+        """SCRIPT_NAME of the request, the default action of forms."""
+        request = _current_request(self)
+        if request is None:
+            return os.environ.get('SCRIPT_NAME', '')
+        return request.script_name
+
+    @property
+    def content_encoding(self):
+        """Encoding of the response body negotiated from Accept-Encoding.
+
+        It is None without compression or if the user agent accepts none
+        of its encodings.
+        """
+        compression = self._site.compression
+        if compression is None:
+            return None
+        request = _current_request(self)
+        if request is None:
+            return compression.negotiate(
+                os.environ.get('HTTP_ACCEPT_ENCODING', ''),
+                os.environ.get('HTTP_AVAILABLE_DICTIONARY', ''))
+        return compression.negotiate(request.accept_encoding,
+                                     request.available_dictionary)
+
+    # setters
+
+    def set_encode(self, encode):
+        """Set attribute encode."""
+        self.encode = encode
+
+    def set_lang(self, lang):
+        """Set attribute lang."""
+        self.lang = lang
+
+    def set_site_title(self, sitetitle):
+        """Set attribute sitetitle."""
+        self.sitetitle = sitetitle
+
+    def set_page_title(self, pagetitle):
+        """Set attribute pagetitle."""
+        self.pagetitle = pagetitle
+
+    def set_titledelimiter(self, titledelimiter):
+        """Set attribute titledelimiter."""
+        self.titledelimiter = titledelimiter
+
+    def set_cookie(self, cookie):
+        """Set attribute cookie."""
+        self.cookie = cookie
+
+    def set_nocache(self, nocache):
+        """Set attribute nocache."""
+        self.nocache = nocache
+
+    # printers
+
+    def resp_headers(self, content_encoding=None):
+        """Return HTTP response header fields as list of (name, value).
+
+        Keyword arguments:
+            content_encoding -- encoding of the body, e.g. 'gzip' (default
+                                None, means not compressed)
+        """
+        if self.encode == '' or not isinstance(self.encode, str):
+            headers = [('Content-Type', 'text/html')]
+        else:
+            headers = [('Content-Type',
+                        'text/html; charset={0}'.format(self.encode))]
+
+        if self.cookie is not None:
+            from http import cookies
+            if isinstance(self.cookie, cookies.SimpleCookie):
+                for morsel in self.cookie.values():
+                    headers.append(('Set-Cookie', morsel.OutputString()))
+
+        if self.nocache:
+            headers.append(('Pragma', 'no-cache'))
+            headers.append(('Cache-Control', 'no-cache'))
+            headers.append(('Expires', 'Thu, 01 Dec 1994 16:00:00 GMT'))
+
+        link = self._site.link()
+        if link:
+            headers.append(('Link', link))
+
+        if content_encoding is not None:
+            headers.append(('Content-Encoding', content_encoding))
+        compression = self._site.compression
+        if compression is not None:
+            if compression.dictionary is None:
+                headers.append(('Vary', 'Accept-Encoding'))
+            else:
+                headers.append(
+                    ('Vary', 'Accept-Encoding, Available-Dictionary'))
+
+        return headers
+
+    def resp_header(self, content_encoding=None):
+        """Return HTTP Response Header as CGI output.
+
+        Keyword arguments:
+            content_encoding -- encoding of the body, e.g. 'gzip' (default
+                                None, means not compressed)
+        """
+        return ''.join('{0}: {1}\n'.format(name, value) for name, value
+                       in self.resp_headers(content_encoding)) + '\n'
+
+    def html_header(self):
+        """Return html start tag, head element and body start tag."""
+        before, after = self._site.head()[:2]
+        return before + escape(self.pagetitle) + after
+
+    def head_bytes(self):
+        """Return html_header() encoded in encode.
+
+        Only the page title is encoded per call; the rest of the head is
+        encoded once per site configuration.
+        """
+        before, after = self._site.head()[2:]
+        return before + escape(self.pagetitle).encode(
+            _encoding(self.encode), 'xmlcharrefreplace') + after
+
+    def html_close(self):
+        """Return end tags of body element and html element.
+
+        Scripts of assets with body set are put before them.
+        """
+        return self._site.close()
+
+    def print_resp_header(self):
+        """Print HTTP Response Header."""
+        print(self.resp_header(), end='')
+
+    def print_html_header(self):
+        """Print html start tag, head element and body start tag."""
+        print(self.html_header(), end='')
+
+    def print_html_close(self):
+        """Print end tags of body element and html element."""
+        print(self.html_close(), end='')
+
+    # early hints
+
+    def early_hints(self):
+        """Return Link header values of 103 Early Hints.
+
+        They preload cssfiles, jsfiles and assets, so that the browser can
+        fetch them while the page is rendered.
+        """
+        return list(self._site.hints())
+
+    def early_hints_response(self):
+        """Return 103 Early Hints response of HTTP/1.1 as bytes.
+
+        Write it to the connection before the final response, e.g. to
+        wfile of http.server.BaseHTTPRequestHandler.
+        """
+        lines = ['HTTP/1.1 103 Early Hints']
+        lines.extend('Link: ' + link for link in self._site.hints())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    def wsgi_early_hints(self, environ):
+        """Send 103 Early Hints with the wsgi.early_hints of the server.
+
+        Return True if it is sent, or False if the server does not provide
+        wsgi.early_hints or there are no hints. Call it before
+        start_response or wsgi_start().
+
+        Keyword arguments:
+            environ -- environ of WSGI
+        """
+        send = environ.get('wsgi.early_hints')
+        links = self._site.hints()
+        if send is None or not links:
+            return False
+        send([('Link', link) for link in links])
+        return True
+
+    async def asgi_early_hints(self, scope, send):
+        """Send 103 Early Hints with the early hint extension of ASGI.
+
+        Return True if it is sent, or False if the server does not support
+        http.response.early_hint or there are no hints. Call it before
+        asgi_start().
+
+        Keyword arguments:
+            scope -- scope of ASGI
+            send -- send awaitable callable of ASGI
+        """
+        links = self._site.hints()
+        extensions = scope.get('extensions') or {}
+        if 'http.response.early_hint' not in extensions or not links:
+            return False
+        await send({
+            'type': 'http.response.early_hint',
+            'links': [link.encode('latin-1') for link in links],
+        })
+        return True
+
+    # early flush
+
+    def flush_head(self, out=None):
+        """Write head_bytes() and flush it for CGI.
+
+        Call it after print_resp_header() and before rendering the body,
+        so that the browser can fetch stylesheets and scripts meanwhile.
+
+        Keyword arguments:
+            out -- binary file object to write to (default None, means
+                   standard output)
+        """
+        if out is None:
+            sys.stdout.flush()
+            out = getattr(sys.stdout, 'buffer', sys.stdout)
+        out.write(self.head_bytes())
+        out.flush()
+
+    def wsgi_start(self, start_response, status='200 OK', headers=()):
+        """Start a WSGI response and send head_bytes() at once.
+
+        The head is passed to the write callable returned by
+        start_response, so the server sends it before the application
+        returns the body. Return the write callable.
+
+        Keyword arguments:
+            start_response -- start_response callable of WSGI
+            status -- status line (default '200 OK')
+            headers -- list object that contains more header fields as
+                       (name, value) (default ())
+        """
+        write = start_response(status, self.resp_headers() + list(headers))
+        write(self.head_bytes())
+        return write
+
+    async def asgi_start(self, send, status=200, headers=()):
+        """Start an ASGI HTTP response and send head_bytes() at once.
+
+        The head is sent as the first part of the body with more_body set,
+        so the rest has to be sent by the caller, the last part without
+        more_body.
+
+        Keyword arguments:
+            send -- send awaitable callable of ASGI
+            status -- status code (default 200)
+            headers -- list object that contains more header fields as
+                       (name, value) (default ())
+        """
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'),
+                         value.encode('latin-1'))
+                        for name, value in self.resp_headers() + list(headers)],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': self.head_bytes(),
+            'more_body': True,
+        })
+
+    # files
+
+    def include_file(self, path, out=None, encoding=None):
+        """Write content of file path to out without decoding it.
+
+        The file is sent by os.sendfile() if out is a file descriptor, a
+        socket or a file object that has one, and otherwise written from a
+        memory map of it, e.g. to the writers of HTML, so its content is
+        never made a string. If encoding of the file differs from encode,
+        it is decoded and encoded instead.
+
+        Keyword arguments:
+            path -- name of the file
+            out -- file descriptor, socket or binary file object (default
+                   None, means standard output)
+            encoding -- encoding of the file (default None, means the same
+                        as encode)
+        """
+        if out is None:
+            sys.stdout.flush()
+            out = getattr(sys.stdout, 'buffer', sys.stdout)
+        target = _encoding(self.encode)
+        if encoding is not None:
+            import codecs
+            if codecs.lookup(encoding).name != codecs.lookup(target).name:
+                with open(path, encoding=encoding) as f:
+                    _write_to(out, f.read().encode(target, 'xmlcharrefreplace'))
+                return
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            fd = _out_fd(out)
+            if fd is not None and _sendfile(fd, f, size):
+                return
+            import mmap
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    _write_to(out, view)
+
+    def wsgi_file(self, environ, path, block_size=65536):
+        """Return WSGI body iterable of file path.
+
+        It is made by wsgi.file_wrapper of the server, which may send the
+        file by sendfile(), or else reads it by blocks.
+
+        Keyword arguments:
+            environ -- environ of WSGI
+            path -- name of the file
+            block_size -- bytes read at a time (default 65536)
+        """
+        f = open(path, 'rb')
+        wrapper = environ.get('wsgi.file_wrapper')
+        if wrapper is not None:
+            return wrapper(f, block_size)
+        return _FileBlocks(f, block_size)
+
+    def text_chunks(self, elemname, source, attrs=None, encoding=None,
+                    chunk_size=65536, **kwattrs):
+        """Yield element of text source as escaped chunks of bytes.
+
+        The text is read and escaped chunk by chunk, so memory use does not
+        grow with its size; characters split between chunks are decoded
+        whole. A file is read from a memory map of it. If encoding is the
+        same as encode and it is UTF-8, the bytes are only checked and
+        escaped, not decoded. Bytes invalid in encoding are replaced by
+        U+FFFD either way.
+
+        Keyword arguments:
+            elemname -- 'pre', 'textarea', 'code' or 'samp'
+            source -- name of a file, mmap or other buffer of the text
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            encoding -- encoding of the text (default None, means the same
+                        as encode)
+            chunk_size -- bytes of the text read at a time (default 65536)
+            kwattrs -- attributes as keyword arguments
+        """
+        if elemname not in _TEXT_ELEMENTS:
+            raise ValueError('need pre, textarea, code or samp, got %r'
+                             % elemname)
+        target = _encoding(self.encode)
+        yield self._create_start_tag(elemname, attrs, kwattrs).encode(
+            target, 'xmlcharrefreplace')
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    import mmap
+                    with mmap.mmap(f.fileno(), 0,
+                                   access=mmap.ACCESS_READ) as mapped:
+                        yield from _escaped_chunks(mapped, encoding, target,
+                                                   chunk_size)
+        else:
+            yield from _escaped_chunks(source, encoding, target, chunk_size)
+        yield self._create_end_tag(elemname).encode(target)
+
+    def include_text(self, elemname, source, out=None, attrs=None,
+                     encoding=None, chunk_size=65536, **kwattrs):
+        """Write element of text source to out by text_chunks().
+
+        Keyword arguments:
+            elemname -- 'pre', 'textarea', 'code' or 'samp'
+            source -- name of a file, mmap or other buffer of the text
+            out -- binary file object, e.g. a writer of HTML (default None,
+                   means standard output)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            encoding -- encoding of the text (default None, means the same
+                        as encode)
+            chunk_size -- bytes of the text read at a time (default 65536)
+            kwattrs -- attributes as keyword arguments
+        """
+        if out is None:
+            sys.stdout.flush()
+            out = getattr(sys.stdout, 'buffer', sys.stdout)
+        for chunk in self.text_chunks(elemname, source, attrs, encoding,
+                                      chunk_size, **kwattrs):
+            out.write(chunk)
+
+    # compression
+
+    def body_writer(self, out=None):
+        """Return writer of a CGI response, compressed as negotiated.
+
+        The writer prints the response header itself, with the
+        Content-Encoding it chooses, so do not call print_resp_header().
+        It compresses what is written to it chunk by chunk; flush() sends
+        what is written so far, e.g. after the head. A body shorter than
+        min_size of compression that is closed before any flush is not
+        compressed. Its write_fragment(key, render, *args) splices the
+        gzip member kept by the FragmentCache into a gzip body. Close the
+        writer at the end of the body.
+
+        Keyword arguments:
+            out -- binary file object to write to (default None, means
+                   standard output)
+        """
+        if out is None:
+            sys.stdout.flush()
+            out = getattr(sys.stdout, 'buffer', sys.stdout)
+        def start(content_encoding):
+            out.write(self.resp_header(content_encoding).encode('latin-1'))
+            return out.write
+        from ._compression import _BodyWriter
+        return _BodyWriter(self, start, out.flush)
+
+    def wsgi_writer(self, start_response, status='200 OK', headers=(),
+                    environ=None):
+        """Return writer of a WSGI response, compressed as negotiated.
+
+        It works like body_writer(), with start_response and its write
+        callable. The encoding is negotiated from HTTP_ACCEPT_ENCODING and
+        HTTP_AVAILABLE_DICTIONARY of environ. Files written uncompressed
+        are sent as bytes by blocks of 65536 bytes, since write takes only
+        bytes. Return an empty list from the application after closing the
+        writer.
+
+        Keyword arguments:
+            start_response -- start_response callable of WSGI
+            status -- status line (default '200 OK')
+            headers -- list object that contains more header fields as
+                       (name, value) (default ())
+            environ -- environ of WSGI (default None, means the one given
+                       to request(), or os.environ outside of it)
+        """
+        accept = None
+        if environ is not None:
+            accept = (environ.get('HTTP_ACCEPT_ENCODING', ''),
+                      environ.get('HTTP_AVAILABLE_DICTIONARY', ''))
+        def start(content_encoding):
+            return start_response(
+                status, self.resp_headers(content_encoding) + list(headers))
+        from ._compression import _BodyWriter
+        return _BodyWriter(self, start, None, accept, 65536)
+
+    def asgi_writer(self, send, status=200, headers=(), scope=None):
+        """Return writer of an ASGI response, compressed as negotiated.
+
+        It works like body_writer(), but its write(), flush() and close()
+        are awaitable. The encoding is negotiated from the Accept-Encoding
+        and Available-Dictionary fields in the headers of scope.
+
+        Keyword arguments:
+            send -- send awaitable callable of ASGI
+            status -- status code (default 200)
+            headers -- list object that contains more header fields as
+                       (name, value) (default ())
+            scope -- connection scope of ASGI (default None, means the
+                     environ given to request(), or os.environ outside of
+                     it)
+        """
+        accept = None
+        if scope is not None:
+            fields = {b'accept-encoding': [], b'available-dictionary': []}
+            for name, value in scope.get('headers', ()):
+                values = fields.get(bytes(name).lower())
+                if values is not None:
+                    values.append(bytes(value).decode('latin-1'))
+            accept = (', '.join(fields[b'accept-encoding']),
+                      ', '.join(fields[b'available-dictionary']))
+        async def start(content_encoding):
+            await send({
+                'type': 'http.response.start',
+                'status': status,
+                'headers': [(name.lower().encode('latin-1'),
+                             value.encode('latin-1')) for name, value in
+                            self.resp_headers(content_encoding) +
+                            list(headers)],
+            })
+        from ._compression import _AsgiBodyWriter
+        return _AsgiBodyWriter(self, start, send, accept)
+
+    def print_sections(self, sections, pool=None, out=None):
+        """Print sections in document order, maybe in parallel.
+
+        With pool, the sections are rendered by its worker processes as
+        long as their total size reaches pool.min_size, and each section
+        is written as soon as it and the ones before it are done. Otherwise
+        they are rendered here one by one.
+
+        Keyword arguments:
+            sections -- list object that contains Section objects
+            pool -- SectionPool object (default None)
+            out -- binary file object to write to (default None, means
+                   standard output)
+        """
+        if out is None:
+            sys.stdout.flush()
+            out = getattr(sys.stdout, 'buffer', sys.stdout)
+        if pool is not None and pool.accepts(sections):
+            chunks = pool.map(sections)
+        else:
+            encode = _encoding(self.encode)
+            chunks = (section.render(self, *section.args).encode(
+                encode, 'xmlcharrefreplace') for section in sections)
+        for chunk in chunks:
+            out.write(chunk)
+        out.flush()
+
+    async def stream(self, sections, header=True, close=True):
+        """Yield the document as encoded chunks, slow sections out of order.
+
+        Strings in sections are yielded at once. For each awaitable an
+        empty placeholder is yielded in its place, and its result is
+        yielded as soon as it is done, in a template element followed by
+        a small script which moves it into the placeholder.
+
+        Keyword arguments:
+            sections -- iterable object that contains strings and awaitables
+                        of strings
+            header -- yield html_header() first (default True)
+            close -- yield html_close() last (default True)
+        """
+        import asyncio
+        encode = _encoding(self.encode)
+        pending = {}
+        try:
+            if header:
+                yield self.head_bytes()
+            for section in sections:
+                if isinstance(section, str):
+                    yield section.encode(encode, 'xmlcharrefreplace')
+                    continue
+                number = len(pending)
+                pending[asyncio.ensure_future(section)] = number
+                yield _PLACEHOLDER.format(number).encode(encode)
+            swap = _SWAP_SCRIPT
+            waiting = set(pending)
+            while waiting:
+                done, waiting = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=pending.get):
+                    chunk = _SWAP.format(pending[task], task.result())
+                    yield (swap + chunk).encode(encode, 'xmlcharrefreplace')
+                    swap = ''
+            if close:
+                yield self.html_close().encode(encode, 'xmlcharrefreplace')
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def print_stream(self, sections, header=True, close=True,
+                           out=None):
+        """Print the document with stream(), flushing every chunk.
+
+        Keyword arguments:
+            sections -- iterable object that contains strings and awaitables
+                        of strings
+            header -- print html_header() first (default True)
+            close -- print html_close() last (default True)
+            out -- binary file object to write to (default None, means
+                   standard output)
+        """
+        if out is None:
+            sys.stdout.flush()
+            out = getattr(sys.stdout, 'buffer', sys.stdout)
+        async for chunk in self.stream(sections, header, close):
+            out.write(chunk)
+            out.flush()
+
+    # elements
+
+    def __getattr__(self, name):
+        # Methods of the registered elements, such as h1(), start_section()
+        # and img(), are generated on first access and cached in the class.
+        if not _elements_loaded:
+            _load_elements()
+        try:
+            spec, kind = _element_methods[name]
+        except KeyError:
+            raise AttributeError('{0!r} object has no attribute {1!r}'.format(
+                type(self).__name__, name)) from None
+        _install_element_method(name, spec, kind)
+        return getattr(self, name)
+
+    def blockquote(self, content, cite=None, attrs=None, **kwattrs):
+        """Create blockquote element.
+
+        Keyword arguments:
+            content -- some text
+            cite -- cite attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_element('blockquote', content, attrs, kwattrs,
+                                    (('cite', cite),))
+
+    def start_blockquote(self, cite=None, attrs=None, **kwattrs):
+        """Create start tag of blockquote element.
+
+        Keyword arguments:
+            cite -- cite attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_start_tag('blockquote', attrs, kwattrs,
+                                      (('cite', cite),))
+
+    def ruby(self, content, title, attrs=None, **kwattrs):
+        """Create ruby element.
+
+        Keyword arguments:
+            content -- some text
+            title -- ruby title text
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return '<ruby><rp>（</rp><rb>{0}</rb><rt>{1}</rb><rp>）</rp></ruby>'.format(content, title)
+
+    def li(self, content, attrs=None, **kwattrs):
+        """Create li element.
+
+        Keyword arguments:
+            content -- some text or list contains some texts
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        if isinstance(content, list) or isinstance(content, tuple):
+            result = list()
+            for li in content:
+                result.append(self._create_element('li', li, attrs, kwattrs))
+            return ''.join(result)
+        else:
+            return self._create_element('li', content, attrs, kwattrs)
+
+    def dl(self, content, attrs=None, **kwattrs):
+        """Create dl element.
+
+        Keyword arguments:
+            content -- some text or dict contains some texts
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        if isinstance(content, dict):
+            result = list()
+            result.append(self.start_dl(attrs, **kwattrs))
+            for di in content.keys():
+                result.append(self.dt(di))
+                result.append(self.dd(content[di]))
+            result.append(self.end_dl())
+            return ''.join(result)
+        else:
+            return self._create_element('dl', content, attrs, kwattrs)
+
+    # form elements
+
+    def start_form(self, method=None, action=None, enctype=None, attrs=None,
+                   **kwattrs):
+        """Create start tag of form element.
+
+        Keyword arguments:
+            method -- method attribute (default None)
+            action -- action attribute (default None)
+            enctype -- enctype attirbute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        if method is None:
+            method = 'POST'
+        if action is None:
+            action = self.script_name
+        return self._create_start_tag('form', attrs, kwattrs,
+                                      (('method', method),
+                                       ('action', action),
+                                       ('enctype', enctype)))
+
+    def start_multipart_form(self, method=None, action=None,
+                             enctype='multipart/form-data', attrs=None,
+                             **kwattrs):
+        """Create start tag of form element for multipart.
+
+        Keyword arguments:
+            method -- method attribute (default None)
+            action -- action attribute (default None)
+            enctype -- enctype attirbute (default 'multipart/form-data')
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self.start_form(method, action, enctype, attrs, **kwattrs)
+
+    def read_form(self, environ=None, parser=None):
+        """Return parts of multipart/form-data request body as a list.
+
+        The body is read from wsgi.input of environ, or from standard input
+        for CGI, and parsed by parser as it is read; see MultipartParser.
+        Each part is a FormPart object, to be closed when it is done with.
+
+        Keyword arguments:
+            environ -- environ of WSGI (default None, means os.environ and
+                       standard input of CGI)
+            parser -- MultipartParser object (default None, means one with
+                      the default limits, e.g. 1 GiB of body)
+        """
+        if environ is None:
+            environ = os.environ
+            stream = sys.stdin.buffer
+        else:
+            stream = environ['wsgi.input']
+        if parser is None:
+            from ._multipart import MultipartParser
+            parser = MultipartParser()
+        length = environ.get('CONTENT_LENGTH')
+        return parser.parse(stream, environ.get('CONTENT_TYPE', ''),
+                            int(length) if length else None)
+
+    async def asgi_read_form(self, scope, receive, parser=None):
+        """Return parts of multipart/form-data request body of ASGI.
+
+        It works like read_form(), with the body received by receive.
+
+        Keyword arguments:
+            scope -- connection scope of ASGI
+            receive -- receive function of ASGI
+            parser -- MultipartParser object (default None, means one with
+                      the default limits, e.g. 1 GiB of body)
+        """
+        if parser is None:
+            from ._multipart import MultipartParser
+            parser = MultipartParser()
+        content_type = ''
+        for name, value in scope.get('headers', ()):
+            if name.lower() == b'content-type':
+                content_type = value.decode('latin-1')
+        reader = parser._reader(content_type)
+        parts = []
+        try:
+            while not reader.done:
+                message = await receive()
+                if message['type'] != 'http.request':
+                    break
+                parts.extend(reader.feed(message.get('body', b'')))
+                if not message.get('more_body', False):
+                    break
+            reader.close()
+        except BaseException:
+            reader.abort()
+            for part in parts:
+                part.close()
+            raise
+        return parts
+
+    def textfield(self, name=None, value=None, size=None, maxlength=None,
+                  attrs=None, **kwattrs):
+        """Create input element as form item text field.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            size -- size attribute (default None)
+            maxlength -- maxlength attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('name', name),
+                                           ('value', value),
+                                           ('size', size),
+                                           ('maxlength', maxlength),
+                                           ('type', 'text')))
+
+    def textarea(self, name=None, value=None, rows=None, columns=None,
+                 attrs=None, **kwattrs):
+        """Create textarea element.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            rows -- rows attribute (default None)
+            columns -- cols attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        if value is None:
+            value = ''
+        return self._create_element('textarea', value, attrs, kwattrs,
+                                    (('name', name),
+                                     ('rows', rows),
+                                     ('cols', columns)))
+
+    def password_field(self, name=None, value=None, size=None,
+                       maxlength=None, attrs=None, **kwattrs):
+        """Create input element as form item password field.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            size -- size attribute (default None)
+            maxlength -- maxlength attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('name', name),
+                                           ('value', value),
+                                           ('size', size),
+                                           ('maxlength', maxlength),
+                                           ('type', 'password')))
+
+    def filefield(self, name=None, value=None, size=None, maxlength=None,
+                  attrs=None, **kwattrs):
+        """Create input element as form item file field.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            size -- size attribute (default None)
+            maxlength -- maxlength attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('name', name),
+                                           ('value', value),
+                                           ('size', size),
+                                           ('maxlength', maxlength),
+                                           ('type', 'file')))
+
+    def popup_menu(self, name=None, values=None, default=None,
+                   labels=None, attributes=None, attrs=None, **kwattrs):
+        """Create select element as form item popup menu.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            values -- list object that contains values (default None)
+            default -- default value (default None)
+            labels -- dict object that contains label text (default None)
+            attributes -- dict object that contains attributes for each item
+                          (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self.select_list(name=name, values=values, default=default,
+                                labels=labels, attributes=attributes,
+                                attrs=attrs, **kwattrs)
+
+    def scrolling_list(self, name=None, values=None, default=None,
+                       size=4, multiple=False,
+                       labels=None, attributes=None, attrs=None, **kwattrs):
+        """Create select element as form item scrolling list.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- list object that contains values (default None)
+            default -- default value (default None)
+            size -- size attribute (default 4)
+            multiple -- multiple attribute (default False)
+            labels -- dict object that contains label text (default None)
+            attributes -- dict object that contains attributes for each item
+                          (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self.select_list(name=name, values=values, default=default,
+                                labels=labels, attributes=attributes,
+                                size=size, multiple=multiple, attrs=attrs,
+                                **kwattrs)
+
+    def select_list(self, name=None, values=None, default=None,
+                    labels=None, attributes=None, size=None, multiple=False,
+                    attrs=None, **kwattrs):
+
+        """Create select element.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            values -- list object that contains values (default None)
+            default -- default value (default None)
+            labels -- dict object that contains label text (default None)
+            attributes -- dict object that contains attributes for each item
+                          (default None)
+            size -- size attribute (default None)
+            multiple -- multiple attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+
+        if not isinstance(values, list) and not isinstance(values, tuple):
+            raise TypeError('need list, got %r' % type(values))
+        if labels is not None and not isinstance(labels, dict):
+            raise TypeError('need dict, got %r' % type(labels))
+        if attributes is not None and not isinstance(attributes, dict):
+            raise TypeError('need dict, got %r' % type(attributes))
+        if not isinstance(size, int):
+            size = None
+        if multiple:
+            multiple = 'multiple'
+        else:
+            multiple = None
+        result = self._create_start_tag('select', attrs, kwattrs,
+                                        (('name', name),
+                                         ('size', size),
+                                         ('multiple', multiple)))
+        multidefault = isinstance(default, list) or isinstance(default, tuple)
+        for li in values:
+            iattrs = None
+            if attributes is not None:
+                iattrs = attributes.get(li)
+
+            selected = None
+            if multidefault:
+                if li in default:
+                    selected = 'selected'
+            else:
+                if default == li:
+                    selected = 'selected'
+
+            content = li
+            if labels is not None:
+                if li in labels:
+                    if labels[li] is not None:
+                        content = labels[li]
+            result += self._create_element('option', content, iattrs, None,
+                                           (('value', li),
+                                            ('selected', selected)))
+        result += self._create_end_tag('select')
+        return result
+
+    def checkbox_group(self, name=None, values=None, default=None,
+                       delimiter=None,labels=None, attributes=None,
+                       attrs=None, **kwattrs):
+        """Create input elements as form item check box group.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            values -- list object that contains values (default None)
+            default -- default value (default None)
+            delimiter -- delimiter for input elements. if it is None,
+                         return list object contains input elements
+                         (default None)
+            labels -- list object that contains label text (default None)
+            attributes -- dict object that contains attributes for each item
+                          (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self.button_group(type='checkbox', name=name,values=values,
+                                 default=default, delimiter=delimiter,
+                                 labels=labels, attributes=attributes,
+                                 attrs=attrs, **kwattrs)
+
+    def checkbox(self, name=None, checked=False, value=None, label='',
+                 attrs=None, **kwattrs):
+        """Create input element as form item check box group.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            checked -- checked attribute (default False)
+            value -- value attribute (default None)
+            label -- label text (default '')
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        if not checked:
+            checked = None
+        result = []
+        result.append(self._create_empty_element('input', attrs, kwattrs,
+                                                 (('name', name),
+                                                  ('checked', checked),
+                                                  ('value', value),
+                                                  ('type', 'checkbox'))))
+        if len(label) == 0:
+            label = value
+        if isinstance(label, int):
+            label = str(int)
+        if label is not None:
+            result.append(label)
+        return ' '.join(result)
+
+    def radio_group(self, name=None, values=None, default=None,
+                     delimiter=None,labels=None, attributes=None, attrs=None,
+                     **kwattrs):
+        """Create input elements as form item radio button group.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            values -- list object that contains values (default None)
+            default -- default value (default None)
+            delimiter -- delimiter for input elements. if it is None,
+                         return list object contains input elements
+                         (default None)
+            labels -- list object that contains label text (default None)
+            attributes -- dict object that contains attributes for each item
+                          (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        if isinstance(default, list) or isinstance(default, tuple):
+            default = default[0]
+        return self.button_group(type='radio', name=name,values=values,
+                                 default=default, delimiter=delimiter,
+                                 labels=labels, attributes=attributes,
+                                 attrs=attrs, **kwattrs)
+
+    def button_group(self, type='radio', name=None, values=None,
+                     default=None, delimiter=None,labels=None,
+                     attributes=None, attrs=None, **kwattrs):
+
+        """Create input elements.
+
+        Keyword arguments:
+            type -- type attribute (default 'radio')
+            name -- name attribute (default None)
+            values -- list object that contains values (default None)
+            default -- default value (default None)
+            delimiter -- delimiter for button elements. if it is None,
+                         return list object contains button elements
+                         (default None)
+            labels -- list object that contains label text (default None)
+            attributes -- dict object that contains attributes for each item
+                          (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+
+        if not isinstance(values, list):
+            raise TypeError('need list, got %r' % type(values))
+        if labels is not None and not isinstance(labels, dict):
+            raise TypeError('need dict, got %r' % type(labels))
+        if attributes is not None and not isinstance(attributes, dict):
+            raise TypeError('need dict, got %r' % type(attributes))
+
+        multidefault = isinstance(default, list)
+        result = []
+        for li in values:
+            iattrs = attrs
+            if attributes is not None:
+                if attributes.get(li) is not None:
+                    iattrs = _merge_attrs(attrs, attributes[li])
+
+            checked = None
+            if multidefault:
+                if li in default:
+                    checked = 'checked'
+            else:
+                if default == li:
+                    checked = 'checked'
+
+            content = li
+            if labels is not None:
+                if li in labels:
+                    if labels[li] is not None:
+                        content = labels[li]
+            if isinstance(content, int):
+                content = str(content)
+            result.append('{0} {1}'.format(
+                self._create_empty_element('input', iattrs, kwattrs,
+                                           (('name', name),
+                                            ('value', li),
+                                            ('checked', checked),
+                                            ('type', type))),
+                content))
+        if delimiter is not None and isinstance(delimiter, str):
+            result = delimiter.join(result)
+        return result
+
+
+    def submit(self, name=None, value=None, attrs=None, **kwattrs):
+        """Create input element as form item submit button.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('name', name),
+                                           ('value', value),
+                                           ('type', 'submit')))
+
+    def reset(self, name=None, value=None, attrs=None, **kwattrs):
+        """Create input element as form item reset button.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('name', name),
+                                           ('value', value),
+                                           ('type', 'reset')))
+
+    def button(self, name=None, value=None, attrs=None, **kwattrs):
+        """Create input element as form item button.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('name', name),
+                                           ('value', value),
+                                           ('type', 'button')))
+
+    def hidden(self, name=None, value=None, attrs=None, **kwattrs):
+        """Create input element as form item hidden.
+
+        Keyword arguments:
+            name -- name attribute (default None)
+            value -- value attribute (default None)
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('name', name),
+                                           ('value', value),
+                                           ('type', 'hidden')))
+
+    def input(self, type, attrs=None, **kwattrs):
+        """Create input element.
+
+        Keyword arguments:
+            type -- type attribute
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """
+        return self._create_empty_element('input', attrs, kwattrs,
+                                          (('type', type),))
+
+
+    def formitem(self, value, attrs=None, **kwattrs):
+        return self._create_element('input', value, attrs, kwattrs)
+
+    # internal methods
+
+    def _create_start_tag(self, elemname, attrs=None, kwattrs=None, extra=()):
+        return '<{0}{1}>'.format(
+            elemname, self._create_attr_string(attrs, kwattrs, extra))
+
+    def _create_end_tag(self, elemname):
+        return '</{0}>'.format(elemname)
+
+    def _create_attr_string(self, attrs, kwattrs=None, extra=()):
+        # extra holds the attributes given by the methods themselves; they
+        # override same named attributes of attrs unless they are None.
+        if kwattrs:
+            attrs = _merge_attrs(attrs, _keyword_attrs(kwattrs))
+        minify = self._site.minify
+        attrstr = ''
+        if isinstance(attrs, Attrs) and attrs._kept_by(extra):
+            attrstr = attrs._minified_str() if minify else str(attrs)
+        elif attrs:
+            for attrname, attrvalue in _attr_items(attrs):
+                if attrvalue is None:
+                    continue
+                for name, value in extra:
+                    if name == attrname and value is not None:
+                        break
+                else:
+                    if isinstance(attrvalue, int):
+                        attrvalue = _int_attr_value(attrname, attrvalue)
+                        if attrvalue is None:
+                            continue
+                    if minify:
+                        attrstr += _minified_attr(attrname, attrvalue)
+                    else:
+                        attrstr += ' {0}="{1}"'.format(
+                            escape(attrname), escape(attrvalue))
+        for attrname, attrvalue in extra:
+            if attrvalue is not None:
+                if isinstance(attrvalue, int):
+                    attrvalue = _int_attr_value(attrname, attrvalue)
+                    if attrvalue is None:
+                        continue
+                if minify:
+                    attrstr += _minified_attr(attrname, attrvalue)
+                else:
+                    attrstr += ' {0}="{1}"'.format(
+                        escape(attrname), escape(attrvalue))
+        return attrstr
+
+    def _create_element(self, elemname, content, attrs=None, kwattrs=None,
+                        extra=()):
+        starttag = self._create_start_tag(elemname, attrs, kwattrs, extra)
+        if self._site.minify and elemname in _OPTIONAL_END_TAGS:
+            endtag = ''
+        else:
+            endtag = self._create_end_tag(elemname)
+        if isinstance(content, int):
+            content = str(content)
+        if isinstance(content, str):
+            return '{0}{1}{2}'.format(starttag, content, endtag)
+        else:
+            raise TypeError('need string or int, got %r' % type(content))
+
+    def _create_empty_element(self, elemname, attrs=None, kwattrs=None,
+                              extra=()):
+        if self._site.minify:
+            return '<{0}{1}>'.format(
+                elemname, self._create_attr_string(attrs, kwattrs, extra))
+        return '<{0}{1} />'.format(
+            elemname, self._create_attr_string(attrs, kwattrs, extra))
+
+
+def _encoding(encode):
+    """Return encoding to encode output for attribute encode."""
+    if encode == '' or not isinstance(encode, str):
+        return 'utf-8'
+    return encode
+
+def _attr_items(attrs):
+    """Return (name, value) pairs of attrs."""
+    if isinstance(attrs, dict):
+        return attrs.items()
+    if (isinstance(attrs, tuple) or isinstance(attrs, list) or
+        isinstance(attrs, Attrs)):
+        return attrs
+    return ()
+
+def _int_attr_value(name, value):
+    """Return string of int attribute value, or None to omit it.
+
+    True and False of a boolean attribute give name="name" and nothing.
+    """
+    if isinstance(value, bool):
+        if not _elements_loaded:
+            _load_elements()
+        if name not in _boolean_attributes:
+            return str(value)
+        if value:
+            return name
+        return None
+    return str(value)
+
+def _minified_attr(name, value):
+    """Return string of an attribute for minified output.
+
+    A boolean attribute given as name="name" becomes name alone, and the
+    value is left unquoted unless it is empty or has a character that
+    needs quotes.
+    """
+    if not _elements_loaded:
+        _load_elements()
+    if value == name and name in _boolean_attributes:
+        return ' ' + escape(name)
+    if value and _UNQUOTED_UNSAFE.isdisjoint(value):
+        return ' {0}={1}'.format(escape(name), escape(value))
+    return ' {0}="{1}"'.format(escape(name), escape(value))
+
+# characters that an unquoted attribute value must not have
+_UNQUOTED_UNSAFE = frozenset(' \t\n\f\r"\'=<>`')
+
+# elements whose end tags minified output omits; they are optional
+# wherever the methods put these elements, in lists and select elements.
+_OPTIONAL_END_TAGS = frozenset(('li', 'dt', 'dd', 'option'))
+
+def _keyword_attrs(kwattrs):
+    """Return (name, value) pairs of attributes given as keyword arguments.
+
+    A trailing '_' of a name is dropped and other '_' become '-', so that
+    class_='note' and data_id=1 stand for class and data-id.
+    """
+    return [(name.rstrip('_').replace('_', '-'), value)
+            for name, value in kwattrs.items()]
+
+def _merge_attrs(attrs, override):
+    """Return pairs of attrs updated with pairs of override."""
+    override = _attr_items(override)
+    names = [name for name, value in override]
+    merged = [(name, value) for name, value in _attr_items(attrs)
+              if name not in names]
+    merged.extend(override)
+    return merged
+
+
+# out of order streaming
+
+# placeholder of a section of HTML.stream() that is not done yet
+_PLACEHOLDER = '<template id="hd-p{0}"></template>'
+
+# done section of HTML.stream(), moved into its placeholder by hdSwap()
+_SWAP = '<template id="hd-s{0}">{1}</template><script>hdSwap({0})</script>'
+
+# function that moves a done section into its placeholder, sent once
+_SWAP_SCRIPT = ('<script>function hdSwap(n){'
+                "var s=document.getElementById('hd-s'+n),"
+                "p=document.getElementById('hd-p'+n);"
+                'p.parentNode.replaceChild(s.content,p);'
+                's.parentNode.removeChild(s)}</script>')
+
+# files
+
+def _out_fd(out):
+    """Return file descriptor of out for os.sendfile(), or None."""
+    if isinstance(out, int):
+        return out
+    if not hasattr(os, 'sendfile'):
+        return None
+    fileno = getattr(out, 'fileno', None)
+    if fileno is None:
+        return None
+    try:
+        fd = fileno()
+    except (OSError, ValueError):
+        return None
+    flush = getattr(out, 'flush', None)
+    if flush is not None:
+        flush()
+    return fd
+
+def _sendfile(fd, f, size):
+    """Send size bytes of file object f to fd by os.sendfile().
+
+    Return False if nothing is sent because fd does not take it.
+    """
+    offset = 0
+    while offset < size:
+        try:
+            sent = os.sendfile(fd, f.fileno(), offset, size - offset)
+        except OSError:
+            if offset == 0:
+                return False
+            raise
+        if sent == 0:
+            break
+        offset += sent
+    return True
+
+def _write_to(out, data):
+    """Write bytes data to out, a file descriptor or file object."""
+    if isinstance(out, int):
+        with memoryview(data) as view:
+            while view:
+                view = view[os.write(out, view):]
+    else:
+        out.write(data)
+
+# elements that text_chunks() streams text into
+_TEXT_ELEMENTS = frozenset(('pre', 'textarea', 'code', 'samp'))
+
+def _escaped_chunks(buffer, encoding, target, chunk_size):
+    """Yield text of buffer escaped and encoded to target by chunks."""
+    import codecs
+    target_name = codecs.lookup(target).name
+    if encoding is None:
+        encoding = target
+    with memoryview(buffer) as view:
+        view = view.cast('B')
+        chunks = (bytes(view[offset:offset + chunk_size])
+                  for offset in range(0, len(view), chunk_size))
+        if target_name == 'utf-8' == codecs.lookup(encoding).name:
+            # No byte of a multibyte character of UTF-8 is ASCII, so valid
+            # chunks are escaped as they are; invalid bytes are replaced by
+            # U+FFFD as the decoder does.
+            rest = b''
+            for chunk in chunks:
+                if rest:
+                    chunk = rest + chunk
+                    rest = b''
+                # bytes of a character split at the end are kept for the
+                # next chunk
+                end = len(chunk)
+                for index in range(end - 1, max(end - 4, 0) - 1, -1):
+                    byte = chunk[index]
+                    if byte < 0x80:
+                        break
+                    if byte >= 0xc0:
+                        if end - index < (2 if byte < 0xe0 else
+                                          3 if byte < 0xf0 else 4):
+                            chunk, rest = chunk[:index], chunk[index:]
+                        break
+                try:
+                    chunk.decode('utf-8')
+                except UnicodeDecodeError:
+                    chunk = chunk.decode('utf-8', 'replace').encode('utf-8')
+                if chunk:
+                    yield (chunk.replace(b'&', b'&amp;')
+                           .replace(b'<', b'&lt;').replace(b'>', b'&gt;'))
+            if rest:
+                yield rest.decode('utf-8', 'replace').encode('utf-8')
+            return
+        decoder = codecs.getincrementaldecoder(encoding)('replace')
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield escape(text, False).encode(target, 'xmlcharrefreplace')
+        text = decoder.decode(b'', True)
+        if text:
+            yield escape(text, False).encode(target, 'xmlcharrefreplace')
+
+class _FileBlocks:
+
+    """WSGI body iterable of a file, for servers without file_wrapper."""
+
+    __slots__ = ('_file', '_block_size')
+
+    def __init__(self, f, block_size):
+        self._file = f
+        self._block_size = block_size
+
+    def __iter__(self):
+        return iter(lambda: self._file.read(self._block_size), b'')
+
+    def close(self):
+        self._file.close()
+
+# submodules
+
+# public names of the submodules: submodule. The submodules are imported
+# on first use of their names, so that scripts run as CGI load only what
+# they use.
+_SUBMODULE_NAMES = {
+    'Fingerprints': '_assets', 'Bundler': '_assets', 'CriticalCSS': '_assets',
+    'Compression': '_compression', 'CompressionDictionary': '_compression',
+    'train_dictionary': '_compression',
+    'MultipartParser': '_multipart', 'FormPart': '_multipart',
+    'Section': '_sections', 'SectionPool': '_sections',
+    'FastCGIServer': '_fastcgi',
+}
+
+def __getattr__(name):
+    """Return name of a submodule, importing the submodule on first use."""
+    try:
+        submodule = _SUBMODULE_NAMES[name]
+    except KeyError:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(
+            __name__, name)) from None
+    import importlib
+    value = getattr(importlib.import_module('.' + submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULE_NAMES))
+
+# element registry
+
+class _ElementSpec:
+
+    """Specification of an element in the element registry."""
+
+    __slots__ = ('name', 'content', 'void', 'booleans')
+
+    def __init__(self, name, content, booleans):
+        self.name = name
+        self.content = content
+        self.void = content == 'empty'
+        self.booleans = frozenset(booleans)
+
+    def __repr__(self):
+        return '_ElementSpec({0!r}, {1!r}, {2!r})'.format(
+            self.name, self.content, tuple(sorted(self.booleans)))
+
+# Boolean attributes allowed on every element.
+_GLOBAL_BOOLEANS = ('autofocus', 'hidden', 'inert', 'itemscope')
+
+# (name, content model, boolean attributes) of the elements of HTML.
+# Content model 'empty' marks void elements; 'nothing' marks elements
+# that have no content but an end tag, so content of their methods is
+# optional.
+_ELEMENT_SPECS = (
+    # sections
+    ('article', 'flow', ()),
+    ('section', 'flow', ()),
+    ('nav', 'flow', ()),
+    ('aside', 'flow', ()),
+    ('h1', 'phrasing', ()),
+    ('h2', 'phrasing', ()),
+    ('h3', 'phrasing', ()),
+    ('h4', 'phrasing', ()),
+    ('h5', 'phrasing', ()),
+    ('h6', 'phrasing', ()),
+    ('hgroup', 'flow', ()),
+    ('header', 'flow', ()),
+    ('footer', 'flow', ()),
+    ('address', 'flow', ()),
+    ('main', 'flow', ()),
+    # grouping content
+    ('p', 'phrasing', ()),
+    ('hr', 'empty', ()),
+    ('pre', 'phrasing', ()),
+    ('blockquote', 'flow', ()),
+    ('ol', 'flow', ('reversed',)),
+    ('ul', 'flow', ()),
+    ('menu', 'flow', ()),
+    ('li', 'flow', ()),
+    ('dl', 'flow', ()),
+    ('dt', 'flow', ()),
+    ('dd', 'flow', ()),
+    ('figure', 'flow', ()),
+    ('figcaption', 'flow', ()),
+    ('div', 'flow', ()),
+    # text-level semantics
+    ('a', 'transparent', ()),
+    ('em', 'phrasing', ()),
+    ('strong', 'phrasing', ()),
+    ('small', 'phrasing', ()),
+    ('s', 'phrasing', ()),
+    ('cite', 'phrasing', ()),
+    ('q', 'phrasing', ()),
+    ('dfn', 'phrasing', ()),
+    ('abbr', 'phrasing', ()),
+    ('acronym', 'phrasing', ()),
+    ('ruby', 'phrasing', ()),
+    ('rt', 'phrasing', ()),
+    ('rp', 'phrasing', ()),
+    ('data', 'phrasing', ()),
+    ('time', 'phrasing', ()),
+    ('code', 'phrasing', ()),
+    ('var', 'phrasing', ()),
+    ('samp', 'phrasing', ()),
+    ('kbd', 'phrasing', ()),
+    ('sub', 'phrasing', ()),
+    ('sup', 'phrasing', ()),
+    ('i', 'phrasing', ()),
+    ('b', 'phrasing', ()),
+    ('u', 'phrasing', ()),
+    ('mark', 'phrasing', ()),
+    ('bdi', 'phrasing', ()),
+    ('bdo', 'phrasing', ()),
+    ('span', 'phrasing', ()),
+    ('br', 'empty', ()),
+    ('wbr', 'empty', ()),
+    # edits
+    ('ins', 'transparent', ()),
+    ('del', 'transparent', ()),
+    # embedded content
+    ('picture', 'flow', ()),
+    ('source', 'empty', ()),
+    ('img', 'empty', ('ismap',)),
+    ('iframe', 'nothing', ('allowfullscreen',)),
+    ('embed', 'empty', ()),
+    ('object', 'transparent', ()),
+    ('video', 'transparent',
+     ('autoplay', 'controls', 'loop', 'muted', 'playsinline')),
+    ('audio', 'transparent', ('autoplay', 'controls', 'loop', 'muted')),
+    ('track', 'empty', ('default',)),
+    ('map', 'transparent', ()),
+    ('area', 'empty', ()),
+    # tabular data
+    ('table', 'flow', ()),
+    ('caption', 'flow', ()),
+    ('colgroup', 'flow', ()),
+    ('col', 'empty', ()),
+    ('tbody', 'flow', ()),
+    ('thead', 'flow', ()),
+    ('tfoot', 'flow', ()),
+    ('tr', 'flow', ()),
+    ('td', 'flow', ()),
+    ('th', 'flow', ()),
+    # forms
+    ('form', 'flow', ('novalidate',)),
+    ('label', 'phrasing', ()),
+    ('input', 'empty',
+     ('checked', 'disabled', 'formnovalidate', 'multiple', 'readonly',
+      'required')),
+    ('button', 'phrasing', ('disabled', 'formnovalidate')),
+    ('select', 'flow', ('disabled', 'multiple', 'required')),
+    ('datalist', 'flow', ()),
+    ('optgroup', 'flow', ('disabled',)),
+    ('option', 'text', ('disabled', 'selected')),
+    ('textarea', 'text', ('disabled', 'readonly', 'required')),
+    ('output', 'phrasing', ()),
+    ('progress', 'phrasing', ()),
+    ('meter', 'phrasing', ()),
+    ('fieldset', 'flow', ('disabled',)),
+    ('legend', 'phrasing', ()),
+    # interactive elements
+    ('details', 'flow', ('open',)),
+    ('summary', 'phrasing', ()),
+    ('dialog', 'flow', ('open',)),
+    # scripting
+    ('script', 'text', ('async', 'defer', 'nomodule')),
+    ('noscript', 'transparent', ()),
+    ('template', 'flow', ()),
+    ('canvas', 'transparent', ()),
+    ('slot', 'transparent', ()),
+    # metadata
+    ('title', 'text', ()),
+    ('base', 'empty', ()),
+    ('link', 'empty', ('disabled',)),
+    ('meta', 'empty', ()),
+    ('style', 'text', ()),
+)
+
+# method name: (spec, kind); kind is 'element', 'start' or 'end'
+_element_methods = {}
+
+# element name: spec
+_elements = {}
+
+# True after the elements of _ELEMENT_SPECS are registered
+_elements_loaded = False
+
+# names of the methods generated by _install_element_method
+_installed_methods = set()
+
+# names of all boolean attributes
+_boolean_attributes = set(_GLOBAL_BOOLEANS)
+
+def register_element(name, content='flow', booleans=()):
+    """Register an element, so that class HTML has methods for it.
+
+    The element gets method <name>(content, [attrs]), or <name>([attrs])
+    if it is void, and start_<name>([attrs]) and end_<name>() if it is
+    not; '-' in name becomes '_' in the method names. Methods written in
+    class HTML, such as li() and input(), take precedence.
+
+    Keyword arguments:
+        name -- element name
+        content -- content model: 'flow', 'phrasing', 'transparent', 'text',
+                   'nothing' or 'empty' for void elements (default 'flow')
+        booleans -- boolean attributes of the element; True gives them as
+                    name="name" and False omits them (default ())
+    """
+    if not _elements_loaded:
+        _load_elements()
+    with _module_lock():
+        return _register_element(name, content, booleans)
+
+def _register_element(name, content, booleans):
+    spec = _ElementSpec(name, content, booleans)
+    methodname = _METHOD_NAMES.get(name, name.replace('-', '_'))
+    kinds = {methodname: 'element'}
+    if not spec.void:
+        kinds['start_' + methodname] = 'start'
+        kinds['end_' + methodname] = 'end'
+    for methodname, kind in kinds.items():
+        if methodname in _installed_methods:
+            _installed_methods.discard(methodname)
+            if methodname in HTML.__dict__:
+                delattr(HTML, methodname)
+        _element_methods[methodname] = (spec, kind)
+    _elements[name] = spec
+    _boolean_attributes.update(spec.booleans)
+    return spec
+
+# element names that are not valid method names
+_METHOD_NAMES = {'del': 'Del'}
+
+def _install_element_method(name, spec, kind):
+    """Generate method name of element spec and set it to class HTML."""
+    if kind == 'end':
+        method = _end_tag_method(spec)
+    elif kind == 'start':
+        method = _start_tag_method(spec)
+    elif spec.void:
+        method = _empty_element_method(spec)
+    else:
+        method = _element_method(spec)
+    method.__name__ = name
+    method.__qualname__ = 'HTML.' + name
+    setattr(HTML, name, method)
+    _installed_methods.add(name)
+
+def _end_tag_method(spec):
+    endtag = '</{0}>'.format(spec.name)
+    def method(self):
+        return endtag
+    method.__doc__ = 'Create end tag of {0} element.'.format(spec.name)
+    return method
+
+def _start_tag_method(spec):
+    head = '<' + spec.name
+    starttag = head + '>'
+    def method(self, attrs=None, **kwattrs):
+        if attrs is None and not kwattrs:
+            return starttag
+        return head + self._create_attr_string(attrs, kwattrs) + '>'
+    method.__doc__ = """Create start tag of {0} element.
+
+        Keyword arguments:
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """.format(spec.name)
+    return method
+
+def _empty_element_method(spec):
+    head = '<' + spec.name
+    emptytag = head + ' />'
+    def method(self, attrs=None, **kwattrs):
+        if self._site.minify:
+            return head + self._create_attr_string(attrs, kwattrs) + '>'
+        if attrs is None and not kwattrs:
+            return emptytag
+        return head + self._create_attr_string(attrs, kwattrs) + ' />'
+    method.__doc__ = """Create {0} element.
+
+        Keyword arguments:
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """.format(spec.name)
+    return method
+
+def _element_method(spec):
+    head = '<' + spec.name
+    starttag = head + '>'
+    endtag = '</{0}>'.format(spec.name)
+    if spec.name in _OPTIONAL_END_TAGS:
+        # _create_element() omits the end tag of minified output.
+        name = spec.name
+        def method(self, content, attrs=None, **kwattrs):
+            return self._create_element(name, content, attrs, kwattrs)
+    else:
+        def method(self, content, attrs=None, **kwattrs):
+            if not isinstance(content, str):
+                if not isinstance(content, int):
+                    raise TypeError(
+                        'need string or int, got %r' % type(content))
+                content = str(content)
+            if attrs is None and not kwattrs:
+                return starttag + content + endtag
+            return (head + self._create_attr_string(attrs, kwattrs) + '>' +
+                    content + endtag)
+    if spec.content == 'nothing':
+        method.__defaults__ = ('', None)
+        text = "some text (default '')"
+    else:
+        text = 'some text'
+    method.__doc__ = """Create {0} element.
+
+        Keyword arguments:
+            content -- {1}
+            attrs -- dict object or tuple of pairs that contains attributes
+                     (default None)
+            kwattrs -- attributes as keyword arguments
+        """.format(spec.name, text)
+    return method
+
+def _load_elements():
+    """Register the elements of _ELEMENT_SPECS.
+
+    It is done on first use, not at import time, to keep the import cheap.
+    """
+    global _elements_loaded
+    with _module_lock():
+        if not _elements_loaded:
+            for spec in _ELEMENT_SPECS:
+                _register_element(*spec)
+            _elements_loaded = True
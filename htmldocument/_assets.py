@@ -0,0 +1,461 @@
+# -*- coding: utf-8-unix; mode: python -*-
+"""Asset files of htmldocument: fingerprints, bundles and critical css.
+
+It is imported on first use of Fingerprints, Bundler or CriticalCSS from
+htmldocument.
+"""
+import os
+import time
+
+class Fingerprints:
+
+    """Content hashed URLs of local asset files.
+
+    url() maps the path of a local file, such as '/css/main.css', to a URL
+    that changes with its content, so that the files can be cached by user
+    agents for long. The digest of a file is computed once and kept as long
+    as its modification time and size do not change. A manifest made by
+    write_manifest(), e.g. at deploy time, is used without reading the files.
+
+    With style 'name', the web server has to map e.g. main.3f9a1c20.css to
+    main.css.
+    """
+
+    __slots__ = ('root', 'style', 'length', 'recheck', '_manifest',
+                 '_digests')
+
+    def __init__(self, root='.', style='query', length=8, recheck=2.0,
+                 manifest=None):
+
+        """Constructor of class Fingerprints.
+
+        Keyword arguments:
+            root -- directory of the files of URL path '/' (default '.')
+            style -- 'query' for main.css?v=3f9a1c20 or 'name' for
+                     main.3f9a1c20.css (default 'query')
+            length -- number of hex digits of the digest (default 8)
+            recheck -- seconds until the modification time of a file is
+                       checked again (default 2.0)
+            manifest -- file name of a JSON manifest made by
+                        write_manifest() (default None)
+        """
+
+        if style not in ('query', 'name'):
+            raise ValueError('unknown style %r' % style)
+        self.root = root
+        self.style = style
+        self.length = length
+        self.recheck = recheck
+        self._manifest = {}
+        if manifest is not None:
+            import json
+            with open(manifest, encoding='utf-8') as f:
+                self._manifest = json.load(f)
+        # path: (checked time, st_mtime_ns, st_size, URL)
+        self._digests = {}
+
+    def url(self, path):
+        """Return content hashed URL of path.
+
+        Paths of other hosts and of missing files are returned as they are.
+        """
+        try:
+            return self._manifest[path]
+        except KeyError:
+            pass
+        if not _is_local(path):
+            return path
+        now = time.monotonic()
+        entry = self._digests.get(path)
+        if entry is not None and now - entry[0] < self.recheck:
+            return entry[3]
+        try:
+            stat = os.stat(_local_filename(self.root, path))
+        except OSError:
+            return path
+        if (entry is not None and entry[1] == stat.st_mtime_ns and
+            entry[2] == stat.st_size):
+            url = entry[3]
+        else:
+            url = self._hashed(
+                path, _file_digest(_local_filename(self.root, path)))
+        self._digests[path] = (now, stat.st_mtime_ns, stat.st_size, url)
+        return url
+
+    def write_manifest(self, filename, paths):
+        """Write JSON manifest of the content hashed URLs of paths.
+
+        Keyword arguments:
+            filename -- file name of the manifest
+            paths -- list object that contains paths of the files
+        """
+        import json
+        manifest = dict((path, self.url(path)) for path in paths)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+
+    def _hashed(self, path, digest):
+        digest = digest[:self.length]
+        if self.style == 'query':
+            return '{0}{1}v={2}'.format(path, '&' if '?' in path else '?',
+                                        digest)
+        path, mark, query = path.partition('?')
+        head, slash, name = path.rpartition('/')
+        stem, dot, ext = name.rpartition('.')
+        if not dot:
+            stem, ext = name, ''
+        return '{0}{1}{2}.{3}{4}{5}{6}{7}'.format(
+            head, slash, stem, digest, dot, ext, mark, query)
+
+class Bundler:
+
+    """Combined files of the local cssfiles and jsfiles.
+
+    Each run of two or more local files in cssfiles or jsfiles is replaced
+    by one bundle, which is their contents concatenated and written to
+    directory under a content hashed name. A bundle is made again only
+    when the modification time or size of one of its files changes.
+
+    Relative URLs of url() and @import in css files are made absolute
+    paths, resolved against the path of each file, and @charset is put
+    once at the start of the bundle. Since @import and @namespace rules
+    have to precede the other rules, a run of css files is left unbundled
+    if a file other than the first has them, or if its files declare
+    different charsets.
+    """
+
+    __slots__ = ('directory', 'url', 'root', 'length', 'recheck',
+                 '_bundles', '_lock')
+
+    def __init__(self, directory, url, root='.', length=16, recheck=2.0):
+
+        """Constructor of class Bundler.
+
+        Keyword arguments:
+            directory -- directory to write the bundles to
+            url -- URL of directory, e.g. '/bundles/'
+            root -- directory of the files of URL path '/' (default '.')
+            length -- number of hex digits of the digest in the names of
+                      the bundles (default 16)
+            recheck -- seconds until the modification times of the files of
+                       a bundle are checked again (default 2.0)
+        """
+
+        self.directory = directory
+        self.url = url if url.endswith('/') else url + '/'
+        self.root = root
+        self.length = length
+        self.recheck = recheck
+        import threading
+        # (ext, paths): (checked time, stats of the files, URL)
+        self._bundles = {}
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        # A copy in another process rebuilds or finds the bundles itself.
+        return (Bundler, (self.directory, self.url, self.root, self.length,
+                          self.recheck))
+
+    def urls(self, paths, ext, url=None):
+        """Return URLs of paths with runs of local files bundled.
+
+        Keyword arguments:
+            paths -- tuple object that contains paths of the files
+            ext -- extension of the bundle, 'css' or 'js'
+            url -- function that returns URL of a path that is not bundled
+                   (default None)
+        """
+        result = []
+        run = []
+        for path in paths + (None,):
+            if path is not None and _is_local(path):
+                run.append(path)
+                continue
+            if len(run) > 1:
+                bundle = self.bundle(tuple(run), ext)
+                if bundle is not None:
+                    run = [bundle]
+                elif url is not None:
+                    run = [url(path) for path in run]
+            elif run and url is not None:
+                run = [url(run[0])]
+            result.extend(run)
+            run = []
+            if path is not None:
+                result.append(path)
+        return tuple(result)
+
+    def bundle(self, paths, ext):
+        """Return URL of the bundle of paths, or None if it is not made.
+
+        It is not made if a file is missing or the files cannot be joined;
+        see the class docstring.
+
+        Keyword arguments:
+            paths -- tuple object that contains paths of the files
+            ext -- extension of the bundle, 'css' or 'js'
+        """
+        key = (ext, paths)
+        now = time.monotonic()
+        entry = self._bundles.get(key)
+        if entry is not None and now - entry[0] < self.recheck:
+            return entry[2]
+        filenames = [_local_filename(self.root, path) for path in paths]
+        try:
+            stats = tuple((stat.st_mtime_ns, stat.st_size) for stat in
+                          map(os.stat, filenames))
+        except OSError:
+            return None
+        if entry is not None and entry[1] == stats:
+            url = entry[2]
+        else:
+            with self._lock:
+                try:
+                    url = self._build(paths, filenames, ext)
+                except OSError:
+                    return None
+        self._bundles[key] = (now, stats, url)
+        return url
+
+    def _build(self, paths, filenames, ext):
+        # Scripts are separated by ';' so that a file without a trailing
+        # semicolon does not run into the next one.
+        contents = []
+        for filename in filenames:
+            with open(filename, 'rb') as f:
+                contents.append(f.read())
+        if ext == 'css':
+            data = _joined_css(paths, contents)
+            if data is None:
+                return None
+        else:
+            data = b';\n'.join(contents)
+        import hashlib
+        name = '{0}.{1}'.format(
+            hashlib.sha256(data).hexdigest()[:self.length], ext)
+        filename = os.path.join(self.directory, name)
+        if not os.path.exists(filename):
+            os.makedirs(self.directory, exist_ok=True)
+            temp = '{0}.{1}.tmp'.format(filename, os.getpid())
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.replace(temp, filename)
+        return self.url + name
+
+class CriticalCSS:
+
+    """Critical stylesheets inlined in the head element.
+
+    The designated stylesheets are read, minified and kept as long as
+    their modification times and sizes do not change. They are inlined in
+    a style element in their order until budget bytes would be exceeded;
+    the rest of them and the other cssfiles are loaded without blocking
+    rendering, with a noscript fallback. Relative URLs in the inlined
+    stylesheets are made absolute paths, as in Bundler, and one that has
+    @import rules is inlined only as the first.
+    """
+
+    __slots__ = ('paths', 'root', 'budget', 'recheck', '_styles', '_inline')
+
+    def __init__(self, paths, root='.', budget=14336, recheck=2.0):
+
+        """Constructor of class CriticalCSS.
+
+        Keyword arguments:
+            paths -- list object that contains paths of the critical
+                     stylesheets, in cssfiles or not
+            root -- directory of the files of URL path '/' (default '.')
+            budget -- maximum bytes of the inlined css, encoded in UTF-8
+                      (default 14336, about the first round trip of TCP)
+            recheck -- seconds until the modification times of the files
+                       are checked again (default 2.0)
+        """
+
+        self.paths = tuple(paths)
+        self.root = root
+        self.budget = budget
+        self.recheck = recheck
+        # path: (st_mtime_ns, st_size, minified css, True if it has
+        # @import or @namespace rules)
+        self._styles = {}
+        # (checked time, css, paths, the other paths)
+        self._inline = None
+
+    def inline(self):
+        """Return the inlined css, the paths of it and the other paths.
+
+        The other paths are the ones of the critical stylesheets that are
+        not inlined, because they are missing or do not fit the budget,
+        in their order; HTML loads them like cssfiles.
+        """
+        now = time.monotonic()
+        inline = self._inline
+        if inline is not None and now - inline[0] < self.recheck:
+            return inline[1:]
+        styles = []
+        paths = []
+        rest = []
+        size = 0
+        for index, path in enumerate(self.paths):
+            style = self._style(path)
+            if style is None:
+                rest.append(path)
+                continue
+            css, rules = style
+            size += len(css.encode('utf-8'))
+            if size > self.budget or rules and styles:
+                rest.extend(self.paths[index:])
+                break
+            styles.append(css)
+            paths.append(path)
+        self._inline = (now, ''.join(styles), tuple(paths), tuple(rest))
+        return self._inline[1:]
+
+    def _style(self, path):
+        # Return minified css of path and if it has @import rules, or None
+        # if it is missing.
+        if not _is_local(path):
+            return None
+        filename = _local_filename(self.root, path)
+        try:
+            stat = os.stat(filename)
+            entry = self._styles.get(path)
+            if (entry is not None and entry[0] == stat.st_mtime_ns and
+                entry[1] == stat.st_size):
+                return entry[2:]
+            with open(filename, encoding='utf-8-sig') as f:
+                css = f.read()
+        except OSError:
+            return None
+        # @charset means nothing in a style element
+        import re
+        css = re.sub(r'^@charset "[^"]*";', '', css)
+        css, rules = _rebased_css(css, path)
+        style = (_minify_css(css), rules)
+        self._styles[path] = (stat.st_mtime_ns, stat.st_size) + style
+        return style
+
+def _minify_css(css):
+    """Return css without comments and needless white space.
+
+    Strings are kept as they are; only the code between them is changed.
+    """
+    import re
+    result = []
+    code = []
+    for token in re.findall(r'"(?:\\.|[^"\\])*"?|\'(?:\\.|[^\'\\])*\'?'
+                            r'|/\*.*?(?:\*/|$)|[^"\'/]+|/', css, re.DOTALL):
+        if token[0] in '"\'':
+            result.append(_minify_css_code(''.join(code)))
+            result.append(token)
+            code = []
+        elif token.startswith('/*'):
+            code.append(' ')
+        else:
+            code.append(token)
+    result.append(_minify_css_code(''.join(code)))
+    return ''.join(result).replace(';}', '}').strip()
+
+def _minify_css_code(code):
+    """Return code of css, without strings, with needless space removed."""
+    import re
+    code = re.sub(r'\s+', ' ', code)
+    code = re.sub(r' ?([{};,>]) ?', r'\1', code)
+    code = code.replace(': ', ':')
+    # space before the colon of a declaration, but not of a selector such
+    # as 'a :hover', which is followed by a block
+    return re.sub(r'([{;][-\w]+) :(?=[^{};]*[;}])', r'\1:', code)
+
+def _joined_css(paths, contents):
+    """Return css files of paths joined for a bundle, or None.
+
+    contents are the bytes of the files, in an encoding compatible with
+    ASCII. None is returned if they cannot be joined into one valid
+    stylesheet.
+    """
+    import re
+    charsets = set()
+    result = []
+    for path, data in zip(paths, contents):
+        if data.startswith(b'\xef\xbb\xbf'):
+            data = data[3:]
+            charsets.add('utf-8')
+        # @charset is valid only as the very first bytes of a file
+        match = re.match(rb'@charset "([^"]*)";', data)
+        if match is not None:
+            charsets.add(match.group(1).decode('latin-1').lower())
+            data = data[match.end():]
+        # latin-1 keeps the bytes as they are
+        css, rules = _rebased_css(data.decode('latin-1'), path)
+        if rules and result:
+            return None
+        result.append(css.encode('latin-1'))
+    if len(charsets) > 1:
+        return None
+    data = b'\n'.join(result)
+    if charsets:
+        data = '@charset "{0}";\n'.format(charsets.pop()).encode(
+            'latin-1') + data
+    return data
+
+def _rebased_css(css, path):
+    """Return css of file path with relative URLs made absolute paths.
+
+    The URLs of url() and @import are resolved against path; the ones in
+    comments and other strings are left alone. The returned pair also
+    tells if css has @import or @namespace rules.
+    """
+    import re
+    import urllib.parse
+    base = urllib.parse.urljoin('/', path)
+    rules = []
+    def rebase(match):
+        url, dq, sq, bare, rule, rdq, rsq, namespace = match.groups()
+        if rule is not None or namespace is not None:
+            rules.append(match.group(0))
+        if url is None and rule is None:
+            return match.group(0)
+        head = url
+        if rule is not None:
+            head, dq, sq = rule, rdq, rsq
+        for quote, ref in (('"', dq), ('\'', sq), ('', bare)):
+            if ref is not None:
+                break
+        else:
+            return match.group(0)
+        if not ref or not _is_local(ref) or ref[0] in '/#' or '\\' in ref:
+            return match.group(0)
+        ref = urllib.parse.urljoin(base, ref)
+        if not ref.startswith('/'):
+            # above the root
+            ref = '/' + ref
+        return head + quote + ref + quote
+    return re.sub(_CSS_REFS, rebase, css), bool(rules)
+
+# comments, strings, url() and @import of css, with the URL in groups 2
+# to 4 and 6 to 7, and @namespace
+_CSS_REFS = (r'(?is)/\*.*?(?:\*/|$)'
+             r'|"(?:\\.|[^"\\])*"?|\'(?:\\.|[^\'\\])*\'?'
+             r'|(url\(\s*)(?:"((?:\\.|[^"\\])*)"|\'((?:\\.|[^\'\\])*)\''
+             r'|([^\'"\s()]*))'
+             r'|(@import\s*)(?:"((?:\\.|[^"\\])*)"'
+             r'|\'((?:\\.|[^\'\\])*)\')?'
+             r'|(@namespace\b)')
+
+def _is_local(path):
+    """Return True if path is a path on this host."""
+    return ':' not in path and not path.startswith('//')
+
+def _local_filename(root, path):
+    """Return name of the local file of path under root."""
+    path = path.partition('?')[0].partition('#')[0]
+    return os.path.join(root, *path.lstrip('/').split('/'))
+
+def _file_digest(filename):
+    """Return SHA-256 hex digest of the content of filename."""
+    import hashlib
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
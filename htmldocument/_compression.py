@@ -0,0 +1,529 @@
+# -*- coding: utf-8-unix; mode: python -*-
+"""Streaming compression of response bodies of htmldocument.
+
+It is imported on first use of Compression, CompressionDictionary or
+train_dictionary from htmldocument, or of the writers of HTML.
+"""
+import os
+
+from . import _encoding
+
+class Compression:
+
+    """Streaming compression of response bodies.
+
+    negotiate() chooses the encoding of a response from Accept-Encoding,
+    in the order of encodings, and the writers of HTML compress the body
+    with it chunk by chunk.
+
+    With dictionary, 'dcz' of Compression Dictionary Transport (RFC 9842),
+    zstd against the dictionary, is preferred for user agents that have
+    the dictionary, as told by Available-Dictionary.
+
+    zstd and 'dcz' need module compression.zstd of Python 3.14 or later,
+    or the backports.zstd package before it; without them they are never
+    negotiated, and the other encodings are used.
+    """
+
+    __slots__ = ('encodings', 'levels', 'min_size', 'dictionary')
+
+    def __init__(self, encodings=('zstd', 'gzip', 'deflate'), levels=None,
+                 min_size=1024, dictionary=None):
+
+        """Constructor of class Compression.
+
+        Keyword arguments:
+            encodings -- encodings to offer, preferred first (default
+                         ('zstd', 'gzip', 'deflate'))
+            levels -- dict object of encoding: compression level (default
+                      None, means the default levels)
+            min_size -- bytes of body below which it is not compressed
+                        (default 1024)
+            dictionary -- CompressionDictionary object for 'dcz' (default
+                          None)
+        """
+
+        for encoding in encodings:
+            if encoding not in ('zstd', 'gzip', 'deflate'):
+                raise ValueError('unknown encoding %r' % encoding)
+        self.encodings = tuple(encoding for encoding in encodings
+                               if encoding != 'zstd' or _zstd() is not None)
+        self.levels = dict(levels or ())
+        self.min_size = min_size
+        self.dictionary = dictionary
+
+    def negotiate(self, accept_encoding, available_dictionary=''):
+        """Return encoding to use for Accept-Encoding, or None.
+
+        Keyword arguments:
+            accept_encoding -- value of Accept-Encoding
+            available_dictionary -- value of Available-Dictionary
+                                    (default '')
+        """
+        if not accept_encoding:
+            return None
+        qualities = {}
+        for item in accept_encoding.split(','):
+            params = item.split(';')
+            name = params[0].strip().lower()
+            quality = 1.0
+            for param in params[1:]:
+                key, eq, value = param.partition('=')
+                if key.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[_ENCODING_ALIASES.get(name, name)] = quality
+        if (self.dictionary is not None and qualities.get('dcz', 0.0) > 0.0
+            and self.dictionary.available(available_dictionary)
+            and _zstd() is not None):
+            return 'dcz'
+        wildcard = qualities.get('*', 0.0)
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = qualities.get(encoding, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compressor(self, encoding):
+        """Return compressor of encoding.
+
+        It is a tuple of functions: compress(data) and flush(), which
+        return the compressed data to send so far, and finish(), which
+        returns the rest of it.
+        """
+        level = self.levels.get(encoding)
+        if encoding == 'dcz':
+            return self.dictionary.compressor(level)
+        if encoding == 'zstd':
+            zstd = _zstd()
+            compressor = zstd.ZstdCompressor(level)
+            return (compressor.compress,
+                    lambda: compressor.flush(compressor.FLUSH_BLOCK),
+                    lambda: compressor.flush(compressor.FLUSH_FRAME))
+        import zlib
+        if level is None:
+            level = zlib.Z_DEFAULT_COMPRESSION
+        # gzip has the gzip header and trailer, deflate the zlib ones
+        wbits = 31 if encoding == 'gzip' else 15
+        compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+        return (compressor.compress,
+                lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+                compressor.flush)
+
+class CompressionDictionary:
+
+    """Shared dictionary of compression made from pages of the site.
+
+    The dictionary is raw content, the markup that the pages have in
+    common, so it serves as the zdict of zlib and as the dictionary of
+    zstd. Serve data with headers() at a URL announced by an Asset of rel
+    'compression-dictionary', and give it to Compression, so that user
+    agents that have fetched it get 'dcz' bodies, as long as zstd is
+    available (see Compression).
+    """
+
+    __slots__ = ('data', 'match', 'id', 'digest', '_zstd_dict')
+
+    def __init__(self, data, match='/*', id=None):
+
+        """Constructor of class CompressionDictionary.
+
+        Keyword arguments:
+            data -- bytes of the dictionary, e.g. made by train_dictionary()
+            match -- URL pattern of the pages it is used for (default '/*')
+            id -- id of the dictionary for the server (default None)
+        """
+
+        import hashlib
+        self.data = bytes(data)
+        self.match = match
+        self.id = id
+        self.digest = hashlib.sha256(self.data).digest()
+        self._zstd_dict = None
+
+    def headers(self):
+        """Return header fields to serve the dictionary with as pairs."""
+        value = 'match="{0}"'.format(self.match)
+        if self.id is not None:
+            value += ', id="{0}"'.format(self.id)
+        return [('Content-Type', 'application/octet-stream'),
+                ('Use-As-Dictionary', value)]
+
+    def available(self, available_dictionary):
+        """Return True if Available-Dictionary names this dictionary."""
+        import base64
+        return available_dictionary.strip() == ':{0}:'.format(
+            base64.b64encode(self.digest).decode('ascii'))
+
+    def compressor(self, level=None):
+        """Return compressor of 'dcz' like Compression.compressor()."""
+        zstd = _zstd()
+        if self._zstd_dict is None:
+            self._zstd_dict = zstd.ZstdDict(self.data, is_raw=True)
+        compressor = zstd.ZstdCompressor(level, zstd_dict=self._zstd_dict)
+        # The stream starts with the magic number and the hash of the
+        # dictionary, once.
+        header = [_DCZ_MAGIC + self.digest]
+        def prefixed(data):
+            if header:
+                data = header.pop() + data
+            return data
+        return (lambda data: prefixed(compressor.compress(data)),
+                lambda: prefixed(compressor.flush(compressor.FLUSH_BLOCK)),
+                lambda: prefixed(compressor.flush(compressor.FLUSH_FRAME)))
+
+    def compress(self, data, level=9):
+        """Return data compressed by zlib against the dictionary.
+
+        There is no HTTP content coding of zlib with a dictionary; use it
+        where both ends have the dictionary, such as caches.
+        """
+        import zlib
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9,
+                                      zlib.Z_DEFAULT_STRATEGY,
+                                      self.data[-32768:])
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data):
+        """Return data compressed by compress() decompressed."""
+        import zlib
+        decompressor = zlib.decompressobj(15, self.data[-32768:])
+        return decompressor.decompress(data) + decompressor.flush()
+
+# first bytes of a 'dcz' stream, before the SHA-256 of the dictionary
+_DCZ_MAGIC = b'\x5e\x2a\x4d\x18\x20\x00\x00\x00'
+
+def train_dictionary(samples, size=32768, match='/*', id=None):
+    """Return CompressionDictionary of the markup samples have in common.
+
+    The samples are split after every '>', and the pieces found in at
+    least two samples are kept, most bytes saved first, up to size bytes.
+    They are put in the order of the samples, so that long runs of them
+    still match; zlib only uses the last 32768 bytes.
+
+    Keyword arguments:
+        samples -- list object that contains pages as strings or bytes
+        size -- maximum size of the dictionary (default 32768)
+        match -- URL pattern of the pages it is used for (default '/*')
+        id -- id of the dictionary for the server (default None)
+    """
+    counts = {}
+    order = {}
+    for sample in samples:
+        if isinstance(sample, str):
+            sample = sample.encode('utf-8')
+        seen = set()
+        start = 0
+        while start < len(sample):
+            end = sample.find(b'>', start) + 1 or len(sample)
+            piece = sample[start:end]
+            start = end
+            if len(piece) < 4 or piece in seen:
+                continue
+            seen.add(piece)
+            counts[piece] = counts.get(piece, 0) + 1
+            order.setdefault(piece, len(order))
+    common = [piece for piece, count in counts.items() if count > 1]
+    common.sort(key=lambda piece: (counts[piece] - 1) * len(piece),
+                reverse=True)
+    chosen = []
+    total = 0
+    for piece in common:
+        if total + len(piece) <= size:
+            chosen.append(piece)
+            total += len(piece)
+    chosen.sort(key=order.get)
+    return CompressionDictionary(b''.join(chosen), match, id)
+
+# other names of the encodings in Accept-Encoding
+_ENCODING_ALIASES = {'x-gzip': 'gzip'}
+
+def _negotiated(html, accept):
+    """Return content_encoding of html, or the one accept negotiates.
+
+    Keyword arguments:
+        html -- HTML object
+        accept -- values of Accept-Encoding and Available-Dictionary as a
+                  pair, or None
+    """
+    if accept is None:
+        return html.content_encoding
+    compression = html._site.compression
+    if compression is None:
+        return None
+    return compression.negotiate(*accept)
+
+def _zstd():
+    """Return module compression.zstd, or None if it is missing.
+
+    Before Python 3.14 it is backports.zstd, if it is installed.
+    """
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            from backports import zstd
+        except ImportError:
+            return None
+    return zstd
+
+class _BodyWriter:
+
+    """Writer of a response body returned by HTML.body_writer().
+
+    The header is started with the negotiated encoding when min_size bytes
+    are written or on the first flush, and without it if the body is
+    closed before. With block_size, as for the write callable of WSGI,
+    which takes only bytes, other buffers such as memory maps of files
+    are sent uncompressed as bytes by blocks of that size.
+    """
+
+    __slots__ = ('_html', '_start', '_flush', '_accept', '_block_size',
+                 '_write', '_buffer', '_size', '_encoding', '_compressor')
+
+    def __init__(self, html, start, flush, accept=None, block_size=None):
+        self._html = html
+        self._start = start
+        self._flush = flush
+        self._accept = accept
+        self._block_size = block_size
+        self._write = None
+        self._buffer = []
+        self._size = 0
+        self._encoding = None
+        self._compressor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, data):
+        """Write bytes of the body."""
+        if self._write is None:
+            compression = self._html._site.compression
+            if (compression is not None and
+                self._size + len(data) < compression.min_size):
+                self._buffer.append(bytes(data))
+                self._size += len(data)
+                return
+            self._begin(True)
+        self._send(self._compressed(data))
+
+    def write_fragment(self, key, render, *args):
+        """Write fragment of key as HTML.fragment() returns it.
+
+        In a gzip body the gzip member of the fragment kept by the
+        FragmentCache is sent as it is; this starts the header like
+        flush() does.
+
+        Keyword arguments:
+            key -- hashable key of the fragment
+            render -- callable that returns the fragment
+            args -- arguments of render
+        """
+        html = self._html
+        fragments = html._site.fragments
+        if (self._write is None and fragments is not None and
+            _negotiated(html, self._accept) == 'gzip'):
+            self._begin(True)
+        encoding = _encoding(html.encode)
+        if self._encoding != 'gzip' or fragments is None:
+            self.write(html.fragment(key, render, *args).encode(
+                encoding, 'xmlcharrefreplace'))
+            return
+        if self._compressor is not None:
+            self._send(self._compressor[2]())
+            self._compressor = None
+        self._send(fragments.member(key, render, args, encoding))
+
+    def write_file(self, path, encoding=None):
+        """Write content of file path as HTML.include_file() does.
+
+        Keyword arguments:
+            path -- name of the file
+            encoding -- encoding of the file (default None, means the same
+                        as encode)
+        """
+        self._html.include_file(path, self, encoding)
+
+    def write_text(self, elemname, source, attrs=None, encoding=None,
+                   chunk_size=65536, **kwattrs):
+        """Write element of text source by HTML.text_chunks()."""
+        for chunk in self._html.text_chunks(elemname, source, attrs,
+                                            encoding, chunk_size, **kwattrs):
+            self.write(chunk)
+
+    def flush(self):
+        """Send what is written so far."""
+        if self._write is None:
+            self._begin(True)
+        if self._compressor is not None:
+            self._send(self._compressor[1]())
+        if self._flush is not None:
+            self._flush()
+
+    def close(self):
+        """Send the rest of the body."""
+        if self._write is None:
+            self._begin(False)
+        if self._compressor is not None:
+            self._send(self._compressor[2]())
+            self._compressor = None
+        if self._flush is not None:
+            self._flush()
+
+    def _begin(self, compress):
+        if compress:
+            self._encoding = _negotiated(self._html, self._accept)
+        self._write = self._start(self._encoding)
+        data = b''.join(self._buffer)
+        self._buffer = None
+        self._send(self._compressed(data))
+
+    def _compressed(self, data):
+        # Start a new compressor, or gzip member, if there is none.
+        if self._encoding is None:
+            return data
+        if self._compressor is None:
+            self._compressor = self._html._site.compression.compressor(
+                self._encoding)
+        return self._compressor[0](data)
+
+    def _send(self, data):
+        block_size = self._block_size
+        if block_size is None or type(data) is bytes:
+            if data:
+                self._write(data)
+            return
+        for offset in range(0, len(data), block_size):
+            self._write(bytes(data[offset:offset + block_size]))
+
+class _AsgiBodyWriter:
+
+    """Writer of an ASGI response body returned by HTML.asgi_writer()."""
+
+    __slots__ = ('_html', '_start', '_sender', '_accept', '_started',
+                 '_buffer', '_size', '_encoding', '_compressor')
+
+    def __init__(self, html, start, send, accept=None):
+        self._html = html
+        self._start = start
+        self._sender = send
+        self._accept = accept
+        self._started = False
+        self._buffer = []
+        self._size = 0
+        self._encoding = None
+        self._compressor = None
+
+    async def write(self, data):
+        """Write bytes of the body."""
+        if not self._started:
+            self._buffer.append(bytes(data))
+            self._size += len(data)
+            compression = self._html._site.compression
+            if compression is None or self._size >= compression.min_size:
+                await self._begin(True)
+        else:
+            await self._send(self._compressed(data))
+
+    async def write_fragment(self, key, render, *args):
+        """Write fragment of key as HTML.fragment() returns it.
+
+        See _BodyWriter.write_fragment().
+        """
+        html = self._html
+        fragments = html._site.fragments
+        if (not self._started and fragments is not None and
+            _negotiated(html, self._accept) == 'gzip'):
+            await self._begin(True)
+        encoding = _encoding(html.encode)
+        if self._encoding != 'gzip' or fragments is None:
+            await self.write(html.fragment(key, render, *args).encode(
+                encoding, 'xmlcharrefreplace'))
+            return
+        if self._compressor is not None:
+            await self._send(self._compressor[2]())
+            self._compressor = None
+        await self._send(fragments.member(key, render, args, encoding))
+
+    async def write_file(self, path, encoding=None, block_size=65536):
+        """Write content of file path without decoding it.
+
+        The file is written from a memory map of it by blocks, since a
+        message of ASGI takes bytes; see HTML.include_file().
+
+        Keyword arguments:
+            path -- name of the file
+            encoding -- encoding of the file (default None, means the same
+                        as encode)
+            block_size -- bytes written at a time (default 65536)
+        """
+        target = _encoding(self._html.encode)
+        if encoding is not None:
+            import codecs
+            if codecs.lookup(encoding).name != codecs.lookup(target).name:
+                with open(path, encoding=encoding) as f:
+                    await self.write(
+                        f.read().encode(target, 'xmlcharrefreplace'))
+                return
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            import mmap
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, len(mapped), block_size):
+                    await self.write(mapped[offset:offset + block_size])
+
+    async def write_text(self, elemname, source, attrs=None, encoding=None,
+                         chunk_size=65536, **kwattrs):
+        """Write element of text source by HTML.text_chunks()."""
+        for chunk in self._html.text_chunks(elemname, source, attrs,
+                                            encoding, chunk_size, **kwattrs):
+            await self.write(chunk)
+
+    async def flush(self):
+        """Send what is written so far."""
+        if not self._started:
+            await self._begin(True)
+        if self._compressor is not None:
+            await self._send(self._compressor[1]())
+
+    async def close(self):
+        """Send the rest of the body and end the response."""
+        if not self._started:
+            await self._begin(False)
+        data = b''
+        if self._compressor is not None:
+            data = self._compressor[2]()
+            self._compressor = None
+        await self._sender({'type': 'http.response.body', 'body': data,
+                            'more_body': False})
+
+    async def _begin(self, compress):
+        if compress:
+            self._encoding = _negotiated(self._html, self._accept)
+        await self._start(self._encoding)
+        self._started = True
+        data = b''.join(self._buffer)
+        self._buffer = None
+        await self._send(self._compressed(data))
+
+    def _compressed(self, data):
+        # Start a new compressor, or gzip member, if there is none.
+        if self._encoding is None:
+            return data
+        if self._compressor is None:
+            self._compressor = self._html._site.compression.compressor(
+                self._encoding)
+        return self._compressor[0](data)
+
+    async def _send(self, data):
+        if data:
+            await self._sender({'type': 'http.response.body', 'body': data,
+                                'more_body': True})
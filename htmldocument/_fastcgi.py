@@ -0,0 +1,379 @@
+# -*- coding: utf-8-unix; mode: python -*-
+"""FastCGI responder of htmldocument.
+
+It is imported on first use of FastCGIServer from htmldocument.
+"""
+import io
+import os
+import sys
+
+# record types, role and protocol status of FastCGI
+_FCGI_BEGIN_REQUEST = 1
+_FCGI_ABORT_REQUEST = 2
+_FCGI_END_REQUEST = 3
+_FCGI_PARAMS = 4
+_FCGI_STDIN = 5
+_FCGI_STDOUT = 6
+_FCGI_STDERR = 7
+_FCGI_GET_VALUES = 9
+_FCGI_GET_VALUES_RESULT = 10
+_FCGI_UNKNOWN_TYPE = 11
+_FCGI_RESPONDER = 1
+_FCGI_KEEP_CONN = 1
+_FCGI_REQUEST_COMPLETE = 0
+_FCGI_CANT_MPX_CONN = 1
+_FCGI_UNKNOWN_ROLE = 3
+
+class FastCGIServer:
+
+    """FastCGI responder running render functions of CGI scripts.
+
+    Each request is handled by render() in one of a pool of long lived
+    processes, as it would be by the script run as CGI: os.environ holds
+    the FastCGI params, such as SCRIPT_NAME that HTML.start_form() looks
+    up, sys.stdin reads the request body and sys.stdout, where the
+    printers of HTML print, writes to the FastCGI stdout stream. So
+    scripts keep their code and pay process start and imports once.
+
+    Useage:
+        def main():
+            ht = htmldocument.HTML(sitetitle='Site', pagetitle='Page')
+            ht.print_resp_header()
+            ht.print_html_header()
+            print(ht.p('Hello'))
+            ht.print_html_close()
+
+        if __name__ == '__main__':
+            server = htmldocument.FastCGIServer(main, ('127.0.0.1', 9000))
+            server.serve_forever()
+    """
+
+    def __init__(self, render, address=None, processes=None,
+                 max_requests=0, encoding='utf-8', spool_size=1048576):
+
+        """Constructor of class FastCGIServer.
+
+        Keyword arguments:
+            render -- function called without arguments for each request
+            address -- (host, port) or path of a Unix socket to listen on
+                       (default None, means the socket that the web server
+                       passes as standard input)
+            processes -- number of worker processes (default None, means
+                         the number of processors); 0 serves in this
+                         process
+            max_requests -- requests after which a worker is replaced
+                            (default 0, means never)
+            encoding -- encoding of sys.stdin and sys.stdout of render
+                        (default 'utf-8')
+            spool_size -- bytes of a request body kept in memory (default
+                          1048576)
+        """
+
+        self.render = render
+        self.address = address
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes = processes
+        self.max_requests = max_requests
+        self.encoding = encoding
+        self.spool_size = spool_size
+
+    def serve_forever(self):
+        """Listen and serve requests until interrupted or terminated."""
+        import signal
+        sock = self._listen()
+        if self.processes == 0:
+            try:
+                self._work(sock)
+            finally:
+                sock.close()
+            return
+        previous = signal.signal(signal.SIGTERM, _terminate)
+        children = set()
+        try:
+            while True:
+                while len(children) < self.processes:
+                    pid = os.fork()
+                    if pid == 0:
+                        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                        status = 1
+                        try:
+                            self._work(sock)
+                            status = 0
+                        finally:
+                            os._exit(status)
+                    children.add(pid)
+                pid, status = os.wait()
+                children.discard(pid)
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+            sock.close()
+
+    def handle(self, conn):
+        """Serve requests of connected socket conn until it is closed.
+
+        Requests of a connection are handled one at a time; a request that
+        begins while another is open is refused, since FCGI_MPXS_CONNS is
+        0.
+        """
+        import struct
+        request_id = None
+        keep = False
+        params = []
+        stdin = None
+        try:
+            while True:
+                record = _fcgi_read(conn)
+                if record is None:
+                    break
+                kind, rid, content = record
+                if kind == _FCGI_GET_VALUES:
+                    # each process serves one connection and one request
+                    # at a time
+                    limit = str(self.processes or 1)
+                    values = {'FCGI_MAX_CONNS': limit, 'FCGI_MAX_REQS': limit,
+                              'FCGI_MPXS_CONNS': '0'}
+                    _fcgi_write(conn, _FCGI_GET_VALUES_RESULT, 0,
+                                _fcgi_pairs(
+                                    (name, values[name])
+                                    for name, value in _fcgi_params(content)
+                                    if name in values))
+                elif rid == 0:
+                    _fcgi_write(conn, _FCGI_UNKNOWN_TYPE, 0,
+                                struct.pack('!B7x', kind))
+                elif kind == _FCGI_BEGIN_REQUEST:
+                    role, flags = struct.unpack('!HB5x', content)
+                    if request_id is not None:
+                        _fcgi_end(conn, rid, 0, _FCGI_CANT_MPX_CONN)
+                    elif role != _FCGI_RESPONDER:
+                        _fcgi_end(conn, rid, 0, _FCGI_UNKNOWN_ROLE)
+                        if not flags & _FCGI_KEEP_CONN:
+                            break
+                    else:
+                        request_id = rid
+                        keep = bool(flags & _FCGI_KEEP_CONN)
+                        params = []
+                        stdin = _Spool(self.spool_size)
+                elif rid != request_id:
+                    pass
+                elif kind == _FCGI_ABORT_REQUEST:
+                    _fcgi_end(conn, rid, 0, _FCGI_REQUEST_COMPLETE)
+                    stdin.close()
+                    request_id = None
+                    if not keep:
+                        break
+                elif kind == _FCGI_PARAMS:
+                    params.append(content)
+                elif kind == _FCGI_STDIN and content:
+                    stdin.write(content)
+                elif kind == _FCGI_STDIN:
+                    environ = dict(_fcgi_params(b''.join(params)))
+                    status = self._respond(conn, rid, environ, stdin)
+                    _fcgi_end(conn, rid, status, _FCGI_REQUEST_COMPLETE)
+                    request_id = None
+                    self._count += 1
+                    if not keep or (self.max_requests and
+                                    self._count >= self.max_requests):
+                        break
+        finally:
+            if stdin is not None:
+                stdin.close()
+            conn.close()
+
+    _count = 0
+
+    def _listen(self):
+        import socket
+        address = self.address
+        if address is None:
+            # FCGI_LISTENSOCK_FILENO
+            return socket.socket(fileno=0)
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET6 if ':' in address[0]
+                                 else socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(address)
+        sock.listen(128)
+        return sock
+
+    def _work(self, sock):
+        allowed = os.environ.get('FCGI_WEB_SERVER_ADDRS')
+        if allowed:
+            allowed = [addr.strip() for addr in allowed.split(',')]
+        while not (self.max_requests and self._count >= self.max_requests):
+            conn, addr = sock.accept()
+            if (allowed and isinstance(addr, tuple) and
+                addr[0] not in allowed):
+                conn.close()
+                continue
+            self.handle(conn)
+
+    def _respond(self, conn, request_id, environ, stdin):
+        # Run render with the standard streams and environment of CGI.
+        output = _FastCGIOutput(conn, request_id, _FCGI_STDOUT)
+        stdout = io.TextIOWrapper(io.BufferedWriter(output, 32768),
+                                  self.encoding, 'xmlcharrefreplace')
+        stdin_file = stdin.file()
+        cgi_environ = dict(os.environ)
+        cgi_environ.update(environ)
+        saved = sys.stdin, sys.stdout, os.environ
+        sys.stdin = io.TextIOWrapper(stdin_file, self.encoding, 'replace')
+        sys.stdout = stdout
+        os.environ = cgi_environ
+        status = 0
+        try:
+            self.render()
+        except SystemExit as exc:
+            if exc.code is not None and exc.code != 0:
+                status = exc.code if isinstance(exc.code, int) else 1
+        except Exception:
+            import traceback
+            status = 1
+            stdout.flush()
+            if not output.size:
+                stdout.write('Status: 500 Internal Server Error\n'
+                             'Content-Type: text/plain\n\n')
+            _FastCGIOutput(conn, request_id, _FCGI_STDERR).write(
+                traceback.format_exc().encode(self.encoding, 'replace'))
+            _fcgi_write(conn, _FCGI_STDERR, request_id, b'')
+        finally:
+            sys.stdin, sys.stdout, os.environ = saved
+            try:
+                stdout.flush()
+            finally:
+                stdin.close()
+        _fcgi_write(conn, _FCGI_STDOUT, request_id, b'')
+        return status & 0xffffffff
+
+def _terminate(signum, frame):
+    sys.exit(0)
+
+class _FastCGIOutput(io.RawIOBase):
+
+    """Raw binary stream that writes to a FastCGI stream as records.
+
+    It has no file descriptor: fileno() raises io.UnsupportedOperation,
+    so HTML.include_file() writes to it from a memory map.
+    """
+
+    def __init__(self, conn, request_id, kind):
+        self._conn = conn
+        self._request_id = request_id
+        self._kind = kind
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        with memoryview(data) as view:
+            for offset in range(0, len(view), 65535):
+                _fcgi_write(self._conn, self._kind, self._request_id,
+                            view[offset:offset + 65535])
+            self.size += len(view)
+            return len(view)
+
+class _Spool:
+
+    """Request body kept in memory, moved to a temporary file if large."""
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._file = io.BytesIO()
+
+    def write(self, data):
+        if (self._max_size is not None and
+            self._file.tell() + len(data) > self._max_size):
+            import tempfile
+            disk = tempfile.TemporaryFile()
+            disk.write(self._file.getvalue())
+            self._file = disk
+            self._max_size = None
+        self._file.write(data)
+
+    def file(self):
+        """Return the binary file object of the body from its start."""
+        self._file.seek(0)
+        return self._file
+
+    def close(self):
+        self._file.close()
+
+def _fcgi_read(conn):
+    """Return (type, request id, content) of the next record, or None."""
+    import struct
+    header = _fcgi_recv(conn, 8)
+    if header is None:
+        return None
+    version, kind, request_id, length, padding = struct.unpack(
+        '!BBHHBx', header)
+    content = _fcgi_recv(conn, length + padding)
+    if content is None:
+        return None
+    return kind, request_id, content[:length]
+
+def _fcgi_recv(conn, size):
+    """Return size bytes from conn, or None at the end of it."""
+    chunks = []
+    while size:
+        chunk = conn.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+def _fcgi_write(conn, kind, request_id, content):
+    """Send a record of at most 65535 bytes of content."""
+    import struct
+    padding = -len(content) % 8
+    conn.sendall(struct.pack('!BBHHBx', 1, kind, request_id, len(content),
+                             padding))
+    conn.sendall(bytes(content) + b'\x00' * padding)
+
+def _fcgi_end(conn, request_id, app_status, protocol_status):
+    import struct
+    _fcgi_write(conn, _FCGI_END_REQUEST, request_id,
+                struct.pack('!IB3x', app_status, protocol_status))
+
+def _fcgi_params(data):
+    """Yield (name, value) of name-value pairs of FastCGI as strings."""
+    i, n = 0, len(data)
+    while i < n:
+        lengths = []
+        for k in range(2):
+            if data[i] & 0x80:
+                lengths.append(int.from_bytes(data[i:i + 4], 'big')
+                               & 0x7fffffff)
+                i += 4
+            else:
+                lengths.append(data[i])
+                i += 1
+        name = data[i:i + lengths[0]]
+        i += lengths[0]
+        value = data[i:i + lengths[1]]
+        i += lengths[1]
+        # decoded like os.environ on POSIX
+        yield (name.decode('utf-8', 'surrogateescape'),
+               value.decode('utf-8', 'surrogateescape'))
+
+def _fcgi_pairs(pairs):
+    """Return name-value pairs of FastCGI of (name, value) strings."""
+    result = []
+    for name, value in pairs:
+        for item in (name.encode(), value.encode()):
+            if len(item) < 128:
+                result.append(bytes((len(item),)))
+            else:
+                result.append((len(item) | 0x80000000).to_bytes(4, 'big'))
+        result.append(name.encode() + value.encode())
+    return b''.join(result)
@@ -0,0 +1,333 @@
+# -*- coding: utf-8-unix; mode: python -*-
+"""Streaming parser of multipart/form-data request bodies of htmldocument.
+
+It is imported on first use of MultipartParser or FormPart from
+htmldocument, or of HTML.read_form().
+"""
+
+class MultipartParser:
+
+    """Streaming parser of multipart/form-data request bodies.
+
+    The body is read chunk by chunk and each part is written to a spooled
+    temporary file, which stays in memory up to spool_size bytes and is
+    moved to disk beyond it, so memory use is bounded whatever the size of
+    uploaded files. ValueError is raised for a malformed body or one over
+    the limits.
+
+    Useage:
+        parser = htmldocument.MultipartParser(max_size=8 << 30)
+        for part in ht.read_form(environ, parser):
+            with part:
+                if part.filename is not None:
+                    part.save(os.path.join(uploads, part.filename))
+    """
+
+    __slots__ = ('chunk_size', 'spool_size', 'max_size', 'max_parts',
+                 'max_header_size', 'encoding')
+
+    def __init__(self, chunk_size=65536, spool_size=1048576,
+                 max_size=1073741824, max_parts=1000, max_header_size=16384,
+                 encoding='utf-8'):
+
+        """Constructor of class MultipartParser.
+
+        Keyword arguments:
+            chunk_size -- bytes of the body read at a time (default 65536)
+            spool_size -- bytes of a part kept in memory (default 1048576)
+            max_size -- limit of bytes of the body; None means no limit
+                        (default 1073741824, 1 GiB)
+            max_parts -- limit of number of parts (default 1000)
+            max_header_size -- limit of bytes of headers of a part (default
+                               16384)
+            encoding -- encoding of names and text of parts (default
+                        'utf-8')
+        """
+
+        self.chunk_size = chunk_size
+        self.spool_size = spool_size
+        self.max_size = max_size
+        self.max_parts = max_parts
+        self.max_header_size = max_header_size
+        self.encoding = encoding
+
+    def parts(self, stream, content_type, content_length=None):
+        """Yield each FormPart of the body as soon as it is read.
+
+        Keyword arguments:
+            stream -- binary file object of the body
+            content_type -- value of Content-Type
+            content_length -- bytes of the body (default None, means read
+                              stream to its end)
+        """
+        if (content_length is not None and self.max_size is not None and
+            content_length > self.max_size):
+            raise ValueError('request body over %d bytes' % self.max_size)
+        reader = self._reader(content_type)
+        remaining = content_length
+        try:
+            while not reader.done:
+                size = self.chunk_size
+                if remaining is not None:
+                    size = min(size, remaining)
+                data = stream.read(size) if size else b''
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield from reader.feed(data)
+            reader.close()
+        finally:
+            reader.abort()
+
+    def parse(self, stream, content_type, content_length=None):
+        """Return list of FormPart objects of the body.
+
+        Keyword arguments:
+            stream -- binary file object of the body
+            content_type -- value of Content-Type
+            content_length -- bytes of the body (default None, means read
+                              stream to its end)
+        """
+        parts = []
+        try:
+            for part in self.parts(stream, content_type, content_length):
+                parts.append(part)
+        except BaseException:
+            for part in parts:
+                part.close()
+            raise
+        return parts
+
+    def _reader(self, content_type):
+        kind, params = _header_params(content_type)
+        if kind.lower() != 'multipart/form-data':
+            raise ValueError('need multipart/form-data, got %r' % kind)
+        boundary = params.get('boundary', '')
+        if not 0 < len(boundary) <= 70:
+            raise ValueError('bad boundary %r' % boundary)
+        return _MultipartReader(self, boundary.encode('latin-1'))
+
+    def _part(self, header):
+        headers = {}
+        for line in header.decode(self.encoding, 'replace').split('\r\n'):
+            name, sep, value = line.partition(':')
+            if not sep:
+                raise ValueError('bad part header %r' % line)
+            headers[name.strip().lower()] = value.strip()
+        disposition, params = _header_params(
+            headers.get('content-disposition', ''))
+        if disposition.lower() != 'form-data' or 'name' not in params:
+            raise ValueError('need form-data with name, got %r'
+                             % headers.get('content-disposition'))
+        filename = params.get('filename*', params.get('filename'))
+        if filename is not None:
+            # some user agents send the path of the file
+            filename = filename.replace('\\', '/').rpartition('/')[2]
+        import tempfile
+        return FormPart(params['name'], filename,
+                        headers.get('content-type', 'text/plain'), headers,
+                        tempfile.SpooledTemporaryFile(self.spool_size),
+                        self.encoding)
+
+class _MultipartReader:
+
+    """Parser state of one body, fed by MultipartParser."""
+
+    __slots__ = ('_parser', '_delimiter', '_buffer', '_state', '_part',
+                 '_size', '_count')
+
+    def __init__(self, parser, boundary):
+        self._parser = parser
+        self._delimiter = b'\r\n--' + boundary
+        # the first boundary has no line break before it
+        self._buffer = b'\r\n'
+        self._state = 'preamble'
+        self._part = None
+        self._size = 0
+        self._count = 0
+
+    @property
+    def done(self):
+        return self._state == 'end'
+
+    def feed(self, data):
+        """Parse data and return list of parts completed by it."""
+        parser = self._parser
+        self._size += len(data)
+        if parser.max_size is not None and self._size > parser.max_size:
+            raise ValueError('request body over %d bytes' % parser.max_size)
+        buffer = self._buffer + data
+        delimiter = self._delimiter
+        parts = []
+        while self._state != 'end':
+            if self._state == 'headers':
+                if buffer.startswith(b'\r\n'):
+                    end = 0
+                else:
+                    end = buffer.find(b'\r\n\r\n')
+                    if (end > parser.max_header_size or
+                        end < 0 and len(buffer) > parser.max_header_size):
+                        raise ValueError('part header over %d bytes'
+                                         % parser.max_header_size)
+                    if end < 0:
+                        break
+                self._part = parser._part(buffer[:end])
+                buffer = buffer[end + (2 if end == 0 else 4):]
+                self._state = 'data'
+                continue
+            index = buffer.find(delimiter)
+            if index < 0:
+                # the end of buffer may be the start of a delimiter
+                index = len(buffer) - len(delimiter) + 1
+                if index > 0:
+                    self._write(buffer[:index])
+                    buffer = buffer[index:]
+                break
+            end = index + len(delimiter)
+            if len(buffer) < end + 2:
+                self._write(buffer[:index])
+                buffer = buffer[index:]
+                break
+            self._write(buffer[:index])
+            if self._part is not None:
+                self._part.file.seek(0)
+                parts.append(self._part)
+                self._part = None
+            tail = buffer[end:end + 2]
+            if tail == b'--':
+                self._state = 'end'
+                buffer = b''
+            elif tail == b'\r\n':
+                self._count += 1
+                if self._count > parser.max_parts:
+                    raise ValueError('over %d parts' % parser.max_parts)
+                self._state = 'headers'
+                buffer = buffer[end + 2:]
+            else:
+                raise ValueError('malformed multipart body')
+        self._buffer = buffer
+        return parts
+
+    def close(self):
+        """Raise ValueError if the body has not ended."""
+        if self._state != 'end':
+            raise ValueError('incomplete multipart body')
+
+    def abort(self):
+        """Close the part being read, if any."""
+        if self._part is not None:
+            self._part.close()
+            self._part = None
+
+    def _write(self, data):
+        if self._part is not None and data:
+            self._part.file.write(data)
+            self._part.size += len(data)
+
+class FormPart:
+
+    """Part of a multipart/form-data request body.
+
+    Attributes:
+        name -- name of the form item
+        filename -- base name of the uploaded file, or None for other items
+        content_type -- value of Content-Type of the part
+        headers -- dict object of lower case header name: value
+        size -- bytes of the content
+        file -- binary file object of the content, spooled to disk if it is
+                large
+    """
+
+    __slots__ = ('name', 'filename', 'content_type', 'headers', 'size',
+                 'file', '_encoding')
+
+    def __init__(self, name, filename, content_type, headers, file,
+                 encoding='utf-8'):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.headers = headers
+        self.size = 0
+        self.file = file
+        self._encoding = encoding
+
+    def __repr__(self):
+        return 'FormPart({0!r}, {1!r})'.format(self.name, self.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read(self):
+        """Return the content as bytes."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def text(self):
+        """Return the content decoded by its charset or encoding."""
+        kind, params = _header_params(self.content_type)
+        return self.read().decode(params.get('charset', self._encoding),
+                                  'replace')
+
+    def save(self, filename):
+        """Copy the content to file filename by chunks."""
+        import shutil
+        self.file.seek(0)
+        with open(filename, 'wb') as f:
+            shutil.copyfileobj(self.file, f)
+
+    def close(self):
+        """Close file, removing it from disk if it is there."""
+        self.file.close()
+
+def _header_params(value):
+    """Return main value and dict of parameters of a header value.
+
+    Quoted values are unquoted, and name*=charset'lang'value of RFC 8187
+    is decoded.
+    """
+    main, sep, rest = value.partition(';')
+    params = {}
+    i, n = 0, len(rest)
+    while i < n:
+        while i < n and rest[i] in ' \t;':
+            i += 1
+        start = i
+        while i < n and rest[i] not in '=;':
+            i += 1
+        name = rest[start:i].strip().lower()
+        value = ''
+        if i < n and rest[i] == '=':
+            i += 1
+            while i < n and rest[i] in ' \t':
+                i += 1
+            if i < n and rest[i] == '"':
+                i += 1
+                chars = []
+                while i < n and rest[i] != '"':
+                    if rest[i] == '\\' and i + 1 < n:
+                        i += 1
+                    chars.append(rest[i])
+                    i += 1
+                i += 1
+                value = ''.join(chars)
+            else:
+                start = i
+                while i < n and rest[i] != ';':
+                    i += 1
+                value = rest[start:i].strip()
+        if name.endswith('*'):
+            charset, sep, encoded = value.partition("'")
+            encoded = encoded.partition("'")[2]
+            import urllib.parse
+            try:
+                value = urllib.parse.unquote(encoded, charset or 'utf-8',
+                                             'replace')
+            except LookupError:
+                continue
+        if name:
+            params[name] = value
+    return main.strip(), params
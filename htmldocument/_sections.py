@@ -0,0 +1,112 @@
+# -*- coding: utf-8-unix; mode: python -*-
+"""Parallel rendering of sections of documents of htmldocument.
+
+It is imported on first use of Section or SectionPool from htmldocument.
+"""
+from . import HTML, _encoding
+
+class Section:
+
+    """Independent section of a document to render.
+
+    A section is rendered by render(html, *args), which returns the
+    section as a string. To be rendered by a SectionPool, render must be
+    a function defined at module level and args must be picklable, since
+    they are sent to another process; html is then an HTML object of that
+    process with the site configuration of the pool.
+    """
+
+    __slots__ = ('render', 'args', 'size')
+
+    def __init__(self, render, *args, size=0):
+
+        """Constructor of class Section.
+
+        Keyword arguments:
+            render -- function that returns the section
+            args -- arguments of render after the HTML object
+            size -- estimated size of the section in bytes (default 0)
+        """
+
+        self.render = render
+        self.args = args
+        self.size = size
+
+class SectionPool:
+
+    """Process pool that renders sections of documents in parallel.
+
+    The whole site configuration of the HTML object given to the
+    constructor is sent to each worker process once, when the process
+    starts; after that only the sections go to the workers and the
+    encoded sections come back. A FragmentCache or a
+    Bundler of the configuration arrives empty, so each worker keeps
+    fragments and finds bundles of its own; the sections are the same as
+    rendered in this process. The processes are started on first use and
+    stopped by close() or at the end of a with statement.
+
+    Useage:
+        with htmldocument.SectionPool(ht) as pool:
+            ht.print_sections([htmldocument.Section(report, year, size=n)
+                               for year, n in years], pool)
+    """
+
+    def __init__(self, html, max_workers=None, min_size=262144,
+                 mp_context=None):
+
+        """Constructor of class SectionPool.
+
+        Keyword arguments:
+            html -- HTML object whose site configuration the workers use
+            max_workers -- number of worker processes (default None, means
+                           the number of processors)
+            min_size -- total size of sections in bytes below which they
+                        are rendered serially (default 262144)
+            mp_context -- multiprocessing context (default None)
+        """
+
+        self.min_size = min_size
+        # a copy without the parts of the document made on first use
+        self._site = html._site.replace()
+        self._max_workers = max_workers
+        self._mp_context = mp_context
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def accepts(self, sections):
+        """Return True if sections are large enough to render here."""
+        return sum(section.size for section in sections) >= self.min_size
+
+    def map(self, sections):
+        """Render sections and return iterator of them encoded, in order."""
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(
+                self._max_workers, self._mp_context,
+                _init_section_worker, (self._site,))
+        return self._executor.map(_render_section, sections)
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+# HTML object of a worker process of SectionPool
+_worker_html = None
+
+def _init_section_worker(site):
+    global _worker_html
+    html = HTML()
+    html._site = site
+    _worker_html = html
+
+def _render_section(section):
+    html = _worker_html
+    return section.render(html, *section.args).encode(
+        _encoding(html.encode), 'xmlcharrefreplace')
@@ -0,0 +1,47 @@
+import copy
+import pickle
+import unittest
+
+import htmldocument
+
+
+class AttrsTest(unittest.TestCase):
+
+    def test_interned(self):
+        a = htmldocument.Attrs(class_='cell')
+        self.assertIs(a, htmldocument.Attrs({'class': 'cell'}))
+
+    def test_bool_and_int_not_confused(self):
+        ht = htmldocument.HTML()
+        one = htmldocument.Attrs(hidden=1)
+        true = htmldocument.Attrs(hidden=True)
+        self.assertIsNot(one, true)
+        self.assertNotEqual(one, true)
+        self.assertEqual(ht.div('x', one), ht.div('x', {'hidden': 1}))
+        self.assertEqual(ht.div('x', true), ht.div('x', {'hidden': True}))
+
+    def test_creation_order_does_not_matter(self):
+        ht = htmldocument.HTML()
+        false = htmldocument.Attrs(tabindex=False)
+        zero = htmldocument.Attrs(tabindex=0)
+        self.assertEqual(ht.div('x', zero), '<div tabindex="0">x</div>')
+        self.assertEqual(ht.div('x', false), ht.div('x', {'tabindex': False}))
+
+    def test_pickle_keeps_interning(self):
+        a = htmldocument.Attrs(class_='a')
+        b = htmldocument.Attrs(id='b')
+        loaded = pickle.loads(pickle.dumps([a, b]))
+        self.assertIs(loaded[0], a)
+        self.assertIs(loaded[1], b)
+        self.assertIs(copy.copy(a), a)
+        self.assertIs(copy.deepcopy(b), b)
+        self.assertEqual(str(htmldocument.Attrs()), '')
+        self.assertEqual(str(a), ' class="a"')
+
+    def test_pickle_of_unknown_set(self):
+        data = pickle.dumps(htmldocument.Attrs(title='t', tabindex=1))
+        self.assertEqual(str(pickle.loads(data)), ' title="t" tabindex="1"')
+
+
+if __name__ == '__main__':
+    unittest.main()
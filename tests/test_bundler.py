@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+import htmldocument
+
+
+class BundlerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = self.temp.name
+        self.bundler = htmldocument.Bundler(
+            os.path.join(self.root, 'bundles'), '/bundles/', self.root)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def write(self, path, data):
+        filename = os.path.join(self.root, *path.lstrip('/').split('/'))
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'wb') as f:
+            f.write(data)
+
+    def read(self, url):
+        self.assertTrue(url.startswith('/bundles/'))
+        with open(os.path.join(self.root, 'bundles',
+                               url[len('/bundles/'):]), 'rb') as f:
+            return f.read()
+
+    def test_relative_urls_are_rebased(self):
+        self.write('/css/main.css',
+                   b'a { background: url(img/a.png) }\n'
+                   b'/* url(comment.png) */\n'
+                   b'b::after { content: "url(text.png)" }')
+        self.write('/theme/dark/site.css',
+                   b"c { background: url('../b.png'), url(/abs.png),"
+                   b" url(data:image/png;base64,AA), url(#f) }")
+        urls = self.bundler.urls(('/css/main.css', 'theme/dark/site.css'),
+                                 'css')
+        self.assertEqual(len(urls), 1)
+        data = self.read(urls[0])
+        self.assertIn(b'url(/css/img/a.png)', data)
+        self.assertIn(b'url(comment.png)', data)
+        self.assertIn(b'"url(text.png)"', data)
+        self.assertIn(b"url('/theme/b.png')", data)
+        self.assertIn(b'url(/abs.png)', data)
+        self.assertIn(b'url(data:image/png;base64,AA)', data)
+        self.assertIn(b'url(#f)', data)
+
+    def test_charset_is_put_once_at_the_start(self):
+        self.write('/a.css', b'@charset "UTF-8";\na { color: red }')
+        self.write('/b.css', b'\xef\xbb\xbfb::after { content: "\xc3\xa9" }')
+        url = self.bundler.bundle(('/a.css', '/b.css'), 'css')
+        data = self.read(url)
+        self.assertTrue(data.startswith(b'@charset "utf-8";\n'))
+        self.assertEqual(data.count(b'@charset'), 1)
+        self.assertNotIn(b'\xef\xbb\xbf', data)
+        self.assertIn('"é"'.encode(), data)
+
+    def test_different_charsets_are_not_bundled(self):
+        self.write('/a.css', b'@charset "iso-8859-1";\na { color: red }')
+        self.write('/b.css', b'@charset "utf-8";\nb { color: red }')
+        self.assertIsNone(self.bundler.bundle(('/a.css', '/b.css'), 'css'))
+        self.assertEqual(self.bundler.urls(('/a.css', '/b.css'), 'css'),
+                         ('/a.css', '/b.css'))
+
+    def test_import_only_in_first_file(self):
+        self.write('/css/a.css', b'@import "base.css";\na { color: red }')
+        self.write('/css/b.css', b'@import url(print.css) print;\nb { }')
+        self.write('/css/base.css', b'html { margin: 0 }')
+        url = self.bundler.bundle(('/css/a.css', '/css/base.css'), 'css')
+        data = self.read(url)
+        self.assertTrue(data.startswith(b'@import "/css/base.css";'))
+        self.assertIsNone(
+            self.bundler.bundle(('/css/a.css', '/css/b.css'), 'css'))
+        self.assertIsNone(
+            self.bundler.bundle(('/css/base.css', '/css/b.css'), 'css'))
+
+    def test_scripts_are_separated(self):
+        self.write('/a.js', b'var a = 1')
+        self.write('/b.js', b'(function () {})()')
+        url = self.bundler.bundle(('/a.js', '/b.js'), 'js')
+        self.assertEqual(self.read(url), b'var a = 1;\n(function () {})()')
+
+    def test_head_has_one_link(self):
+        self.write('/a.css', b'a { color: red }')
+        self.write('/b.css', b'b { color: blue }')
+        ht = htmldocument.HTML(cssfiles=['/a.css', '/b.css',
+                                         'https://cdn.example/c.css'],
+                               bundler=self.bundler)
+        header = ht.html_header()
+        self.assertEqual(header.count('<link rel="stylesheet"'), 2)
+        self.assertIn('href="/bundles/', header)
+        self.assertIn('href="https://cdn.example/c.css"', header)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import htmldocument
+from htmldocument._assets import _minify_css
+
+
+class MinifyCSSTest(unittest.TestCase):
+
+    def test_white_space_and_comments(self):
+        self.assertEqual(
+            _minify_css('/* note */\np {\n  color : red;\n  margin: 0 ;\n}\n'
+                        'a , b > i { font: 1px/**/2px serif }'),
+            'p{color:red;margin:0}a,b>i{font:1px 2px serif}')
+
+    def test_strings_are_kept(self):
+        self.assertEqual(_minify_css('q::before { content: "x ; y" }'),
+                         'q::before{content:"x ; y"}')
+        self.assertEqual(_minify_css("a[title='a , b'] { content: '/* */' }"),
+                         "a[title='a , b']{content:'/* */'}")
+        self.assertEqual(_minify_css(r'p { content: "a \" ; b" }'),
+                         r'p{content:"a \" ; b"}')
+
+    def test_selectors_are_kept(self):
+        self.assertEqual(_minify_css('div :first-child { color: red }'),
+                         'div :first-child{color:red}')
+        self.assertEqual(_minify_css('a { b :hover { color: red } }'),
+                         'a{b :hover{color:red}}')
+
+
+class CriticalCSSTest(unittest.TestCase):
+
+    def test_budget(self):
+        with tempfile.TemporaryDirectory() as root:
+            for name, size in (('a.css', 10), ('b.css', 100)):
+                with open(os.path.join(root, name), 'w') as f:
+                    f.write('p{content:"' + 'x' * size + '"}')
+            critical = htmldocument.CriticalCSS(['/a.css', '/b.css'], root,
+                                                budget=60)
+            css, paths, rest = critical.inline()
+            self.assertEqual(paths, ('/a.css',))
+            self.assertEqual(rest, ('/b.css',))
+            self.assertIn('x' * 10, css)
+
+    def test_rest_is_loaded(self):
+        with tempfile.TemporaryDirectory() as root:
+            for name, size in (('crit.css', 10), ('big.css', 100)):
+                with open(os.path.join(root, name), 'w') as f:
+                    f.write('p{content:"' + 'x' * size + '"}')
+            critical = htmldocument.CriticalCSS(
+                ['/crit.css', '/big.css', '/missing.css'], root, budget=60)
+            ht = htmldocument.HTML(cssfiles=['/main.css', '/missing.css'],
+                                   critical=critical)
+            header = ht.html_header()
+            self.assertIn('x' * 10, header)
+            self.assertNotIn('x' * 100, header)
+            self.assertNotIn('href="/crit.css"', header)
+            for path in ('/big.css', '/main.css', '/missing.css'):
+                self.assertEqual(
+                    header.count('href="{0}"'.format(path)), 2, path)
+            self.assertLess(header.index('href="/big.css"'),
+                            header.index('href="/main.css"'))
+            noscript = header[header.index('<noscript>'):]
+            self.assertIn('href="/big.css"', noscript)
+
+    def test_relative_urls_are_rebased(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.mkdir(os.path.join(root, 'css'))
+            with open(os.path.join(root, 'css', 'a.css'), 'w',
+                      encoding='utf-8-sig') as f:
+                f.write('@charset "utf-8";\n'
+                        'a { background: url(../img/a.png) }')
+            with open(os.path.join(root, 'css', 'b.css'), 'w') as f:
+                f.write('@import "print.css" print;\nb { color: red }')
+            critical = htmldocument.CriticalCSS(['/css/a.css', '/css/b.css'],
+                                                root)
+            css, paths, rest = critical.inline()
+            self.assertEqual(css, 'a{background:url(/img/a.png)}')
+            self.assertEqual(paths, ('/css/a.css',))
+            self.assertEqual(rest, ('/css/b.css',))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import base64
+import hashlib
+import io
+import unittest
+
+import htmldocument
+from htmldocument._compression import _zstd
+
+
+def _pages(count):
+    return [('<!DOCTYPE html><html><head><title>Item {0}</title></head>'
+             '<body><nav><a href="/">Home</a><a href="/news">News</a></nav>'
+             '<p>Item {0}</p><footer>Example Inc.</footer></body></html>'
+             .format(i)).encode() for i in range(count)]
+
+
+def _available(data):
+    return ':{0}:'.format(
+        base64.b64encode(hashlib.sha256(data).digest()).decode())
+
+
+class DictionaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dictionary = htmldocument.train_dictionary(_pages(10), id='v1')
+
+    def test_trained_on_common_markup(self):
+        self.assertIn(b'<footer>Example Inc.</footer>', self.dictionary.data)
+        self.assertNotIn(b'Item 3', self.dictionary.data)
+
+    def test_available_matches_hash(self):
+        d = self.dictionary
+        self.assertTrue(d.available(_available(d.data)))
+        self.assertTrue(d.available(' ' + _available(d.data) + ' '))
+        self.assertFalse(d.available(_available(d.data + b'x')))
+        self.assertFalse(d.available(''))
+        self.assertFalse(d.available(
+            base64.b64encode(d.digest).decode()))
+
+    def test_headers(self):
+        self.assertEqual(self.dictionary.headers(), [
+            ('Content-Type', 'application/octet-stream'),
+            ('Use-As-Dictionary', 'match="/*", id="v1"')])
+
+    def test_zlib_round_trip(self):
+        page = _pages(11)[-1]
+        compressed = self.dictionary.compress(page)
+        self.assertEqual(self.dictionary.decompress(compressed), page)
+        import zlib
+        self.assertLess(len(compressed), len(zlib.compress(page, 9)))
+
+    @unittest.skipIf(_zstd() is not None, 'zstd is available')
+    def test_negotiation_without_zstd(self):
+        compression = htmldocument.Compression(dictionary=self.dictionary)
+        available = _available(self.dictionary.data)
+        self.assertEqual(compression.negotiate('gzip, dcz', available),
+                         'gzip')
+
+    @unittest.skipIf(_zstd() is None,
+                     'needs compression.zstd or backports.zstd')
+    def test_negotiation(self):
+        compression = htmldocument.Compression(dictionary=self.dictionary)
+        available = _available(self.dictionary.data)
+        negotiate = compression.negotiate
+        self.assertEqual(negotiate('gzip, dcz', available), 'dcz')
+        self.assertEqual(negotiate('gzip, zstd, dcz;q=0', available), 'zstd')
+        self.assertEqual(negotiate('gzip, dcz;q=0', available), 'gzip')
+        self.assertEqual(negotiate('gzip, zstd, dcz', _available(b'other')),
+                         'zstd')
+        self.assertEqual(negotiate('gzip, zstd, dcz', ''), 'zstd')
+        self.assertEqual(negotiate('gzip, dcz', ''), 'gzip')
+        self.assertEqual(negotiate('gzip', available), 'gzip')
+        without = htmldocument.Compression(('gzip',))
+        self.assertEqual(without.negotiate('gzip, dcz', available), 'gzip')
+
+    @unittest.skipIf(_zstd() is None,
+                     'needs compression.zstd or backports.zstd')
+    def test_dcz_body(self):
+        zstd = _zstd()
+        ht = htmldocument.HTML(compression=htmldocument.Compression(
+            dictionary=self.dictionary, min_size=0))
+        page = _pages(11)[-1]
+        environ = {'HTTP_ACCEPT_ENCODING': 'gzip, br, zstd, dcz',
+                   'HTTP_AVAILABLE_DICTIONARY':
+                       _available(self.dictionary.data)}
+        out = io.BytesIO()
+        with ht.request(environ):
+            self.assertEqual(ht.content_encoding, 'dcz')
+            self.assertIn(('Vary', 'Accept-Encoding, Available-Dictionary'),
+                          ht.resp_headers('dcz'))
+            with ht.body_writer(out) as writer:
+                writer.write(page)
+        header, sep, body = out.getvalue().partition(b'\n\n')
+        self.assertIn(b'Content-Encoding: dcz', header)
+        self.assertEqual(body[:8], b'\x5e\x2a\x4d\x18\x20\x00\x00\x00')
+        self.assertEqual(body[8:40], self.dictionary.digest)
+        zstd_dict = zstd.ZstdDict(self.dictionary.data, is_raw=True)
+        self.assertEqual(zstd.decompress(body[40:], zstd_dict), page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import http.server
+import socket
+import threading
+import unittest
+
+import htmldocument
+
+
+def _site():
+    return htmldocument.HTML(
+        sitetitle='Site', cssfiles=['/css/main.css'], jsfiles=['/js/app.js'],
+        assets=[htmldocument.Asset('https://cdn.example.com',
+                                   rel='preconnect')])
+
+
+class EarlyHintsTest(unittest.TestCase):
+
+    def test_links(self):
+        self.assertEqual(_site().early_hints(), [
+            '<https://cdn.example.com>; rel=preconnect',
+            '</css/main.css>; rel=preload; as=style',
+            '</js/app.js>; rel=preload; as=script'])
+
+    def test_no_hints(self):
+        ht = htmldocument.HTML()
+        self.assertEqual(ht.early_hints(), [])
+        self.assertFalse(ht.wsgi_early_hints({'wsgi.early_hints': print}))
+
+    def test_http_server(self):
+        # A local http.server stands in for the server of the site: it
+        # writes the 103 response and then the final one.
+        ht = _site()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.wfile.write(ht.early_hints_response())
+                self.wfile.flush()
+                body = (ht.html_header() + ht.html_close()).encode()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            with socket.create_connection(server.server_address) as conn:
+                conn.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\n'
+                             b'Connection: close\r\n\r\n')
+                data = b''
+                while True:
+                    chunk = conn.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+        hints, sep, final = data.partition(b'\r\n\r\n')
+        lines = hints.decode('latin-1').split('\r\n')
+        self.assertEqual(lines[0], 'HTTP/1.1 103 Early Hints')
+        self.assertEqual(lines[1:], ['Link: ' + link
+                                     for link in ht.early_hints()])
+        self.assertTrue(final.startswith(b'HTTP/1.0 200 OK\r\n'))
+        self.assertIn(b'<link rel="stylesheet"', final)
+
+    def test_wsgi(self):
+        sent = []
+        ht = _site()
+        self.assertTrue(ht.wsgi_early_hints({'wsgi.early_hints': sent.append}))
+        self.assertEqual(sent, [[('Link', link)
+                                 for link in ht.early_hints()]])
+
+    def test_asgi(self):
+        ht = _site()
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'extensions': {'http.response.early_hint': {}}}
+        self.assertTrue(asyncio.run(ht.asgi_early_hints(scope, send)))
+        self.assertFalse(asyncio.run(ht.asgi_early_hints({}, send)))
+        self.assertEqual(sent, [{
+            'type': 'http.response.early_hint',
+            'links': [link.encode() for link in ht.early_hints()]}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+import htmldocument
+
+
+class ElementTest(unittest.TestCase):
+
+    def test_iframe_has_end_tag(self):
+        ht = htmldocument.HTML()
+        self.assertEqual(ht.iframe(src='/x'), '<iframe src="/x"></iframe>')
+        self.assertEqual(ht.iframe('', {'allowfullscreen': True}),
+                         '<iframe allowfullscreen="allowfullscreen"></iframe>')
+        self.assertEqual(ht.start_iframe(src='/x') + ht.end_iframe(),
+                         '<iframe src="/x"></iframe>')
+
+    def test_iframe_minified(self):
+        ht = htmldocument.HTML(minify=True)
+        self.assertEqual(ht.iframe(src='/x'), '<iframe src=/x></iframe>')
+
+    def test_void_elements(self):
+        ht = htmldocument.HTML()
+        self.assertEqual(ht.embed(src='/x'), '<embed src="/x" />')
+        self.assertEqual(ht.br(), '<br />')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from htmldocument import escape, escape_many
+
+
+class EscapeManyTest(unittest.TestCase):
+
+    def check(self, values, quote=True):
+        expected = [escape(str(value), quote) for value in values]
+        self.assertEqual(escape_many(values, quote), expected)
+
+    def test_clean_values(self):
+        values = ['id', 'name', 'é', '']
+        result = escape_many(values)
+        self.assertEqual(result, values)
+        for value, escaped in zip(values, result):
+            self.assertIs(escaped, value)
+
+    def test_special_characters(self):
+        self.check(['a&b', '<td>', 'x', '"q"', "it's", ''])
+        self.check(['a&b', '<td>', '"q"', "it's"], False)
+        self.assertEqual(escape_many(['"', "'"], False), ['"', "'"])
+
+    def test_ints(self):
+        self.assertEqual(escape_many([1, 'a<b', 30]), ['1', 'a&lt;b', '30'])
+        self.assertEqual(escape_many((0, -2)), ['0', '-2'])
+
+    def test_values_containing_nul(self):
+        self.check(['a\x00b'])
+        self.check(['a\x00<', 'b'])
+        self.check(['<', '\x00', '>'])
+        self.check(['\x00\x00&', '', 'x\x00'])
+        self.assertEqual(escape_many(['a\x00b', 'c']), ['a\x00b', 'c'])
+
+    def test_empty(self):
+        self.assertEqual(escape_many([]), [])
+        self.assertEqual(escape_many(['']), [''])
+        self.assertEqual(escape_many(['', '&']), ['', '&amp;'])
+
+
+if __name__ == '__main__':
+    unittest.main()
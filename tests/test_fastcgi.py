@@ -0,0 +1,267 @@
+import os
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import htmldocument
+
+# record types of FastCGI
+BEGIN_REQUEST, END_REQUEST, PARAMS, STDIN, STDOUT, STDERR = 1, 3, 4, 5, 6, 7
+GET_VALUES, GET_VALUES_RESULT, UNKNOWN_TYPE = 9, 10, 11
+
+
+def record(kind, request_id, content=b''):
+    padding = -len(content) % 8
+    return (struct.pack('!BBHHBx', 1, kind, request_id, len(content),
+                        padding) + content + b'\x00' * padding)
+
+
+def pairs(items):
+    result = b''
+    for name, value in items:
+        name, value = name.encode(), value.encode()
+        for item in (name, value):
+            if len(item) < 128:
+                result += bytes((len(item),))
+            else:
+                result += (len(item) | 0x80000000).to_bytes(4, 'big')
+        result += name + value
+    return result
+
+
+def request(request_id, params, body=b'', keep=False):
+    """Return records of a responder request, as a web server sends it."""
+    data = record(BEGIN_REQUEST, request_id,
+                  struct.pack('!HB5x', 1, 1 if keep else 0))
+    encoded = pairs(params.items())
+    for offset in range(0, len(encoded), 100):
+        data += record(PARAMS, request_id, encoded[offset:offset + 100])
+    data += record(PARAMS, request_id)
+    for offset in range(0, len(body), 65535):
+        data += record(STDIN, request_id, body[offset:offset + 65535])
+    return data + record(STDIN, request_id)
+
+
+def records(data):
+    result = []
+    while data:
+        version, kind, request_id, length, padding = struct.unpack(
+            '!BBHHBx', data[:8])
+        result.append((kind, request_id, data[8:8 + length]))
+        data = data[8 + length + padding:]
+    return result
+
+
+def responses(data):
+    """Return dict of request id: stdout, stderr, end and stream ends."""
+    result = {}
+    for kind, request_id, content in records(data):
+        response = result.setdefault(request_id, {
+            'stdout': b'', 'stderr': b'', 'end': None, 'ended': set(),
+            'other': []})
+        if kind in (STDOUT, STDERR):
+            name = 'stdout' if kind == STDOUT else 'stderr'
+            if content:
+                response[name] += content
+            else:
+                response['ended'].add(name)
+        elif kind == END_REQUEST:
+            response['end'] = struct.unpack('!IB3x', content)
+        else:
+            response['other'].append((kind, content))
+    return result
+
+
+def serve(render, data, processes=0):
+    """Send data to FastCGIServer.handle() and return what it answers."""
+    server = htmldocument.FastCGIServer(render, processes=processes)
+    client, conn = socket.socketpair()
+    thread = threading.Thread(target=server.handle, args=(conn,))
+    thread.start()
+    try:
+        sender = threading.Thread(target=client.sendall, args=(data,))
+        sender.start()
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        sender.join()
+    finally:
+        thread.join()
+        client.close()
+    return responses(b''.join(chunks))
+
+
+class FastCGIServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.legal = os.path.join(self.directory.name, 'legal.html')
+        with open(self.legal, 'wb') as f:
+            f.write('<p>Légal</p>\n'.encode() * 20000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def render(self):
+        # a CGI script as it is, printing to standard output
+        query = os.environ.get('QUERY_STRING', '')
+        ht = htmldocument.HTML(sitetitle='Site', pagetitle='Page')
+        if query == 'early':
+            raise RuntimeError('before output')
+        ht.print_resp_header()
+        ht.print_html_header()
+        print(ht.start_form() + ht.end_form())
+        print(ht.p('body=' + sys.stdin.read()))
+        if query == 'include':
+            ht.include_file(self.legal)
+        if query == 'fail':
+            raise RuntimeError('after output')
+        if query == 'exit':
+            sys.exit(3)
+        ht.print_html_close()
+
+    def test_page(self):
+        stdout = sys.stdout
+        response = serve(self.render, request(1, {
+            'SCRIPT_NAME': '/app.cgi', 'REQUEST_METHOD': 'POST',
+            'X' * 200: 'long name'}, b'hello'))[1]
+        self.assertEqual(response['end'], (0, 0))
+        self.assertEqual(response['ended'], {'stdout'})
+        page = response['stdout'].decode()
+        self.assertTrue(page.startswith(
+            'Content-Type: text/html; charset=utf-8\n\n<!DOCTYPE html>'))
+        self.assertIn('<form method="POST" action="/app.cgi"></form>', page)
+        self.assertIn('<p>body=hello</p>', page)
+        self.assertTrue(page.endswith('</html>\n'))
+        self.assertNotIn('SCRIPT_NAME', os.environ)
+        self.assertIs(sys.stdout, stdout)
+
+    def test_include_file(self):
+        response = serve(self.render, request(1, {
+            'SCRIPT_NAME': '/app.cgi', 'QUERY_STRING': 'include'}))[1]
+        self.assertEqual(response['end'], (0, 0))
+        with open(self.legal, 'rb') as f:
+            legal = f.read()
+        page = response['stdout']
+        self.assertIn(b'<p>body=</p>\n' + legal + b'</body>', page)
+
+    def test_errors(self):
+        data = (request(1, {'QUERY_STRING': 'early'}, keep=True) +
+                request(2, {'QUERY_STRING': 'fail'}, keep=True) +
+                request(3, {'QUERY_STRING': 'exit'}))
+        result = serve(self.render, data)
+        early, fail, exit = result[1], result[2], result[3]
+        self.assertEqual(early['end'], (1, 0))
+        self.assertTrue(early['stdout'].startswith(
+            b'Status: 500 Internal Server Error\n'))
+        self.assertIn(b'RuntimeError: before output', early['stderr'])
+        self.assertEqual(early['ended'], {'stdout', 'stderr'})
+        self.assertEqual(fail['end'], (1, 0))
+        self.assertTrue(fail['stdout'].startswith(b'Content-Type: text/html'))
+        self.assertIn(b'RuntimeError: after output', fail['stderr'])
+        self.assertEqual(fail['ended'], {'stdout', 'stderr'})
+        self.assertEqual(exit['end'], (3, 0))
+        self.assertEqual(exit['ended'], {'stdout'})
+
+    def test_large_body(self):
+        body = b'x' * 1500000
+        response = serve(self.render, request(1, {}, body))[1]
+        self.assertEqual(response['end'], (0, 0))
+        self.assertIn(b'<p>body=' + body + b'</p>', response['stdout'])
+
+    def test_management_records(self):
+        data = (record(GET_VALUES, 0, pairs([('FCGI_MPXS_CONNS', ''),
+                                             ('FCGI_MAX_REQS', '')])) +
+                record(42, 0) + request(1, {}))
+        result = serve(self.render, data)
+        self.assertEqual(result[0]['other'], [
+            (GET_VALUES_RESULT, pairs([('FCGI_MPXS_CONNS', '0'),
+                                       ('FCGI_MAX_REQS', '1')])),
+            (UNKNOWN_TYPE, bytes((42,)) + b'\x00' * 7)])
+        self.assertEqual(result[1]['end'], (0, 0))
+
+    def test_limits_are_the_processes(self):
+        data = (record(GET_VALUES, 0, pairs([('FCGI_MAX_CONNS', ''),
+                                             ('FCGI_MAX_REQS', '')])) +
+                request(1, {}))
+        result = serve(self.render, data, processes=4)
+        self.assertEqual(result[0]['other'], [
+            (GET_VALUES_RESULT, pairs([('FCGI_MAX_CONNS', '4'),
+                                       ('FCGI_MAX_REQS', '4')]))])
+
+    def test_second_request_is_refused(self):
+        begin = record(BEGIN_REQUEST, 1, struct.pack('!HB5x', 1, 0))
+        data = (begin + request(2, {}) +
+                request(1, {'SCRIPT_NAME': '/one'})[len(begin):])
+        result = serve(self.render, data)
+        # the second request cannot be multiplexed, the first goes on
+        self.assertEqual(result[2]['end'], (0, 1))
+        self.assertEqual(result[1]['end'], (0, 0))
+        self.assertIn(b'action="/one"', result[1]['stdout'])
+
+
+
+POOL_SCRIPT = '''
+import os, sys
+import htmldocument
+
+def main():
+    ht = htmldocument.HTML()
+    ht.print_resp_header()
+    print(ht.start_form() + str(os.getpid()))
+
+htmldocument.FastCGIServer(main, sys.argv[1], processes=2,
+                           max_requests=2).serve_forever()
+'''
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+class FastCGIPoolTest(unittest.TestCase):
+
+    def test_pool(self):
+        with tempfile.TemporaryDirectory() as directory:
+            address = os.path.join(directory, 'fcgi.sock')
+            root = os.path.dirname(os.path.dirname(os.path.abspath(
+                __file__)))
+            env = dict(os.environ, PYTHONPATH=root)
+            server = subprocess.Popen(
+                [sys.executable, '-c', POOL_SCRIPT, address], env=env)
+            try:
+                for i in range(100):
+                    if os.path.exists(address):
+                        break
+                    time.sleep(0.05)
+                pids = set()
+                for i in range(8):
+                    with socket.socket(socket.AF_UNIX) as conn:
+                        conn.connect(address)
+                        conn.sendall(request(1, {'SCRIPT_NAME': '/s%d' % i}))
+                        data = b''
+                        while True:
+                            chunk = conn.recv(65536)
+                            if not chunk:
+                                break
+                            data += chunk
+                    response = responses(data)[1]
+                    self.assertEqual(response['end'], (0, 0))
+                    page = response['stdout']
+                    self.assertIn(b'action="/s%d">' % i, page)
+                    pids.add(page.rpartition(b'>')[2].strip())
+                # workers are replaced after two requests each
+                self.assertGreaterEqual(len(pids), 4)
+            finally:
+                server.send_signal(signal.SIGTERM)
+                self.assertEqual(server.wait(10), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+
+import htmldocument
+
+
+class FingerprintsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = self.temp.name
+        os.mkdir(os.path.join(self.root, 'css'))
+        self.write('/css/main.css', b'p { color: red }')
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def write(self, path, data, mtime=None):
+        filename = os.path.join(self.root, *path.lstrip('/').split('/'))
+        with open(filename, 'wb') as f:
+            f.write(data)
+        if mtime is not None:
+            os.utime(filename, (mtime, mtime))
+        return hashlib.sha256(data).hexdigest()
+
+    def test_query_style(self):
+        digest = hashlib.sha256(b'p { color: red }').hexdigest()
+        fingerprints = htmldocument.Fingerprints(self.root)
+        self.assertEqual(fingerprints.url('/css/main.css'),
+                         '/css/main.css?v=' + digest[:8])
+        self.assertEqual(fingerprints.url('/css/main.css?media=print'),
+                         '/css/main.css?media=print&v=' + digest[:8])
+
+    def test_name_style(self):
+        digest = self.write('/LICENSE', b'MIT')
+        fingerprints = htmldocument.Fingerprints(self.root, 'name', 12)
+        main = hashlib.sha256(b'p { color: red }').hexdigest()[:12]
+        self.assertEqual(fingerprints.url('/css/main.css'),
+                         '/css/main.{0}.css'.format(main))
+        self.assertEqual(fingerprints.url('css/main.css?x=1'),
+                         'css/main.{0}.css?x=1'.format(main))
+        self.assertEqual(fingerprints.url('/LICENSE'),
+                         '/LICENSE.' + digest[:12])
+
+    def test_other_hosts_and_missing_files(self):
+        fingerprints = htmldocument.Fingerprints(self.root)
+        for path in ('https://cdn.example/a.css', '//cdn.example/a.css',
+                     '/css/missing.css'):
+            self.assertEqual(fingerprints.url(path), path)
+
+    def test_changed_file(self):
+        fingerprints = htmldocument.Fingerprints(self.root, recheck=0)
+        old = fingerprints.url('/css/main.css')
+        digest = self.write('/css/main.css', b'p { color: blue }',
+                            mtime=1000000000)
+        self.assertEqual(fingerprints.url('/css/main.css'),
+                         '/css/main.css?v=' + digest[:8])
+        self.assertNotEqual(old, fingerprints.url('/css/main.css'))
+
+    def test_recheck(self):
+        fingerprints = htmldocument.Fingerprints(self.root, recheck=3600)
+        old = fingerprints.url('/css/main.css')
+        self.write('/css/main.css', b'p { color: blue }', mtime=1000000000)
+        self.assertEqual(fingerprints.url('/css/main.css'), old)
+
+    def test_manifest(self):
+        manifest = os.path.join(self.root, 'manifest.json')
+        fingerprints = htmldocument.Fingerprints(self.root, 'name')
+        fingerprints.write_manifest(manifest, ['/css/main.css'])
+        with open(manifest, encoding='utf-8') as f:
+            urls = json.load(f)
+        self.assertEqual(urls, {'/css/main.css':
+                                fingerprints.url('/css/main.css')})
+        # the manifest is used without reading the files
+        os.remove(os.path.join(self.root, 'css', 'main.css'))
+        loaded = htmldocument.Fingerprints(self.root, manifest=manifest)
+        self.assertEqual(loaded.url('/css/main.css'),
+                         urls['/css/main.css'])
+        self.assertEqual(loaded.url('/css/other.css'), '/css/other.css')
+
+    def test_unknown_style(self):
+        with self.assertRaises(ValueError):
+            htmldocument.Fingerprints(self.root, 'hash')
+
+    def test_head(self):
+        fingerprints = htmldocument.Fingerprints(self.root)
+        ht = htmldocument.HTML(cssfiles=['/css/main.css'],
+                               fingerprints=fingerprints)
+        self.assertIn('href="{0}"'.format(fingerprints.url('/css/main.css')),
+                      ht.html_header())
+
+
+if __name__ == '__main__':
+    unittest.main()
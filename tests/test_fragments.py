@@ -0,0 +1,106 @@
+import gzip
+import threading
+import unittest
+
+import htmldocument
+
+
+class FragmentCacheTest(unittest.TestCase):
+
+    def test_nested_fragments_across_threads(self):
+        # Keys 0 and 2 are in stripe 0, keys 1 and 3 in stripe 1. Each
+        # thread renders a fragment of one stripe that contains one of the
+        # other stripe, while the other thread does the reverse.
+        cache = htmldocument.FragmentCache(stripes=2)
+        barrier = threading.Barrier(2, timeout=10)
+        results = {}
+
+        def outer(key, inner):
+            barrier.wait()
+            return '<div>{0}</div>'.format(
+                cache.get(inner, lambda: 'inner {0}'.format(inner)))
+
+        def work(key, inner):
+            results[key] = cache.get(key, outer, key, inner)
+
+        threads = [threading.Thread(target=work, args=(0, 3), daemon=True),
+                   threading.Thread(target=work, args=(1, 2), daemon=True)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+            self.assertFalse(thread.is_alive(), 'deadlocked')
+        self.assertEqual(results, {0: '<div>inner 3</div>',
+                                   1: '<div>inner 2</div>'})
+        self.assertEqual(len(cache), 4)
+
+    def test_rendered_once(self):
+        cache = htmldocument.FragmentCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def render():
+            calls.append(1)
+            started.set()
+            release.wait(10)
+            return '<nav></nav>'
+
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(cache.get('nav', render)))
+            for i in range(8)]
+        threads[0].start()
+        started.wait(10)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['<nav></nav>'] * 8)
+
+    def test_failed_render_is_retried(self):
+        cache = htmldocument.FragmentCache()
+
+        def fail():
+            raise ValueError('broken')
+
+        with self.assertRaises(ValueError):
+            cache.get('key', fail)
+        self.assertNotIn('key', cache)
+        self.assertEqual(cache.get('key', lambda: 'ok'), 'ok')
+
+    def test_fragment_containing_itself(self):
+        cache = htmldocument.FragmentCache()
+
+        def render():
+            return cache.get('loop', render)
+
+        with self.assertRaises(RuntimeError):
+            cache.get('loop', render)
+        self.assertEqual(cache.get('loop', lambda: 'ok'), 'ok')
+
+    def test_discard_while_rendering(self):
+        cache = htmldocument.FragmentCache()
+
+        def render():
+            cache.discard('key')
+            return 'old'
+
+        self.assertEqual(cache.get('key', render), 'old')
+        self.assertNotIn('key', cache)
+        self.assertEqual(cache.get('key', lambda: 'new'), 'new')
+
+    def test_member(self):
+        cache = htmldocument.FragmentCache()
+        member = cache.member('nav', lambda: '<nav>é</nav>')
+        self.assertEqual(gzip.decompress(member), '<nav>é</nav>'.encode())
+        self.assertIs(cache.member('nav', None), member)
+        self.assertEqual(cache.get('nav', None), '<nav>é</nav>')
+        cache.discard('nav')
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import htmldocument
+
+
+class MinifyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ht = htmldocument.HTML(minify=True)
+
+    def test_head_and_close(self):
+        ht = htmldocument.HTML(minify=True, cssfiles=['/a.css'],
+                               jsfiles=['/a.js'], pagetitle='T',
+                               sitetitle='S')
+        self.assertEqual(
+            ht.html_header(),
+            '<!DOCTYPE html><html lang="en"><head><title>T  ::  S</title>'
+            '<link rel="stylesheet" href="/a.css"><script src="/a.js">'
+            '</script></head><body>')
+        self.assertEqual(ht.html_close(), '</body></html>')
+        self.assertEqual(htmldocument.HTML(cssfiles=['/a.css']).html_header()
+                         .count('\n'), 8)
+
+    def test_void_elements(self):
+        self.assertEqual(self.ht.br(), '<br>')
+        self.assertEqual(self.ht.embed(src='/x'), '<embed src=/x>')
+
+    def test_attribute_values(self):
+        ht = self.ht
+        self.assertEqual(ht.span('x', class_='a'), '<span class=a>x</span>')
+        for value in ('a b', 'a=b', '"', "'", '<', '>', '`', 'a\tb', ''):
+            with self.subTest(value=value):
+                self.assertEqual(
+                    ht.span('x', title=value),
+                    '<span title="{0}">x</span>'.format(
+                        htmldocument.escape(value)))
+        self.assertEqual(ht.a('x', href='/a?b&c'), '<a href=/a?b&amp;c>x</a>')
+        self.assertEqual(ht.a('x', href='/a?b=c'), '<a href="/a?b=c">x</a>')
+
+    def test_boolean_attributes(self):
+        self.assertEqual(
+            self.ht.input(type='checkbox', checked=True, name='c'),
+            '<input checked name=c type=checkbox>')
+        self.assertEqual(self.ht.div('x', hidden=True), '<div hidden>x</div>')
+        # only boolean attributes are collapsed
+        self.assertEqual(self.ht.span('x', title='title'),
+                         '<span title=title>x</span>')
+
+    def test_optional_end_tags(self):
+        ht = self.ht
+        self.assertEqual(ht.li('x'), '<li>x')
+        self.assertEqual(ht.dd('d'), '<dd>d')
+        self.assertEqual(ht.p('t'), '<p>t</p>')
+        self.assertEqual(ht.select_list('s', ['a', 'b'], 'b'),
+                         '<select name=s><option value=a>a'
+                         '<option value=b selected>b</select>')
+
+    def test_attrs_keep_both_strings(self):
+        attrs = htmldocument.Attrs(class_='cell num', id='n1')
+        self.assertEqual(self.ht.span('1', attrs),
+                         '<span class="cell num" id=n1>1</span>')
+        self.assertEqual(htmldocument.HTML().span('1', attrs),
+                         '<span class="cell num" id="n1">1</span>')
+        self.assertEqual(self.ht.span('1', attrs),
+                         '<span class="cell num" id=n1>1</span>')
+
+    def test_not_minified(self):
+        ht = htmldocument.HTML()
+        self.assertEqual(ht.li('x'), '<li>x</li>')
+        self.assertEqual(ht.input(type='checkbox', checked=True),
+                         '<input checked="checked" type="checkbox" />')
+
+
+if __name__ == '__main__':
+    unittest.main()
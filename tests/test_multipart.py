@@ -0,0 +1,176 @@
+import asyncio
+import io
+import os
+import unittest
+
+import htmldocument
+
+BOUNDARY = '----WebKitFormBoundaryx7Yq2'
+CONTENT_TYPE = 'multipart/form-data; boundary=' + BOUNDARY
+
+
+def _body(parts, boundary=BOUNDARY):
+    delimiter = b'--' + boundary.encode()
+    result = [b'preamble\r\n']
+    for headers, data in parts:
+        result.append(delimiter + b'\r\n' + b'\r\n'.join(headers) +
+                      b'\r\n\r\n' + data + b'\r\n')
+    result.append(delimiter + b'--\r\nepilogue')
+    return b''.join(result)
+
+
+def _field(name, data):
+    return ([b'Content-Disposition: form-data; name="' + name + b'"'], data)
+
+
+# data that looks like the delimiter but is not it
+TRICKY = (b'\r\n--' + BOUNDARY[:-1].encode() + b'\r\n--' +
+          BOUNDARY.encode()[:10] + b'\r\r\n-' + b'x' * 50)
+
+BODY = _body([
+    _field(b'title', 'H\u00e9llo'.encode()),
+    ([b'Content-Disposition: form-data; name="upload"; '
+      b'filename="C:\\\\dir\\\\report \\"q\\".bin"',
+      b'Content-Type: application/octet-stream'], TRICKY * 3),
+    _field(b'empty', b''),
+])
+
+
+def _parse(body, content_type=CONTENT_TYPE, length=None, **options):
+    parser = htmldocument.MultipartParser(**options)
+    return parser.parse(io.BytesIO(body), content_type, length)
+
+
+class MultipartParserTest(unittest.TestCase):
+
+    def check(self, parts):
+        try:
+            self.assertEqual([part.name for part in parts],
+                             ['title', 'upload', 'empty'])
+            self.assertEqual(parts[0].text(), 'H\u00e9llo')
+            self.assertIsNone(parts[0].filename)
+            self.assertEqual(parts[1].filename, 'report "q".bin')
+            self.assertEqual(parts[1].content_type,
+                             'application/octet-stream')
+            self.assertEqual(parts[1].read(), TRICKY * 3)
+            self.assertEqual(parts[1].size, len(TRICKY) * 3)
+            self.assertEqual(parts[2].read(), b'')
+        finally:
+            for part in parts:
+                part.close()
+
+    def test_every_chunk_boundary(self):
+        # chunk sizes split the delimiters at every offset of them
+        for size in range(1, len(BOUNDARY) + 12):
+            with self.subTest(chunk_size=size):
+                self.check(_parse(BODY, chunk_size=size))
+
+    def test_every_split_point(self):
+        # two chunks, split at every byte of the body
+        for split in range(len(BODY) + 1):
+            reader = htmldocument.MultipartParser()._reader(CONTENT_TYPE)
+            parts = reader.feed(BODY[:split]) + reader.feed(BODY[split:])
+            reader.close()
+            self.check(parts)
+
+    def test_content_length(self):
+        self.check(_parse(BODY + b'next request', length=len(BODY)))
+
+    def test_quoted_boundary(self):
+        boundary = 'a b:c'
+        body = _body([_field(b'x', b'1')], boundary)
+        parts = _parse(body, 'multipart/form-data; boundary="a b:c"')
+        self.assertEqual([(p.name, p.read()) for p in parts], [('x', b'1')])
+        parts[0].close()
+
+    def test_filename_star(self):
+        body = _body([([b'Content-Disposition: form-data; name="f"; '
+                        b'filename="plain.txt"; '
+                        b"filename*=UTF-8''%E2%98%83 snow.txt"], b'x')])
+        parts = _parse(body)
+        self.assertEqual(parts[0].filename, '\u2603 snow.txt')
+        parts[0].close()
+
+    def test_spooled_to_disk(self):
+        data = os.urandom(100000)
+        body = _body([([b'Content-Disposition: form-data; name="f"; '
+                        b'filename="a"'], data)])
+        parts = _parse(body, spool_size=1000, chunk_size=4096)
+        self.assertTrue(parts[0].file._rolled)
+        self.assertEqual(parts[0].read(), data)
+        parts[0].close()
+
+    def test_truncated(self):
+        for end in (0, 5, 20, BODY.index(b'H\xc3'), len(BODY) - 12,
+                    len(BODY) - 11):
+            with self.subTest(end=end):
+                with self.assertRaisesRegex(ValueError, 'incomplete'):
+                    _parse(BODY[:end])
+        with self.assertRaisesRegex(ValueError, 'incomplete'):
+            # Content-Length ends the body before its last delimiter
+            _parse(BODY, length=len(BODY) - 20)
+
+    def test_malformed(self):
+        delimiter = b'--' + BOUNDARY.encode()
+        bodies = [
+            delimiter + b'junk\r\n\r\n',
+            delimiter + b'\r\nno colon\r\n\r\nx\r\n' + delimiter + b'--',
+            delimiter + b'\r\n\r\nx\r\n' + delimiter + b'--',
+            _body([([b'Content-Disposition: form-data'], b'x')]),
+            _body([([b'Content-Disposition: attachment; name="a"'], b'x')]),
+        ]
+        for body in bodies:
+            with self.subTest(body=body):
+                with self.assertRaises(ValueError):
+                    _parse(body)
+
+    def test_content_type(self):
+        for content_type in ('text/plain', 'multipart/form-data',
+                             'multipart/form-data; boundary=' + 'x' * 71,
+                             'application/x-www-form-urlencoded'):
+            with self.subTest(content_type=content_type):
+                with self.assertRaises(ValueError):
+                    _parse(BODY, content_type)
+
+    def test_max_size(self):
+        self.check(_parse(BODY, max_size=len(BODY)))
+        with self.assertRaisesRegex(ValueError, 'over'):
+            _parse(BODY, max_size=len(BODY) - 1)
+        with self.assertRaisesRegex(ValueError, 'over'):
+            # refused by Content-Length before reading
+            htmldocument.MultipartParser(max_size=10).parse(
+                None, CONTENT_TYPE, len(BODY))
+
+    def test_default_max_size(self):
+        self.assertEqual(htmldocument.MultipartParser().max_size, 1 << 30)
+
+    def test_max_parts_and_header_size(self):
+        with self.assertRaisesRegex(ValueError, 'parts'):
+            _parse(BODY, max_parts=2)
+        with self.assertRaisesRegex(ValueError, 'header'):
+            _parse(_body([([b'X-Long: ' + b'x' * 200,
+                            b'Content-Disposition: form-data; name="a"'],
+                           b'x')]), max_header_size=100)
+
+    def test_read_form(self):
+        ht = htmldocument.HTML()
+        environ = {'wsgi.input': io.BytesIO(BODY),
+                   'CONTENT_TYPE': CONTENT_TYPE,
+                   'CONTENT_LENGTH': str(len(BODY))}
+        self.check(ht.read_form(environ))
+
+    def test_asgi_read_form(self):
+        ht = htmldocument.HTML()
+        chunks = [BODY[i:i + 7] for i in range(0, len(BODY), 7)]
+
+        async def receive():
+            chunk = chunks.pop(0)
+            return {'type': 'http.request', 'body': chunk,
+                    'more_body': bool(chunks)}
+
+        scope = {'headers': [(b'content-type', CONTENT_TYPE.encode())]}
+        self.check(asyncio.run(ht.asgi_read_form(scope, receive)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import io
+import os
+import tempfile
+import unittest
+
+import htmldocument
+
+
+def _report(ht, year):
+    # Section that uses the fragment cache and the minified output.
+    return ht.fragment('nav', lambda: ht.nav(ht.ul(ht.li(
+        ['a', 'b'])))) + ht.section(ht.h2(str(year)) + ht.p(
+            'Year {0}'.format(year), {'hidden': False, 'class': 'y'}))
+
+
+class SectionPoolTest(unittest.TestCase):
+
+    def test_pool_renders_as_inline(self):
+        with tempfile.TemporaryDirectory() as root:
+            for name in ('a.css', 'b.css'):
+                with open(os.path.join(root, name), 'w') as f:
+                    f.write('p { color: red }')
+            ht = htmldocument.HTML(
+                sitetitle='Site', cssfiles=['/a.css', '/b.css'],
+                fragments=htmldocument.FragmentCache(),
+                bundler=htmldocument.Bundler(
+                    os.path.join(root, 'bundles'), '/bundles/', root),
+                critical=htmldocument.CriticalCSS(['/a.css'], root),
+                compression=htmldocument.Compression(),
+                minify=True)
+            sections = [htmldocument.Section(_report, year, size=1 << 20)
+                        for year in range(2000, 2004)]
+            inline = io.BytesIO()
+            ht.print_sections(sections, out=inline)
+            pooled = io.BytesIO()
+            with htmldocument.SectionPool(ht, max_workers=2) as pool:
+                self.assertTrue(pool.accepts(sections))
+                ht.print_sections(sections, pool, out=pooled)
+            self.assertEqual(pooled.getvalue(), inline.getvalue())
+            self.assertIn(b'<li>a<li>b', pooled.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
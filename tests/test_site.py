@@ -0,0 +1,64 @@
+import unittest
+
+import htmldocument
+
+
+class FilesTest(unittest.TestCase):
+
+    def test_cssfiles_is_a_list(self):
+        ht = htmldocument.HTML(cssfiles=['/a.css'])
+        self.assertIsInstance(ht.cssfiles, list)
+        self.assertEqual(ht.cssfiles, ['/a.css'])
+
+    def test_change_in_place(self):
+        ht = htmldocument.HTML(cssfiles=['/a.css'], jsfiles=['/a.js'])
+        self.assertIn('/a.css', ht.html_header())
+        ht.cssfiles.append('/b.css')
+        ht.jsfiles.insert(0, '/0.js')
+        ht.jsfiles += ['/z.js']
+        self.assertEqual(ht.cssfiles, ['/a.css', '/b.css'])
+        self.assertEqual(ht.jsfiles, ['/0.js', '/a.js', '/z.js'])
+        header = ht.html_header()
+        self.assertIn('/b.css', header)
+        self.assertLess(header.index('/0.js'), header.index('/z.js'))
+        ht.cssfiles.sort(reverse=True)
+        self.assertEqual(ht.cssfiles, ['/b.css', '/a.css'])
+        del ht.cssfiles[0]
+        self.assertNotIn('/b.css', ht.html_header())
+
+    def test_derived_objects_are_not_changed(self):
+        site = htmldocument.HTML(cssfiles=['/a.css'])
+        page = site.derive(pagetitle='Page')
+        page.cssfiles.append('/page.css')
+        self.assertEqual(site.cssfiles, ['/a.css'])
+        self.assertEqual(page.cssfiles, ['/a.css', '/page.css'])
+
+    def test_string_and_none(self):
+        self.assertEqual(htmldocument.HTML(cssfiles='/a.css').cssfiles,
+                         '/a.css')
+        self.assertIsNone(htmldocument.HTML().jsfiles)
+
+
+class DeriveTest(unittest.TestCase):
+
+    def test_state_outside_and_inside_request(self):
+        site = htmldocument.HTML(pagetitle='Site page', nocache=True)
+        page = site.derive()
+        self.assertEqual(page.pagetitle, 'Site page')
+        self.assertTrue(page.nocache)
+        with site.request({}, pagetitle='Request page', nocache=False):
+            page = site.derive(cookie='c')
+            self.assertEqual(page.pagetitle, 'Request page')
+            self.assertFalse(page.nocache)
+            self.assertEqual(page.cookie, 'c')
+        self.assertEqual(site.derive().pagetitle, 'Site page')
+
+    def test_other_objects_request_is_not_used(self):
+        site = htmldocument.HTML(pagetitle='Site page')
+        other = htmldocument.HTML()
+        with other.request({}, pagetitle='Other page'):
+            self.assertEqual(site.derive().pagetitle, 'Site page')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import htmldocument
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded(code):
+    """Return htmldocument modules loaded after code in a new process."""
+    result = subprocess.run(
+        [sys.executable, '-c', code + '\nimport sys\n'
+         'print(" ".join(sorted(name for name in sys.modules\n'
+         '                      if name.startswith("htmldocument"))))'],
+        cwd=ROOT, stdout=subprocess.PIPE, universal_newlines=True,
+        check=True)
+    return result.stdout.split()
+
+
+class SubmoduleTest(unittest.TestCase):
+
+    def test_import_loads_no_submodule(self):
+        self.assertEqual(_loaded(
+            'import htmldocument\n'
+            'ht = htmldocument.HTML(cssfiles=["/a.css"])\n'
+            'ht.html_header()\n'
+            'ht.p("x")'), ['htmldocument'])
+
+    def test_submodule_on_first_use(self):
+        self.assertEqual(_loaded('from htmldocument import FastCGIServer'),
+                         ['htmldocument', 'htmldocument._fastcgi'])
+        self.assertEqual(_loaded(
+            'import io, htmldocument\n'
+            'htmldocument.HTML().body_writer(io.BytesIO()).close()'),
+            ['htmldocument', 'htmldocument._compression'])
+
+    def test_names(self):
+        for name, submodule in htmldocument._SUBMODULE_NAMES.items():
+            with self.subTest(name=name):
+                value = getattr(htmldocument, name)
+                self.assertIs(value, getattr(
+                    getattr(htmldocument, submodule), name))
+                self.assertIn(name, dir(htmldocument))
+        with self.assertRaises(AttributeError):
+            htmldocument.NoSuchName
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import htmldocument
+from htmldocument import escape
+
+
+_TEXT = 'a&b<c>d é € 𝄞 日本語 &amp; <<>>&&\n'
+
+# invalid UTF-8: a stray continuation byte, a character cut short before
+# ASCII, a surrogate, an overlong form, a byte never used, and a
+# character cut short at the end
+_INVALID = (b'x\x80y \xe2\x82< \xed\xa0\x80 \xc0\xaf \xff& ' +
+            _TEXT.encode() + b'\xf0\x9d\x84')
+
+
+class TextChunksTest(unittest.TestCase):
+
+    def chunks(self, data, encode, encoding, chunk_size):
+        ht = htmldocument.HTML(encode=encode)
+        chunks = list(ht.text_chunks('pre', data, encoding=encoding,
+                                     chunk_size=chunk_size))
+        self.assertEqual(chunks[0], b'<pre>')
+        self.assertEqual(chunks[-1], b'</pre>')
+        return b''.join(chunks[1:-1])
+
+    def check(self, data, encode, encoding):
+        expected = escape(data.decode(encoding, 'replace'), False).encode(
+            encode, 'xmlcharrefreplace')
+        for chunk_size in range(1, len(data) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    self.chunks(data, encode, encoding, chunk_size),
+                    expected)
+
+    def test_utf8_bytes(self):
+        # escaped without decoding
+        self.check(_TEXT.encode(), 'utf-8', 'utf-8')
+
+    def test_decoder(self):
+        self.check(_TEXT.encode('utf-8'), 'euc-jp', 'utf-8')
+        self.check(_TEXT.encode('shift_jis', 'replace'), 'utf-8',
+                   'shift_jis')
+        self.check(_TEXT.encode('utf-16-le'), 'utf-8', 'utf-16-le')
+
+    def test_invalid_utf8_bytes(self):
+        self.check(_INVALID, 'utf-8', 'utf-8')
+
+    def test_invalid_bytes_are_replaced_alike(self):
+        self.check(_INVALID, 'iso-8859-1', 'utf-8')
+        for chunk_size in range(1, len(_INVALID) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                utf8 = self.chunks(_INVALID, 'utf-8', 'utf-8', chunk_size)
+                decoded = self.chunks(_INVALID, 'iso-8859-1', 'utf-8',
+                                      chunk_size)
+                self.assertEqual(utf8.decode('utf-8').encode(
+                    'iso-8859-1', 'xmlcharrefreplace'), decoded)
+
+    def test_memoryview(self):
+        data = bytearray(_TEXT.encode())
+        self.assertEqual(self.chunks(memoryview(data), 'utf-8', None, 5),
+                         escape(_TEXT, False).encode())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+import asyncio
+import gzip
+import io
+import os
+import tempfile
+import unittest
+from wsgiref.handlers import SimpleHandler
+from wsgiref.util import setup_testing_defaults
+
+import htmldocument
+from htmldocument._compression import _zstd
+
+
+class WriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ht = htmldocument.HTML(
+            compression=htmldocument.Compression(encodings=('gzip',)))
+
+    def wsgi(self, environ):
+        responses = []
+        chunks = []
+
+        def start_response(status, headers):
+            responses.append((status, headers))
+            return chunks.append
+
+        with self.ht.wsgi_writer(start_response, environ=environ) as writer:
+            writer.write(b'<p>' + b'x' * 2000 + b'</p>')
+        return dict(responses[0][1]), b''.join(chunks)
+
+    def asgi(self, scope):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async def respond():
+            writer = self.ht.asgi_writer(send, scope=scope)
+            await writer.write(b'<p>' + b'x' * 2000 + b'</p>')
+            await writer.close()
+
+        asyncio.run(respond())
+        headers = dict((name.decode(), value.decode())
+                       for name, value in messages[0]['headers'])
+        return headers, b''.join(message['body'] for message in messages[1:])
+
+    def test_wsgi_environ(self):
+        headers, body = self.wsgi({'HTTP_ACCEPT_ENCODING': 'gzip'})
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(body),
+                         b'<p>' + b'x' * 2000 + b'</p>')
+        headers, body = self.wsgi({'HTTP_ACCEPT_ENCODING': 'identity'})
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(body, b'<p>' + b'x' * 2000 + b'</p>')
+
+    def test_asgi_scope(self):
+        headers, body = self.asgi({'type': 'http', 'headers': [
+            (b'accept', b'text/html'), (b'accept-encoding', b'br'),
+            (b'accept-encoding', b'gzip;q=0.5')]})
+        self.assertEqual(headers['content-encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(body),
+                         b'<p>' + b'x' * 2000 + b'</p>')
+        headers, body = self.asgi({'type': 'http', 'headers': []})
+        self.assertNotIn('content-encoding', headers)
+        self.assertEqual(body, b'<p>' + b'x' * 2000 + b'</p>')
+
+    def test_wsgiref_write_file(self):
+        # wsgiref takes only bytes from write.
+        data = b'<p>' + os.urandom(150000).hex().encode() + b'</p>'
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'part.html')
+            with open(path, 'wb') as f:
+                f.write(data)
+
+            def application(environ, start_response):
+                writer = self.ht.wsgi_writer(start_response, environ=environ)
+                writer.write(b'<body>')
+                writer.write_file(path)
+                self.ht.include_file(path, writer)
+                writer.close()
+                return []
+
+            for accept in ('identity', 'gzip'):
+                with self.subTest(accept=accept):
+                    environ = {'HTTP_ACCEPT_ENCODING': accept}
+                    setup_testing_defaults(environ)
+                    out = io.BytesIO()
+                    errors = io.StringIO()
+                    SimpleHandler(io.BytesIO(), out, errors, environ).run(
+                        application)
+                    self.assertEqual(errors.getvalue(), '')
+                    head, sep, body = out.getvalue().partition(b'\r\n\r\n')
+                    self.assertTrue(head.startswith(b'HTTP/1.0 200 OK'))
+                    if accept == 'gzip':
+                        self.assertIn(b'Content-Encoding: gzip', head)
+                        body = gzip.decompress(body)
+                    self.assertEqual(body, b'<body>' + data + data)
+
+
+
+class CompressionTest(unittest.TestCase):
+
+    def write(self, compression, accept, chunks, flush=False):
+        ht = htmldocument.HTML(compression=compression)
+        out = io.BytesIO()
+        with ht.request({'HTTP_ACCEPT_ENCODING': accept}):
+            writer = ht.body_writer(out)
+            for chunk in chunks:
+                writer.write(chunk)
+                if flush:
+                    writer.flush()
+                    flushed = out.getvalue()
+            writer.close()
+        if flush:
+            self.assertTrue(flushed.startswith(b'Content-Type'))
+        header, sep, body = out.getvalue().partition(b'\n\n')
+        return header.decode().split('\n'), body
+
+    def test_encodings(self):
+        import zlib
+        chunks = [b'<p>%d</p>' % i * 50 for i in range(40)]
+        page = b''.join(chunks)
+        decompress = {'gzip': gzip.decompress, 'deflate': zlib.decompress}
+        zstd = _zstd()
+        if zstd is not None:
+            decompress['zstd'] = zstd.decompress
+        for encoding in decompress:
+            for flush in (False, True):
+                with self.subTest(encoding=encoding, flush=flush):
+                    header, body = self.write(htmldocument.Compression(),
+                                              encoding, chunks, flush)
+                    self.assertIn('Content-Encoding: ' + encoding, header)
+                    self.assertIn('Vary: Accept-Encoding', header)
+                    self.assertEqual(decompress[encoding](body), page)
+
+    def test_min_size(self):
+        compression = htmldocument.Compression(min_size=100)
+        header, body = self.write(compression, 'gzip', [b'x' * 60] * 2)
+        self.assertIn('Content-Encoding: gzip', header)
+        self.assertEqual(gzip.decompress(body), b'x' * 120)
+        header, body = self.write(compression, 'gzip', [b'x' * 60])
+        self.assertNotIn('Content-Encoding: gzip', header)
+        self.assertEqual(body, b'x' * 60)
+        # a flush starts the compressed body however short it is
+        header, body = self.write(compression, 'gzip', [b'x' * 60], True)
+        self.assertEqual(gzip.decompress(body), b'x' * 60)
+
+    def test_not_accepted(self):
+        for accept in ('', 'br', 'gzip;q=0', 'identity'):
+            with self.subTest(accept=accept):
+                header, body = self.write(htmldocument.Compression(min_size=0),
+                                          accept, [b'<p></p>'])
+                self.assertNotIn('Content-Encoding', '\n'.join(header))
+                self.assertEqual(body, b'<p></p>')
+
+    def test_without_compression(self):
+        header, body = self.write(None, 'gzip', [b'<p></p>'] * 300)
+        self.assertNotIn('Vary: Accept-Encoding', header)
+        self.assertEqual(body, b'<p></p>' * 300)
+
+
+class SpliceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fragments = htmldocument.FragmentCache()
+        self.ht = htmldocument.HTML(
+            fragments=self.fragments,
+            compression=htmldocument.Compression(('gzip', 'deflate'),
+                                                 min_size=0))
+        self.calls = []
+
+    def nav(self, name):
+        self.calls.append(name)
+        return '<nav>{0} é</nav>'.format(name)
+
+    def cgi(self, accept):
+        out = io.BytesIO()
+        with self.ht.request({'HTTP_ACCEPT_ENCODING': accept}):
+            with self.ht.body_writer(out) as writer:
+                writer.write(b'<body>')
+                writer.write_fragment('nav', self.nav, 'site')
+                writer.write(b'<main></main>')
+                writer.write_fragment('nav', self.nav, 'site')
+                writer.write(b'</body>')
+        return out.getvalue().partition(b'\n\n')[::2]
+
+    def test_gzip_members_are_spliced(self):
+        header, body = self.cgi('gzip')
+        self.assertIn(b'Content-Encoding: gzip', header)
+        nav = '<nav>site é</nav>'.encode()
+        self.assertEqual(gzip.decompress(body),
+                         b'<body>' + nav + b'<main></main>' + nav +
+                         b'</body>')
+        member = self.fragments.member('nav', None)
+        self.assertEqual(body.count(member), 2)
+        self.assertEqual(self.calls, ['site'])
+
+    def test_other_encodings_write_the_fragment(self):
+        header, body = self.cgi('deflate')
+        self.assertIn(b'Content-Encoding: deflate', header)
+        import zlib
+        nav = '<nav>site é</nav>'.encode()
+        self.assertEqual(zlib.decompress(body),
+                         b'<body>' + nav + b'<main></main>' + nav +
+                         b'</body>')
+        header, body = self.cgi('identity')
+        self.assertNotIn(b'Content-Encoding', header)
+        self.assertEqual(body, b'<body>' + nav + b'<main></main>' + nav +
+                         b'</body>')
+        self.assertEqual(self.calls, ['site'])
+
+    def test_asgi(self):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async def respond():
+            writer = self.ht.asgi_writer(send, scope={
+                'type': 'http', 'headers': [(b'accept-encoding', b'gzip')]})
+            await writer.write(b'<body>')
+            await writer.write_fragment('nav', self.nav, 'site')
+            await writer.write(b'</body>')
+            await writer.close()
+
+        asyncio.run(respond())
+        self.assertIn((b'content-encoding', b'gzip'), messages[0]['headers'])
+        body = b''.join(message['body'] for message in messages[1:])
+        self.assertEqual(gzip.decompress(body),
+                         '<body><nav>site é</nav></body>'.encode())
+        self.assertIn(self.fragments.member('nav', None), body)
+
+
+if __name__ == '__main__':
+    unittest.main()